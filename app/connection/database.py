@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -13,18 +15,68 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in the .env file.")
 
+# Async drivers for the sync URLs we use today (mysql+pymysql, sqlite)
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in a DATABASE_URL for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases.")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# ASYNC_DATABASE_URL can point the async path somewhere else (e.g. an aiosqlite
+# file while benchmarking); by default it mirrors DATABASE_URL.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Statement logging is opt-in (SQL_ECHO=true); per-request query stats come
+# from app/connection/instrumentation.py instead
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+
+# Pool sizing per worker process. `python main.py --prod` derives these from
+# DB_MAX_CONNECTIONS / worker count; unset means SQLAlchemy's defaults.
+POOL_OPTIONS = {
+    key: int(os.environ[env])
+    for key, env in (("pool_size", "DB_POOL_SIZE"), ("max_overflow", "DB_MAX_OVERFLOW"))
+    if os.environ.get(env)
+}
+
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
-    echo=True,
+    echo=SQL_ECHO,
     future=True,
     pool_pre_ping=True,
-    pool_recycle=280
+    pool_recycle=280,
+    **POOL_OPTIONS
+)
+
+# Async engine used by routers that have moved to AsyncSession
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=SQL_ECHO,
+    pool_pre_ping=True,
+    pool_recycle=280,
+    **POOL_OPTIONS
 )
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session factory (expire_on_commit=False so returned rows stay readable)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base model for ORM
 Base = declarative_base()
 
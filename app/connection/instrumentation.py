@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+
+from sqlalchemy import event
+
+from .database import engine, async_engine
+
+# Statements at or above this many milliseconds are sampled
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_SAMPLES = int(os.getenv("SLOW_QUERY_SAMPLES", "100"))
+# Bound parameters include password hashes, OTPs and emails, so samples leave
+# them out unless this is set (local debugging only)
+SLOW_QUERY_PARAMETERS = os.getenv("SLOW_QUERY_PARAMETERS", "false").lower() == "true"
+
+
+class RequestQueryStats:
+    """Query count, DB time and slowest statement for one request."""
+
+    __slots__ = ("queries", "db_time", "slowest_time", "slowest_statement", "route")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.route = None
+
+    def record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+_current_stats: ContextVar = ContextVar("request_query_stats", default=None)
+
+# Process-wide aggregates, read by the admin endpoint
+_lock = threading.Lock()
+route_stats = {}
+slow_queries = deque(maxlen=SLOW_QUERY_SAMPLES)
+
+
+# ─── Engine Events ───────────────────────────────────────────────
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_queries.append({
+            "route": stats.route if stats else None,
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": statement,
+            "parameters": repr(parameters)[:1000] if SLOW_QUERY_PARAMETERS else None,
+            "executemany": executemany,
+            "at": datetime.utcnow().isoformat(),
+        })
+
+
+def instrument(target_engine):
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+instrument(engine)
+instrument(async_engine.sync_engine)
+
+
+# ─── Request Scope ───────────────────────────────────────────────
+def start_request():
+    stats = RequestQueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token):
+    _current_stats.reset(token)
+
+
+def record_route(route: str, stats: RequestQueryStats):
+    with _lock:
+        entry = route_stats.get(route)
+        if entry is None:
+            entry = route_stats[route] = {
+                "route": route,
+                "requests": 0,
+                "queries": 0,
+                "db_time": 0.0,
+                "max_queries": 0,
+                "max_db_time": 0.0,
+                "slowest_statement": None,
+            }
+        entry["requests"] += 1
+        entry["queries"] += stats.queries
+        entry["db_time"] += stats.db_time
+        entry["max_queries"] = max(entry["max_queries"], stats.queries)
+        if stats.db_time > entry["max_db_time"]:
+            entry["max_db_time"] = stats.db_time
+            entry["slowest_statement"] = stats.slowest_statement
+
+
+def worst_routes(sort_by: str = "queries", limit: int = 20):
+    with _lock:
+        entries = [dict(e) for e in route_stats.values()]
+
+    rows = []
+    for e in entries:
+        rows.append({
+            "route": e["route"],
+            "requests": e["requests"],
+            "avg_queries": round(e["queries"] / e["requests"], 2),
+            "max_queries": e["max_queries"],
+            "avg_db_time_ms": round(e["db_time"] / e["requests"] * 1000, 2),
+            "max_db_time_ms": round(e["max_db_time"] * 1000, 2),
+            "total_db_time_ms": round(e["db_time"] * 1000, 2),
+            "slowest_statement": e["slowest_statement"],
+        })
+
+    key = {
+        "queries": "avg_queries",
+        "db_time": "avg_db_time_ms",
+        "total_db_time": "total_db_time_ms",
+    }.get(sort_by, "avg_queries")
+    rows.sort(key=lambda r: r[key], reverse=True)
+    return rows[:limit]
+
+
+def reset_stats():
+    with _lock:
+        route_stats.clear()
+        slow_queries.clear()
@@ -1,4 +1,4 @@
-from .database import SessionLocal
+from .database import SessionLocal, AsyncSessionLocal
 # ─── DB Dependency ───────────────────────────────────────────────
 def get_db():
     db = SessionLocal()
@@ -7,3 +7,10 @@ def get_db():
     finally:
         db.close()
 
+
+# ─── Async DB Dependency ─────────────────────────────────────────
+# Routers migrate one at a time by swapping Depends(get_db) for
+# Depends(get_async_db) and declaring the endpoint `async def`.
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
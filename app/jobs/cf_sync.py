@@ -0,0 +1,233 @@
+"""
+Background Codeforces sync for every linked handle.
+
+Each cycle picks the profiles that are due (never fetched, active on a ladder
+recently and not synced for CF_SYNC_ACTIVE_INTERVAL, or idle and not synced
+for CF_SYNC_IDLE_INTERVAL), most urgent first, and takes as many as fit into
+CF_SYNC_BUDGET_SHARE of the Codeforces call budget for the cycle. Every handle
+is fetched once (incrementally, through the solved-set cache) and its
+completions are written for all ladders at once.
+
+    python -m app.jobs.cf_sync            # run cycles until interrupted
+    python -m app.jobs.cf_sync --once     # a single cycle, e.g. from cron
+
+Single-worker deployments can run it in-process with CF_SYNC_IN_WORKER=true.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, func, update
+
+from ..connection.database import AsyncSessionLocal, async_engine
+from ..models.codeforces_ladder_model import UserCPProfile, UserProblemStatus, CodeforcesSolvedCache
+from ..routers.codeforces_ladder.cf_client import cf_client, CodeforcesError
+from ..routers.codeforces_ladder.solved_cache import refresh_solved
+from ..routers.codeforces_ladder.ladder_sync import ladder_keys, record_solved
+
+CF_SYNC_CYCLE = int(os.getenv("CF_SYNC_CYCLE", "300"))
+CF_SYNC_ACTIVE_DAYS = int(os.getenv("CF_SYNC_ACTIVE_DAYS", "7"))
+CF_SYNC_ACTIVE_INTERVAL = int(os.getenv("CF_SYNC_ACTIVE_INTERVAL", "900"))
+CF_SYNC_IDLE_INTERVAL = int(os.getenv("CF_SYNC_IDLE_INTERVAL", "21600"))
+CF_SYNC_CONCURRENCY = int(os.getenv("CF_SYNC_CONCURRENCY", "2"))
+
+# Share of the cycle's Codeforces calls the scheduler may spend; the rest stays
+# free for request-path calls (manual sync, handle verification)
+CF_SYNC_BUDGET_SHARE = float(os.getenv("CF_SYNC_BUDGET_SHARE", "0.5"))
+
+# Handles that fail (renamed, deleted, API errors) back off up to this long
+CF_SYNC_MAX_BACKOFF = int(os.getenv("CF_SYNC_MAX_BACKOFF", "86400"))
+
+CF_SYNC_IN_WORKER = os.getenv("CF_SYNC_IN_WORKER", "false").lower() == "true"
+
+
+async def linked_profiles(db, now: datetime) -> list:
+    """Every profile with a handle, annotated with (priority, due); most urgent first."""
+    active_since = now - timedelta(days=CF_SYNC_ACTIVE_DAYS)
+    activity = (
+        select(UserProblemStatus.user_id, func.max(UserProblemStatus.checked_at).label("last_active"))
+        .group_by(UserProblemStatus.user_id)
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            select(
+                UserCPProfile.user_id,
+                UserCPProfile.codeforces_handle,
+                UserCPProfile.last_synced_at,
+                activity.c.last_active,
+                CodeforcesSolvedCache.handle,
+            )
+            .outerjoin(activity, activity.c.user_id == UserCPProfile.user_id)
+            .outerjoin(
+                CodeforcesSolvedCache,
+                CodeforcesSolvedCache.handle == func.lower(UserCPProfile.codeforces_handle),
+            )
+            .filter(UserCPProfile.codeforces_handle.isnot(None), UserCPProfile.codeforces_handle != "")
+        )
+    ).all()
+
+    profiles = []
+    for user_id, handle, last_synced_at, last_active, cached in rows:
+        age = (now - last_synced_at).total_seconds() if last_synced_at else None
+        if cached is None:
+            priority, due = 0, True
+        elif last_active and last_active >= active_since:
+            priority, due = 1, age is None or age >= CF_SYNC_ACTIVE_INTERVAL
+        else:
+            priority, due = 2, age is None or age >= CF_SYNC_IDLE_INTERVAL
+        profiles.append({
+            "user_id": user_id, "handle": handle, "age": age, "priority": priority, "due": due,
+        })
+    profiles.sort(key=lambda p: (p["priority"], -(p["age"] if p["age"] is not None else float("inf"))))
+    return profiles
+
+
+async def lag_report(db, now: Optional[datetime] = None) -> dict:
+    """How far behind the sync is, from the database (same answer in every process)."""
+    profiles = await linked_profiles(db, now or datetime.utcnow())
+    due = [p for p in profiles if p["due"]]
+    ages = [p["age"] for p in due if p["age"] is not None]
+    return {
+        "linked_profiles": len(profiles),
+        "never_fetched": sum(1 for p in profiles if p["priority"] == 0),
+        "due": len(due),
+        "due_active": sum(1 for p in due if p["priority"] == 1),
+        "oldest_due_seconds": int(max(ages)) if ages else 0,
+    }
+
+
+class SyncScheduler:
+    def __init__(self, cycle: int = CF_SYNC_CYCLE, concurrency: int = CF_SYNC_CONCURRENCY, verbose: bool = False):
+        self.cycle = cycle
+        self.concurrency = max(1, concurrency)
+        self.verbose = verbose
+        self.backoff: dict = {}  # handle -> (retry_at monotonic, seconds)
+        self.progress = {
+            "running": False, "cycles": 0, "cycle_started_at": None,
+            "selected": 0, "done": 0, "failed": 0, "problems_synced": 0,
+            "backlog": 0, "lag_seconds": 0, "last_cycle_seconds": None, "last_error": None,
+        }
+
+    def batch_size(self) -> int:
+        """Handles per cycle that fit the scheduler's share of the rate budget."""
+        if cf_client.min_interval <= 0:
+            return 10_000
+        return max(1, int(self.cycle * CF_SYNC_BUDGET_SHARE / cf_client.min_interval))
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(f"[cf-sync {datetime.utcnow():%H:%M:%S}] {message}", flush=True)
+
+    async def run_cycle(self) -> dict:
+        started, now = time.monotonic(), datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            profiles = [p for p in await linked_profiles(db, now) if p["due"]]
+
+        # One fetch per handle, however many users linked it
+        handles: dict = {}
+        for p in profiles:
+            retry_at, _ = self.backoff.get(p["handle"].lower(), (0, 0))
+            if retry_at <= started:
+                handles.setdefault(p["handle"].lower(), (p["handle"], []))[1].append(p["user_id"])
+        selected = list(handles.values())[: self.batch_size()]
+
+        ages = [p["age"] for p in profiles if p["age"] is not None]
+        progress = self.progress
+        progress.update({
+            "cycles": progress["cycles"] + 1, "cycle_started_at": now.isoformat(),
+            "selected": len(selected), "done": 0, "failed": 0, "problems_synced": 0,
+            "backlog": len(handles) - len(selected), "lag_seconds": int(max(ages)) if ages else 0,
+        })
+        self._log(f"cycle {progress['cycles']}: {len(profiles)} due, {len(selected)} selected, "
+                  f"backlog {progress['backlog']}, lag {progress['lag_seconds']}s")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in selected:
+            queue.put_nowait(item)
+        await asyncio.gather(*(self._worker(queue) for _ in range(self.concurrency)))
+
+        progress["last_cycle_seconds"] = round(time.monotonic() - started, 1)
+        self._log(f"cycle {progress['cycles']} done: {progress['done']} synced, {progress['failed']} failed, "
+                  f"{progress['problems_synced']} problems in {progress['last_cycle_seconds']}s")
+        return dict(progress)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while not queue.empty():
+            handle, user_ids = queue.get_nowait()
+            try:
+                solved = await refresh_solved(handle)
+            except CodeforcesError as e:
+                _, delay = self.backoff.get(handle.lower(), (0, self.cycle))
+                self.backoff[handle.lower()] = (time.monotonic() + delay, min(delay * 2, CF_SYNC_MAX_BACKOFF))
+                self.progress["failed"] += 1
+                self.progress["last_error"] = f"{handle}: {e.comment}"
+                continue
+            self.backoff.pop(handle.lower(), None)
+
+            now = datetime.utcnow()
+            async with AsyncSessionLocal() as db:
+                problem_ids = await ladder_keys.solved_ids(db, solved)
+                for user_id in user_ids:
+                    self.progress["problems_synced"] += await record_solved(db, user_id, problem_ids, now)
+                await db.execute(
+                    update(UserCPProfile).where(UserCPProfile.user_id.in_(user_ids)).values(last_synced_at=now)
+                )
+                await db.commit()
+            self.progress["done"] += 1
+            if self.progress["done"] % 25 == 0:
+                self._log(f"{self.progress['done']}/{self.progress['selected']} handles")
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None):
+        stop = stop or asyncio.Event()
+        self.progress["running"] = True
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                try:
+                    await self.run_cycle()
+                except Exception as exc:  # keep the loop alive through DB hiccups
+                    self.progress["last_error"] = f"{exc.__class__.__name__}: {exc}"
+                    self._log(f"cycle failed: {self.progress['last_error']}")
+                try:
+                    await asyncio.wait_for(stop.wait(), max(1, self.cycle - (time.monotonic() - started)))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.progress["running"] = False
+
+
+scheduler = SyncScheduler()
+
+
+async def _main(args):
+    job = SyncScheduler(cycle=args.cycle, concurrency=args.concurrency, verbose=True)
+    try:
+        if args.once:
+            await job.run_cycle()
+        else:
+            await job.run_forever()
+    finally:
+        await cf_client.aclose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    # Mappers resolve relationship() names across every model module
+    from ..models import (  # noqa: F401
+        user_model, course_model, resource_model, registration_model,
+        new_registration_model, problem_model, codeforces_ladder_model,
+        contact_us_model, organization_model, catalog_model, testing_mode,
+    )
+
+    parser = argparse.ArgumentParser(description="Sync Codeforces completions for all linked handles")
+    parser.add_argument("--once", action="store_true", help="run one cycle and exit")
+    parser.add_argument("--cycle", type=int, default=CF_SYNC_CYCLE, help="seconds per cycle")
+    parser.add_argument("--concurrency", type=int, default=CF_SYNC_CONCURRENCY)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,94 @@
+"""
+Periodic cleanup of rows that are only useful until they expire: handle
+verifications, unconfirmed signups and password-reset OTPs.
+
+Each sweep is one DELETE per table on its indexed expiry column. Rows are kept
+for EXPIRY_SWEEP_GRACE seconds past expiry so a late OTP still gets "expired"
+rather than "not found".
+
+    python -m app.jobs.expiry_sweep            # sweep every EXPIRY_SWEEP_INTERVAL
+    python -m app.jobs.expiry_sweep --once     # a single sweep, e.g. from cron
+
+Single-worker deployments can run it in-process with EXPIRY_SWEEP_IN_WORKER=true.
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete
+
+from ..connection.database import AsyncSessionLocal, async_engine
+from ..models.codeforces_ladder_model import PendingVerification
+from ..models.user_model import TempUser, ForgetPassword
+
+EXPIRY_SWEEP_INTERVAL = int(os.getenv("EXPIRY_SWEEP_INTERVAL", "600"))
+EXPIRY_SWEEP_GRACE = int(os.getenv("EXPIRY_SWEEP_GRACE", "3600"))
+EXPIRY_SWEEP_IN_WORKER = os.getenv("EXPIRY_SWEEP_IN_WORKER", "false").lower() == "true"
+
+# model -> its expiry column
+EXPIRING = (
+    (PendingVerification, PendingVerification.expiry_at),
+    (TempUser, TempUser.expires_at),
+    (ForgetPassword, ForgetPassword.expiredAt),
+)
+
+stats = {"sweeps": 0, "deleted": {model.__tablename__: 0 for model, _ in EXPIRING}, "last_error": None}
+
+
+async def sweep_expired(now: Optional[datetime] = None) -> dict:
+    """Delete everything that expired more than EXPIRY_SWEEP_GRACE ago; returns rows deleted per table."""
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=EXPIRY_SWEEP_GRACE)
+    deleted = {}
+    async with AsyncSessionLocal() as db:
+        for model, expires in EXPIRING:
+            result = await db.execute(delete(model).where(expires < cutoff).execution_options(synchronize_session=False))
+            deleted[model.__tablename__] = result.rowcount or 0
+        await db.commit()
+    stats["sweeps"] += 1
+    for table, count in deleted.items():
+        stats["deleted"][table] += count
+    return deleted
+
+
+async def run_forever(stop: Optional[asyncio.Event] = None, interval: int = EXPIRY_SWEEP_INTERVAL, verbose: bool = False):
+    stop = stop or asyncio.Event()
+    while not stop.is_set():
+        try:
+            deleted = await sweep_expired()
+            if verbose:
+                print(f"[expiry-sweep {datetime.utcnow():%H:%M:%S}] deleted {deleted}", flush=True)
+        except Exception as exc:  # keep the loop alive through DB hiccups
+            stats["last_error"] = f"{exc.__class__.__name__}: {exc}"
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _main(args):
+    try:
+        if args.once:
+            print(await sweep_expired())
+        else:
+            await run_forever(interval=args.interval, verbose=True)
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    # Mappers resolve relationship() names across every model module
+    from ..models import (  # noqa: F401
+        user_model, course_model, resource_model, registration_model,
+        new_registration_model, problem_model, codeforces_ladder_model,
+        contact_us_model, organization_model, catalog_model, testing_mode,
+    )
+
+    parser = argparse.ArgumentParser(description="Delete expired verifications, signups and reset OTPs")
+    parser.add_argument("--once", action="store_true", help="sweep once and exit")
+    parser.add_argument("--interval", type=int, default=EXPIRY_SWEEP_INTERVAL, help="seconds between sweeps")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -1,62 +1,90 @@
-from app.routers.codeforces_ladder import cp51
-from app.routers.contact_us import contact_us
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
-from datetime import datetime
-from types import SimpleNamespace
-from pathlib import Path
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import os
 
-# ✅ Load environment variables from .env
-load_dotenv()
-
-# ✅ Determine base directory (cross-platform)
-BASE_DIR = Path(__file__).resolve().parent
-
-# ✅ Get UPLOAD_DIR from environment or default to ./uploads
-UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", BASE_DIR / "uploads"))
-
-# ✅ Ensure the upload directory exists
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+import anyio
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
-# ✅ Create FastAPI app
-app = FastAPI()
+# ✅ Engines (importing this loads .env once for the whole app)
+from .connection.database import engine, async_engine, Base, SessionLocal
+from .connection import instrumentation
 
-# ✅ Mount static file route for uploaded files
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
+# ✅ Model modules register their mappers on import and relationship() names
+# resolve across all of them, so each one is imported here explicitly
+from .models import (  # noqa: F401
+    user_model, course_model, resource_model, registration_model,
+    new_registration_model, problem_model, codeforces_ladder_model,
+    contact_us_model, organization_model, catalog_model, testing_mode,
+)
 
-# ✅ Import routers and models
+# ✅ Routers
 from .routers.users import login, signup, user
 from .routers.courses import student_courses, teacher_courses, course, domains
 from .routers.resources import resources
-from .connection.database import engine, Base
-from .models.testing_mode import *
-from .models.user_model import User, TempUser, UserDetails, UserSocialDetails
-from .models.course_model import *
-from .models.resource_model import *
-from .models.registration_model import *
-from .routers.registration import registraion
-from .models.registration_model import CourseRegistration
-from .models.registration_model import Payment
-from .models.problem_model import (
-    CodingProblem, Tag, Company,
-    ProblemTag, ProblemCompany, Sheet,
-    SheetProblem, Favorite
-)
+from .routers.registration import registraion, new_registration
 from .routers.problems import problems
-from .routers.codeforces_ladder import codeforces_ladder
-from .models.codeforces_ladder_model import *
-from .routers.contact_us import *
-from .models.contact_us_model import *
-from .models.new_registration_model import CustomerPayment
-from .routers.registration import new_registration
-from .models.organization_model import Organization
+from .routers.problems.problem_index import problem_index
+from .routers.codeforces_ladder import codeforces_ladder, cp51
+from .routers.contact_us import contact_us
 from .routers.organization import organization
+from .routers.admin import db_stats
+from .routers.search import search
+from .routers.search.search_index import search_index
+from .routers.codeforces_ladder.cf_client import cf_client
+from .jobs.cf_sync import scheduler as cf_sync_scheduler, CF_SYNC_IN_WORKER
+from .jobs import expiry_sweep
+from .routers.resources.votes import vote_buffer, RESOURCE_VOTE_WRITE_BEHIND
+from .utils.razorpay_client import get_razorpay_client
+from .utils.uploads import UPLOAD_DIR
+
+
+# ✅ Startup/shutdown. Import stays free of side effects (filesystem, network
+# clients, DB reads); everything a worker needs before serving happens here.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Threadpool size for sync endpoints (THREADPOOL_TOKENS, set by main.py --prod)
+    tokens = os.getenv("THREADPOOL_TOKENS")
+    if tokens:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = int(tokens)
+
+    # Warm the /problems/filter and /search indexes and the payment client before taking traffic
+    def warm_up():
+        with SessionLocal() as db:
+            problem_index.build(db)
+            search_index.build(db)
+        get_razorpay_client()
+    await anyio.to_thread.run_sync(warm_up)
+
+    # Background Codeforces sync (single-worker setups; otherwise run python -m app.jobs.cf_sync)
+    cf_sync_task = asyncio.create_task(cf_sync_scheduler.run_forever()) if CF_SYNC_IN_WORKER else None
+    # Expired verification/OTP cleanup (otherwise run python -m app.jobs.expiry_sweep)
+    sweep_task = asyncio.create_task(expiry_sweep.run_forever()) if expiry_sweep.EXPIRY_SWEEP_IN_WORKER else None
+    # Buffered resource vote counters (flushes what's left when cancelled)
+    vote_task = asyncio.create_task(vote_buffer.run_forever()) if RESOURCE_VOTE_WRITE_BEHIND else None
+
+    yield
+
+    for task in (cf_sync_task, sweep_task, vote_task):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    # Release pooled connections once uvicorn has drained in-flight requests
+    await cf_client.aclose()
+    await async_engine.dispose()
+    engine.dispose()
 
 
+# ✅ Create FastAPI app
+app = FastAPI(lifespan=lifespan)
+
+# ✅ Mount static file route for uploaded files (the directory is created in lifespan)
+app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR, check_dir=False), name="uploads")
 
 
 # ✅ Create tables
@@ -104,6 +132,23 @@ from .routers.organization import organization
 # CourseMentor.__table__.drop(engine, checkfirst=True)
 
 
+# ✅ Per-request SQL stats (X-DB-Queries / X-DB-Time headers)
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    stats, token = instrumentation.start_request()
+    stats.route = f"{request.method} {request.url.path}"
+    try:
+        response = await call_next(request)
+    finally:
+        instrumentation.end_request(token)
+
+    route = request.scope.get("route")
+    instrumentation.record_route(f"{request.method} {route.path if route else '<unmatched>'}", stats)
+    response.headers["X-DB-Queries"] = str(stats.queries)
+    response.headers["X-DB-Time"] = f"{stats.db_time * 1000:.2f}ms"
+    return response
+
+
 # ✅ CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -111,6 +156,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Time", "ETag"],
 )
 
 # ✅ Register routers
@@ -129,6 +175,8 @@ app.include_router(contact_us.router)
 app.include_router(cp51.router)
 app.include_router(new_registration.router)
 app.include_router(organization.router)
+app.include_router(db_stats.router)
+app.include_router(search.router)
 
 
 
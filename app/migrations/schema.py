@@ -0,0 +1,152 @@
+"""
+Idempotent schema upgrades for tables that already exist.
+
+Base.metadata.create_all() only creates missing tables, so indexes and
+columns added to existing models are applied here, along with tables that
+newer code depends on and backfills for derived columns. Safe to re-run:
+
+    python -m app.migrations.schema
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, select, update, delete, bindparam, text, func
+from sqlalchemy.schema import CreateColumn
+
+from ..connection.database import engine, Base
+from ..models.problem_model import CodingProblem
+from ..models.catalog_model import CatalogVersion
+from ..models.codeforces_ladder_model import (
+    CodeforcesSolvedCache, LadderProblem, UserProblemStatus, LeaderboardCounter, PendingVerification,
+)
+from ..models.user_model import TempUser, ForgetPassword
+from ..models.resource_model import Resource
+from ..routers.codeforces_ladder.leaderboard import rebuild_counters
+from ..routers.resources.votes import recount_votes
+from ..utils.etag import seed_catalogs
+from ..utils.judges import parse_problem_url
+
+
+def ensure_indexes(conn, table):
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def ensure_columns(conn, table, *names):
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    preparer = conn.dialect.identifier_preparer
+    for name in names:
+        if name not in existing:
+            ddl = CreateColumn(table.c[name]).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+
+
+def ensure_not_null(conn, table, name):
+    """Add NOT NULL to an existing, backfilled column (SQLite can't alter columns and is left as is)."""
+    column = next(column for column in inspect(conn).get_columns(table.name) if column["name"] == name)
+    if not column["nullable"] or conn.dialect.name not in ("mysql", "postgresql"):
+        return
+    preparer = conn.dialect.identifier_preparer
+    target, quoted = preparer.format_table(table), preparer.format_column(table.c[name])
+    if conn.dialect.name == "mysql":
+        ddl = table.c[name].type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {target} MODIFY {quoted} {ddl} NOT NULL"))
+    else:
+        conn.execute(text(f"ALTER TABLE {target} ALTER COLUMN {quoted} SET NOT NULL"))
+
+
+def backfill_judge_keys(conn, batch_size=1000):
+    """Parse problem_url into (judge, contest_id, problem_index) for rows that lack it."""
+    table = LadderProblem.__table__
+    rows = conn.execute(select(table.c.id, table.c.problem_url).where(table.c.judge.is_(None))).all()
+    values = [
+        {"row_id": row_id, "judge": key[0], "contest_id": key[1], "problem_index": key[2]}
+        for row_id, key in ((row_id, parse_problem_url(url)) for row_id, url in rows)
+        if key
+    ]
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(judge=bindparam("judge"), contest_id=bindparam("contest_id"), problem_index=bindparam("problem_index"))
+    )
+    for start in range(0, len(values), batch_size):
+        conn.execute(statement, values[start:start + batch_size])
+    return len(values)
+
+
+def dedupe_user_problem_status(conn, batch_size=1000):
+    """Keep one row per (user_id, problem_id), the most recently checked one."""
+    table = UserProblemStatus.__table__
+    duplicated = (
+        select(table.c.user_id, table.c.problem_id)
+        .group_by(table.c.user_id, table.c.problem_id)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    rows = conn.execute(
+        select(table.c.id, table.c.user_id, table.c.problem_id)
+        .join(duplicated, (table.c.user_id == duplicated.c.user_id) & (table.c.problem_id == duplicated.c.problem_id))
+        .order_by(table.c.user_id, table.c.problem_id, table.c.checked_at.desc(), table.c.id.desc())
+    ).all()
+    kept, doomed = set(), []
+    for row_id, user_id, problem_id in rows:
+        if (user_id, problem_id) in kept:
+            doomed.append(row_id)
+        else:
+            kept.add((user_id, problem_id))
+    for start in range(0, len(doomed), batch_size):
+        conn.execute(delete(table).where(table.c.id.in_(doomed[start:start + batch_size])))
+    return len(doomed)
+
+
+def upgrade(bind=engine):
+    with bind.begin() as conn:
+        # keyset pagination on /problems/all_problem, which needs a created_at
+        # on every row; rows from before it was set fall back to updated_at
+        problems = CodingProblem.__table__
+        conn.execute(
+            update(problems)
+            .where(problems.c.created_at.is_(None))
+            .values(created_at=func.coalesce(problems.c.updated_at, datetime.utcnow()))
+        )
+        ensure_not_null(conn, problems, "created_at")
+        ensure_indexes(conn, problems)
+
+        # catalog versions behind the ETags on list endpoints
+        Base.metadata.create_all(conn, tables=[CatalogVersion.__table__])
+        seed_catalogs(conn)
+
+        # per-handle Codeforces solved sets behind ladder progress
+        Base.metadata.create_all(conn, tables=[CodeforcesSolvedCache.__table__])
+
+        # judge keys on ladder problems, parsed once instead of per request
+        ensure_columns(conn, LadderProblem.__table__, "judge", "contest_id", "problem_index")
+        ensure_indexes(conn, LadderProblem.__table__)
+        backfill_judge_keys(conn)
+
+        # one status row per user and problem, so writes can upsert
+        dedupe_user_problem_status(conn)
+        ensure_indexes(conn, UserProblemStatus.__table__)
+
+        # leaderboard counters, rebuilt from statuses (also repairs any drift)
+        Base.metadata.create_all(conn, tables=[LeaderboardCounter.__table__])
+        ensure_columns(conn, LeaderboardCounter.__table__, "version")
+        rebuild_counters(conn)
+
+        # expiry columns the sweeper deletes by
+        for model in (PendingVerification, TempUser, ForgetPassword):
+            ensure_indexes(conn, model.__table__)
+
+        # ranking columns for /resources/list; rows from before created_at
+        # existed count as created now
+        ensure_columns(conn, Resource.__table__, "created_at", "score", "hot")
+        conn.execute(update(Resource.__table__).where(Resource.created_at.is_(None)).values(created_at=datetime.utcnow()))
+        ensure_indexes(conn, Resource.__table__)
+
+        # resource vote counters and sort keys, recounted from the votes (repairs
+        # updates lost to the old read-modify-write and any unflushed write-behind deltas)
+        recount_votes(conn)
+
+
+if __name__ == "__main__":
+    upgrade()
+    print("Schema is up to date")
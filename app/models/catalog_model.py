@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..connection.database import Base
+
+
+# ==============================================
+# Catalog Version Model
+# ==============================================
+# One row per cacheable catalog (tags, companies, ladders, ...). Write
+# endpoints bump the version in the same transaction as the change, and
+# read endpoints derive their ETag from it (see app/utils/etag.py).
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=1, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,9 +1,10 @@
 from sqlalchemy import (
-    Column, Integer, String, ForeignKey, DateTime, Boolean, Text
+    Column, Integer, BigInteger, String, ForeignKey, DateTime, Boolean, Text, Index
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from ..connection.database import Base
+from ..utils.judges import parse_problem_url
 
 
 
@@ -101,6 +102,16 @@ class LadderProblem(Base):
     online_judge = Column(String(50), nullable=True)
     difficulty = Column(String(20), nullable=True)
 
+    # Judge key parsed from problem_url once, on write (app.utils.judges);
+    # rows written with raw SQL are filled by `python -m app.migrations.schema`
+    judge = Column(String(20), nullable=True)
+    contest_id = Column(Integer, nullable=True)
+    problem_index = Column(String(10), nullable=True)
+
+    __table_args__ = (
+        Index("ix_ladder_problems_judge_key", "judge", "contest_id", "problem_index"),
+    )
+
     # Relationships
     ladder = relationship("Ladder", back_populates="problems")
     user_status = relationship(
@@ -114,7 +125,10 @@ class LadderProblem(Base):
         cascade="all, delete-orphan"
     )
 
-    
+    @validates("problem_url")
+    def _set_judge_key(self, key, url):
+        self.judge, self.contest_id, self.problem_index = parse_problem_url(url) or (None, None, None)
+        return url
 
 
 # ==============================================
@@ -140,6 +154,12 @@ class UserProblemStatus(Base):
     is_revisit = Column(Boolean, default=False)
     checked_at = Column(DateTime, default=datetime.utcnow)
 
+    # One row per user and problem; writes upsert against it (app.utils.upsert).
+    # A unique index rather than a constraint so existing tables can gain it.
+    __table_args__ = (
+        Index("uq_user_problem_status", "user_id", "problem_id", unique=True),
+    )
+
     # Relationships
     problem = relationship("LadderProblem", back_populates="user_status")
     user = relationship("User", back_populates="problem_status")
@@ -170,6 +190,41 @@ class UserCPProfile(Base):
     user = relationship("User", back_populates="cp_profile")
 
 
+# ==============================================
+# Leaderboard Counter Table
+# ==============================================
+class LeaderboardCounter(Base):
+    """
+    Solved problems per user, overall (ladder_id 0) and per ladder; moved by
+    status writes. The overall row's version counts the user's status writes
+    and keys the progress ETag.
+    """
+    __tablename__ = "ladder_leaderboard"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    ladder_id = Column(Integer, primary_key=True)  # 0 = all ladders
+    solved = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # overall row only
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_ladder_leaderboard_board", "ladder_id", "solved", "user_id"),
+    )
+
+
+# ==============================================
+# Codeforces Solved Cache Table
+# ==============================================
+class CodeforcesSolvedCache(Base):
+    """Solved problems per Codeforces handle, refreshed incrementally from user.status."""
+    __tablename__ = "codeforces_solved_cache"
+
+    handle = Column(String(50), primary_key=True)  # lower-cased, handles are case-insensitive
+    solved = Column(Text, nullable=False, default="")  # space-separated keys, e.g. "1850A 1850B"
+    last_submission_id = Column(BigInteger, nullable=True)  # newest submission already folded in
+    fetched_at = Column(DateTime, nullable=True, index=True)
+
+
 class PendingVerification(Base):
     __tablename__ = "pending_verifications"
 
@@ -186,7 +241,7 @@ class PendingVerification(Base):
 
     problem_id = Column(String(100), nullable=False, index=True)  # Now plain string
 
-    expiry_at = Column(DateTime, nullable=False)
+    expiry_at = Column(DateTime, nullable=False, index=True)  # swept by app.jobs.expiry_sweep
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -5,7 +5,8 @@ from sqlalchemy import (
     Text,
     Enum,
     DateTime,
-    ForeignKey
+    ForeignKey,
+    Index
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -80,7 +81,7 @@ class CodingProblem(Base):
     title = Column(String(255), nullable=False)
     link = Column(String(500), unique=True, nullable=False)  # <-- change nullable if needed
     difficulty = Column(Enum("Easy", "Medium", "Hard", name="difficulty_levels"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # keyset pagination key
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_by = Column(Integer, ForeignKey("users.id"))
     gitHubLink = Column(String(500))
@@ -103,6 +104,11 @@ class CodingProblem(Base):
     # Favorites
     favorites = relationship("Favorite", back_populates="problem", cascade="all, delete-orphan")
 
+    # Keyset pagination (newest first) on /problems/all_problem
+    __table_args__ = (
+        Index("ix_coding_problems_created_at_id", "created_at", "id"),
+    )
+
 
 # ==============================================
 # Sheet Model
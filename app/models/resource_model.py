@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Boolean   
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Boolean, DateTime, Double, Index
 from sqlalchemy.orm import relationship
 from ..connection.database import Base
 
@@ -40,12 +42,26 @@ class Resource(Base):
     added_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_verified = Column(Boolean, default=False)
 
+    # Ranking, kept in step with the vote counters (routers/resources/ranking.py)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    score = Column(Integer, nullable=False, default=0, server_default="0")  # upvote - downvote
+    hot = Column(Double, nullable=False, default=0, server_default="0")
+
     domain = relationship("Domain", back_populates="resources")
     subdomain = relationship("Subdomain", back_populates="resources")
     user = relationship('User', back_populates='resources')
 
     votes = relationship("ResourceVote", back_populates="resource", cascade="all, delete")
 
+    # Keyset pagination on /resources/list, highest first, overall and per subdomain
+    __table_args__ = (
+        Index("ix_resources_score_id", "score", "id"),
+        Index("ix_resources_hot_id", "hot", "id"),
+        Index("ix_resources_subdomain_score_id", "subdomain_id", "score", "id"),
+        Index("ix_resources_subdomain_hot_id", "subdomain_id", "hot", "id"),
+        Index("ix_resources_subdomain_id_id", "subdomain_id", "id"),
+    )
+
 
 class ResourceVote(Base):
     __tablename__ = "resource_votes"
@@ -34,7 +34,7 @@ class TempUser(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     otp = Column(String(6), nullable=False)
     preferredAccount = Column(String(20))
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # swept by app.jobs.expiry_sweep
 
 
 class User(Base):
@@ -133,4 +133,4 @@ class ForgetPassword(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(150), unique=True, index=True, nullable=False)
     otp = Column(String(6), nullable=False)
-    expiredAt = Column(DateTime, nullable=False)
+    expiredAt = Column(DateTime, nullable=False, index=True)  # swept by app.jobs.expiry_sweep
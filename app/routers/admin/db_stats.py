@@ -0,0 +1,38 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from ...connection import instrumentation
+
+# Shared secret for the admin endpoints, sent as X-Admin-Token; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/db-stats", summary="Routes ranked by SQL cost, plus sampled slow queries")
+def get_db_stats(
+    sort_by: str = Query("queries", description="queries | db_time | total_db_time"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    return {
+        "slow_query_threshold_ms": instrumentation.SLOW_QUERY_MS,
+        "routes": instrumentation.worst_routes(sort_by=sort_by, limit=limit),
+        "slow_queries": list(instrumentation.slow_queries)[-limit:],
+    }
+
+
+@router.delete("/db-stats", summary="Reset collected SQL stats")
+def reset_db_stats():
+    instrumentation.reset_stats()
+    return {"message": "DB stats reset"}
@@ -0,0 +1,193 @@
+import asyncio
+import os
+import random
+import time
+from typing import AsyncIterator, Optional
+
+import httpx
+import orjson
+
+from ...utils.json_stream import iter_array_items
+
+# Base URL is configurable so benchmarks can point at benchmarks/fake_codeforces.py
+CF_API_BASE = os.getenv("CF_API_BASE", "https://codeforces.com/api")
+CF_TIMEOUT = float(os.getenv("CF_TIMEOUT", "10"))
+CF_MAX_RETRIES = int(os.getenv("CF_MAX_RETRIES", "3"))
+
+# Codeforces allows roughly one call per 2 seconds per client IP. Every worker
+# process has its own bucket, so the interval is stretched by the worker count
+# to keep the whole box under the limit.
+CF_MIN_INTERVAL = float(os.getenv("CF_MIN_INTERVAL", "2"))
+CF_BURST = int(os.getenv("CF_BURST", "1"))
+
+RETRYABLE_COMMENTS = ("call limit exceeded", "temporarily unavailable")
+
+
+class CodeforcesError(Exception):
+    """A FAILED response (or exhausted retries) from the Codeforces API."""
+
+    def __init__(self, comment: str):
+        super().__init__(comment)
+        self.comment = comment
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CodeforcesClient:
+    """
+    Shared async client for the Codeforces API.
+
+    - one keep-alive connection pool per worker
+    - global token bucket (CF_MIN_INTERVAL x WEB_CONCURRENCY between calls)
+    - retries with full jitter on network errors, 5xx/429 and "Call limit exceeded"
+    - identical concurrent calls share one upstream request
+    - stream() parses list results one item at a time, for large payloads
+    """
+
+    def __init__(self, base_url: str = CF_API_BASE, min_interval: Optional[float] = None):
+        workers = int(os.getenv("WEB_CONCURRENCY", "1") or 1)
+        self.base_url = base_url.rstrip("/")
+        self.min_interval = min_interval if min_interval is not None else CF_MIN_INTERVAL * workers
+        self._bucket = None
+        self._http = None
+        self._loop = None
+        self._inflight: dict = {}
+        self.stats = {"calls": 0, "upstream_requests": 0, "coalesced": 0, "retries": 0}
+
+    def _ensure_loop_state(self):
+        # The pool, bucket and in-flight futures belong to one event loop; tests
+        # and CLIs may run several loops in sequence, so rebuild on a new loop.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(CF_TIMEOUT, connect=5),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                headers={"User-Agent": "peerprogrammers-ladder-sync"},
+            )
+            self._bucket = TokenBucket(1 / self.min_interval, CF_BURST) if self.min_interval > 0 else None
+            self._inflight = {}
+
+    async def call(self, method: str, **params):
+        """Return the `result` of a Codeforces API method, e.g. call("user.info", handles="tourist")."""
+        self._ensure_loop_state()
+        self.stats["calls"] += 1
+        key = (method, tuple(sorted(params.items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(method, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one caller disconnecting must not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    async def _wait_turn(self, attempt: int):
+        """Backoff (on retries) and rate limiting in front of every upstream request."""
+        if attempt:
+            self.stats["retries"] += 1
+            await asyncio.sleep(random.uniform(0, max(self.min_interval, 0.5) * 2 ** attempt))
+        if self._bucket:
+            await self._bucket.acquire()
+        self.stats["upstream_requests"] += 1
+
+    @staticmethod
+    def _failure(status_code: int, body: bytes) -> str:
+        """Retryable error text for a failed response; raises CodeforcesError when retrying won't help."""
+        if status_code == 429 or status_code >= 500:
+            return f"HTTP {status_code}"
+        try:
+            data = orjson.loads(body)
+        except ValueError:
+            return f"HTTP {status_code}: invalid JSON"
+        comment = data.get("comment") or f"HTTP {status_code}"
+        if not any(c in comment.lower() for c in RETRYABLE_COMMENTS):
+            raise CodeforcesError(comment)
+        return comment
+
+    async def _request(self, method: str, params: dict):
+        last_error = "no response"
+        for attempt in range(CF_MAX_RETRIES + 1):
+            await self._wait_turn(attempt)
+            try:
+                response = await self._http.get(f"/{method}", params=params)
+            except httpx.TransportError as exc:
+                last_error = f"{exc.__class__.__name__}: {exc}"
+                continue
+
+            if response.status_code == 200:
+                try:
+                    data = orjson.loads(response.content)
+                except ValueError:
+                    last_error = "HTTP 200: invalid JSON"
+                    continue
+                if data.get("status") == "OK":
+                    return data.get("result")
+            last_error = self._failure(response.status_code, response.content)
+        raise CodeforcesError(f"{last_error} (after {CF_MAX_RETRIES} retries)")
+
+    async def stream(self, method: str, **params) -> AsyncIterator:
+        """
+        Yield the items of a list `result` as the body arrives, e.g.
+        stream("user.status", handle="tourist", count=100).
+
+        Only the current item is held in memory. Closing the generator early
+        (async with contextlib.aclosing(...)) drops the connection without
+        reading the rest. Not coalesced, since callers stop at different
+        points; retries only happen before the first item.
+        """
+        self._ensure_loop_state()
+        self.stats["calls"] += 1
+        last_error = "no response"
+        for attempt in range(CF_MAX_RETRIES + 1):
+            await self._wait_turn(attempt)
+            started = False
+            try:
+                async with self._http.stream("GET", f"/{method}", params=params) as response:
+                    if response.status_code != 200:
+                        last_error = self._failure(response.status_code, await response.aread())
+                        continue
+                    async for item in iter_array_items(response.aiter_bytes(), "result"):
+                        started = True
+                        yield item
+                    return
+            except (httpx.TransportError, ValueError) as exc:
+                if started:
+                    raise CodeforcesError(f"{exc.__class__.__name__} mid-response: {exc}") from exc
+                last_error = f"{exc.__class__.__name__}: {exc}"
+        raise CodeforcesError(f"{last_error} (after {CF_MAX_RETRIES} retries)")
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = self._loop = None
+
+
+cf_client = CodeforcesClient()
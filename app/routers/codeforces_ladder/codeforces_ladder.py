@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, delete, case, and_, or_
 from datetime import datetime
-import requests
-import re
+from typing import Optional
 
 from ...models.codeforces_ladder_model import (
     Ladder,
@@ -12,32 +13,32 @@ from ...models.codeforces_ladder_model import (
     UserCPProfile,
 )
 from ...models.user_model import User
-from ...connection.utility import get_db
+from ...connection.utility import get_db, get_async_db
+from ...utils.etag import catalog_etag, catalog_token, check_etag
+from ...utils.pagination import encode_cursor, decode_cursor
+from ...schemas.ladder_schema import ProblemStatusBatch
+from .cf_client import cf_client, CodeforcesError
+from .solved_cache import refresh_solved, cached_solved, stats as solved_cache_stats
+from .ladder_sync import ladder_keys, record_solved, toggle_revisit, write_statuses
+from . import leaderboard
+from ...jobs.cf_sync import scheduler as cf_sync_scheduler, lag_report
 
 router = APIRouter(prefix="/ladders", tags=["Ladders"])
 
 
-def fetch_solved_from_codeforces(handle: str):
-    url = f"https://codeforces.com/api/user.status?handle={handle}"
-    r = requests.get(url)
-    data = r.json()
-    if data.get("status") != "OK":
-        raise HTTPException(
-            status_code=400, detail=f"Codeforces API error: {data.get('comment')}"
-        )
-    solved_set = set()
-    for sub in data["result"]:
-        if sub.get("verdict") == "OK":
-            prob = sub["problem"]
-            key = f"{prob.get('contestId', '')}{prob.get('index', '')}"
-            solved_set.add(key)
-    return solved_set
+async def fetch_solved_from_codeforces(handle: str):
+    # Incremental: only submissions newer than the handle's cached ones are downloaded
+    try:
+        return await refresh_solved(handle)
+    except CodeforcesError as e:
+        raise HTTPException(status_code=400, detail=f"Codeforces API error: {e.comment}")
 
 
 # ✅ Fetch all ladders metadata (no problem limit needed)
-@router.get("/", summary="Fetch all ladders only (no problems)")
-def get_all_ladders_meta(db: Session = Depends(get_db)):
-    ladders = db.query(Ladder).all()
+# Ladders are seeded outside the API; run `python -m app.utils.etag ladders` after reseeding
+@router.get("/", summary="Fetch all ladders only (no problems)", dependencies=[Depends(catalog_etag("ladders"))])
+async def get_all_ladders_meta(db: AsyncSession = Depends(get_async_db)):
+    ladders = (await db.execute(select(Ladder))).scalars().all()
     return [
         {
             "id": ladder.id,
@@ -97,111 +98,88 @@ def get_ladder_problems(
 @router.post(
     "/problems/{problem_id}/user/{user_id}/revisit", summary="Mark problem for revisit"
 )
-def mark_problem_revisit(problem_id: int, user_id: int, db: Session = Depends(get_db)):
-    if not db.query(LadderProblem).filter(LadderProblem.id == problem_id).first():
+async def mark_problem_revisit(problem_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
+    if not await db.get(LadderProblem, problem_id):
         raise HTTPException(status_code=404, detail="Problem not found")
-    status = (
-        db.query(UserProblemStatus)
-        .filter(
-            UserProblemStatus.problem_id == problem_id,
-            UserProblemStatus.user_id == user_id,
-        )
-        .first()
-    )
-    if not status:
-        status = UserProblemStatus(
-            user_id=user_id,
-            problem_id=problem_id,
-            is_revisit=True,
-            checked_at=datetime.utcnow(),
-        )
-        db.add(status)
-    else:
-        status.is_revisit = not status.is_revisit
-        status.checked_at = datetime.utcnow()
-    db.commit()
-    return {"message": f"Problem revisit status updated to {status.is_revisit}"}
+    is_revisit = await toggle_revisit(db, user_id, problem_id, datetime.utcnow())
+    await db.commit()
+    return {"message": f"Problem revisit status updated to {is_revisit}"}
 
 
 # ✅ Update solve status
 @router.post(
     "/problems/{problem_id}/status", summary="Mark problem solved/unsolved for a user"
 )
-def update_problem_status(
+async def update_problem_status(
     problem_id: int,
     user_id: int = Query(...),
     is_completed: bool = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    problem = db.query(LadderProblem).filter(LadderProblem.id == problem_id).first()
+    problem = await db.get(LadderProblem, problem_id)
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found")
-    status = (
-        db.query(UserProblemStatus)
-        .filter(
-            UserProblemStatus.problem_id == problem_id,
-            UserProblemStatus.user_id == user_id,
-        )
-        .first()
-    )
-    if status:
-        status.is_completed = is_completed
-        status.checked_at = datetime.utcnow()
-    else:
-        status = UserProblemStatus(
-            user_id=user_id,
-            problem_id=problem_id,
-            is_completed=is_completed,
-            checked_at=datetime.utcnow(),
-        )
-        db.add(status)
-    db.commit()
+    change = {"problem_id": problem_id, "is_completed": is_completed}
+    await write_statuses(db, user_id, [change], datetime.utcnow())
+    await db.commit()
     return {
         "message": f"Problem marked as {'completed' if is_completed else 'not completed'}"
     }
 
 
+# ✅ Update many problem statuses at once
+@router.post(
+    "/user/{user_id}/status", summary="Set completed/revisit flags for many problems in one request"
+)
+async def update_problem_statuses(
+    user_id: int, batch: ProblemStatusBatch, db: AsyncSession = Depends(get_async_db)
+):
+    # Last change wins when a problem appears twice
+    changes = {c.problem_id: c.model_dump() for c in batch.changes}
+    known = set(
+        (
+            await db.execute(select(LadderProblem.id).filter(LadderProblem.id.in_(changes)))
+        ).scalars()
+    )
+    unknown = sorted(changes.keys() - known)
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Problems not found: {unknown}")
+
+    await write_statuses(db, user_id, list(changes.values()), datetime.utcnow())
+    await db.commit()
+    return {"message": f"Updated {len(changes)} problem statuses", "updated": len(changes)}
+
+
 # ✅ Get completed problems for a user in a ladder (limit to 10)
 @router.get(
     "/{ladder_id}/user/{user_id}/completed",
     summary="Fetch completed problems for a user",
 )
-def get_completed_problems(ladder_id: int, user_id: int, db: Session = Depends(get_db)):
+async def get_completed_problems(ladder_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
     cp_profile = (
-        db.query(UserCPProfile).filter(UserCPProfile.user_id == user_id).first()
-    )
+        await db.execute(select(UserCPProfile).filter(UserCPProfile.user_id == user_id))
+    ).scalars().first()
+    # Served from the handle's cached solved set (refreshed in the background
+    # when stale); until the first fetch lands, fall back to stored statuses
+    solved_set = None
     if cp_profile and cp_profile.codeforces_handle:
-        solved_set = fetch_solved_from_codeforces(cp_profile.codeforces_handle)
-        ladder_problems = (
-            db.query(LadderProblem.id, LadderProblem.problem_url)
-            .filter(LadderProblem.ladder_id == ladder_id)
-            .limit(10)  # (fetch up to 50 to have margin, will slice to 10 after check)
-            .all()
-        )
-        completed_ids = []
-        for pid, url in ladder_problems:
-            match = re.search(
-                r"(?:/contest/|/problemset/problem/)(\d+)/([A-Z]\d*)", url
-            )
-            if match:
-                contest_id, index = match.groups()
-                if f"{contest_id}{index}" in solved_set:
-                    completed_ids.append({"id": pid})
-            if len(completed_ids) >= 10:
-                break
-        return completed_ids
+        solved_set = await cached_solved(db, cp_profile.codeforces_handle)
+    if solved_set is not None:
+        solved_ids = await ladder_keys.solved_ids(db, solved_set, ladder_id)
+        return [{"id": pid} for pid in solved_ids[:10]]
     else:
         problems = (
-            db.query(UserProblemStatus.problem_id)
-            .join(LadderProblem, UserProblemStatus.problem_id == LadderProblem.id)
-            .filter(
-                LadderProblem.ladder_id == ladder_id,
-                UserProblemStatus.user_id == user_id,
-                UserProblemStatus.is_completed == True,
+            await db.execute(
+                select(UserProblemStatus.problem_id)
+                .join(LadderProblem, UserProblemStatus.problem_id == LadderProblem.id)
+                .filter(
+                    LadderProblem.ladder_id == ladder_id,
+                    UserProblemStatus.user_id == user_id,
+                    UserProblemStatus.is_completed == True,
+                )
+                .limit(10)
             )
-            .limit(10)
-            .all()
-        )
+        ).all()
         return [{"id": pid} for (pid,) in problems]
 
 
@@ -225,61 +203,88 @@ def get_revisited_problems(ladder_id: int, user_id: int, db: Session = Depends(g
     return [{"id": pid} for (pid,) in problems]
 
 
-@router.get("/cp51/leaderboard", summary="Get CP51 Leaderboard")
-def get_cp51_leaderboard(db: Session = Depends(get_db)):
-    total_problems = db.query(func.count(LadderProblem.id)).scalar() or 0
-    solved_counts = (
-        db.query(
-            UserProblemStatus.user_id,
-            func.count(UserProblemStatus.problem_id).label("solved_count"),
-        )
-        .filter(UserProblemStatus.is_completed == True)
-        .group_by(UserProblemStatus.user_id)
-        .all()
-    )
-    solved_dict = {user_id: solved_count for user_id, solved_count in solved_counts}
-    user_ids = list(solved_dict.keys())
-    users = db.query(User).all()
-    leaderboard = []
-    for u in users:
-        solved = solved_dict.get(u.id, 0)
-        progress_pct = (solved / total_problems * 100) if total_problems else 0
-        if progress_pct >= 40:
-            title = "🏆 Conqueror"
-        elif progress_pct >= 30:
-            title = "🎯 Ace"
-        elif progress_pct >= 20:
-            title = "👑 Crown"
-        elif progress_pct >= 10:
-            title = "💎 Diamond"
-        elif progress_pct >= 8:
-            title = "🔘 Platinum"
-        elif progress_pct >= 5:
-            title = "🥇 Gold"
-        else:
-            title = "🥈 Silver"
-        leaderboard.append(
-            {
-                "user": u.username,
-                "problems_solved": solved,
-                "progress": f"{round(progress_pct)}% of total",
-                "title": title,
-            }
+@router.get(
+    "/user/{user_id}/progress",
+    summary="Solved and revisit progress on every ladder for a user",
+)
+async def get_user_progress(
+    user_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    # Changes whenever the user writes a status (their progress version) or ladders are reseeded
+    token = catalog_token(("ladders",))
+    if token is not None:
+        version = await leaderboard.progress_version(db, user_id)
+        check_etag(request, response, f'W/"progress-{user_id}-{version}-{token}"')
+
+    status = UserProblemStatus
+    ladders = (
+        await db.execute(
+            select(
+                LadderProblem.ladder_id,
+                func.count(LadderProblem.id),
+                func.sum(case((status.is_completed == True, 1), else_=0)),
+                func.sum(case((status.is_revisit == True, 1), else_=0)),
+            )
+            .outerjoin(status, and_(status.problem_id == LadderProblem.id, status.user_id == user_id))
+            .group_by(LadderProblem.ladder_id)
+            .order_by(LadderProblem.ladder_id)
         )
-    leaderboard.sort(key=lambda x: x["problems_solved"], reverse=True)
-    for idx, entry in enumerate(leaderboard, start=1):
-        entry["rank"] = idx
-    total_users = len(leaderboard)
-    avg_solved = (
-        round(sum(e["problems_solved"] for e in leaderboard) / total_users)
-        if total_users
-        else 0
+    ).all()
+    progress = {
+        ladder_id: {
+            "ladder_id": ladder_id,
+            "total_problems": total,
+            "solved_count": solved or 0,
+            "revisit_count": revisit or 0,
+            "completed_ids": [],
+            "revisit_ids": [],
+        }
+        for ladder_id, total, solved, revisit in ladders
+    }
+
+    rows = await db.execute(
+        select(LadderProblem.ladder_id, status.problem_id, status.is_completed, status.is_revisit)
+        .join(LadderProblem, status.problem_id == LadderProblem.id)
+        .filter(status.user_id == user_id, or_(status.is_completed == True, status.is_revisit == True))
+        .order_by(status.problem_id)
     )
+    for ladder_id, problem_id, is_completed, is_revisit in rows:
+        if is_completed:
+            progress[ladder_id]["completed_ids"].append(problem_id)
+        if is_revisit:
+            progress[ladder_id]["revisit_ids"].append(problem_id)
+
     return {
-        "total_users": total_users,
+        "user_id": user_id,
+        "solved_count": sum(p["solved_count"] for p in progress.values()),
+        "revisit_count": sum(p["revisit_count"] for p in progress.values()),
+        "ladders": list(progress.values()),
+    }
+
+
+@router.get("/cp51/leaderboard", summary="Get CP51 Leaderboard")
+async def get_cp51_leaderboard(
+    ladder_id: Optional[int] = Query(None, description="Board for one ladder; omit for all ladders"),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (ignores offset)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Served from the ladder_leaderboard counters, which status writes keep current
+    board_id = ladder_id if ladder_id is not None else leaderboard.GLOBAL_BOARD
+    after = decode_cursor(cursor, "solved", "user_id") if cursor else None
+    total_problems = await leaderboard.total_problems(db, board_id)
+    entries, next_after = await leaderboard.board_page(db, board_id, limit, offset, after)
+    for entry in entries:
+        progress_pct = (entry["problems_solved"] / total_problems * 100) if total_problems else 0
+        entry["progress"] = f"{round(progress_pct)}% of total"
+        entry["title"] = leaderboard.title_for(progress_pct)
+    return {
+        **await leaderboard.board_summary(db, board_id),
         "total_problems": total_problems,
-        "average_solved": avg_solved,
-        "leaderboard": leaderboard,
+        "ladder_id": ladder_id,
+        "leaderboard": entries,
+        "next_cursor": encode_cursor(next_after) if next_after else None,
     }
 
 
@@ -287,36 +292,16 @@ def get_cp51_leaderboard(db: Session = Depends(get_db)):
     "/cp51/leaderboard/user/{user_id}/rank",
     summary="Get a user's rank on the CP51 leaderboard",
 )
-def get_user_rank(user_id: int, db: Session = Depends(get_db)):
-    total_problems = db.query(func.count(LadderProblem.id)).scalar() or 0
-    solved_counts = (
-        db.query(
-            UserProblemStatus.user_id,
-            func.count(UserProblemStatus.problem_id).label("solved_count"),
-        )
-        .filter(UserProblemStatus.is_completed == True)
-        .group_by(UserProblemStatus.user_id)
-        .order_by(func.count(UserProblemStatus.problem_id).desc())
-        .all()
-    )
-    user_rank = None
-    current_rank = 0
-    prev_count = None
-    rank_offset = 0
-    for i, (u_id, solved_count) in enumerate(solved_counts, start=1):
-        if solved_count != prev_count:
-            current_rank = i
-            rank_offset = 0
-        else:
-            rank_offset += 1
-        if u_id == user_id:
-            user_rank = current_rank
-            user_solved = solved_count
-            break
-        prev_count = solved_count
-    if user_rank is None:
-        user_exists = db.query(User).filter(User.id == user_id).first()
-        if not user_exists:
+async def get_user_rank(
+    user_id: int,
+    ladder_id: Optional[int] = Query(None, description="Rank on one ladder; omit for all ladders"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    board_id = ladder_id if ladder_id is not None else leaderboard.GLOBAL_BOARD
+    total_problems = await leaderboard.total_problems(db, board_id)
+    ranked = await leaderboard.rank_of(db, board_id, user_id)
+    if ranked is None:
+        if not (await db.execute(select(User.id).filter(User.id == user_id))).first():
             raise HTTPException(status_code=404, detail="User not found")
         return {
             "user_id": user_id,
@@ -324,6 +309,7 @@ def get_user_rank(user_id: int, db: Session = Depends(get_db)):
             "problems_solved": 0,
             "progress": "0% of total problems",
         }
+    user_rank, user_solved = ranked
     progress_pct = (user_solved / total_problems * 100) if total_problems else 0
     return {
         "user_id": user_id,
@@ -390,7 +376,7 @@ def get_cp_profile(user_id: int, db: Session = Depends(get_db)):
     summary="Sync solved problems from Codeforces for a specific ladder",
 )
 async def sync_codeforces_problems_for_ladder(
-    request: Request, db: Session = Depends(get_db)
+    request: Request, db: AsyncSession = Depends(get_async_db)
 ):
     data = await request.json()
     user_id = data.get("user_id")
@@ -398,101 +384,68 @@ async def sync_codeforces_problems_for_ladder(
     if not user_id or not ladder_id:
         raise HTTPException(status_code=400, detail="Missing user_id or ladder_id")
     cp_profile = (
-        db.query(UserCPProfile).filter(UserCPProfile.user_id == user_id).first()
-    )
+        await db.execute(select(UserCPProfile).filter(UserCPProfile.user_id == user_id))
+    ).scalars().first()
     if not cp_profile or not cp_profile.codeforces_handle:
         raise HTTPException(
             status_code=400, detail="No Codeforces handle found for this user"
         )
-    solved_set = fetch_solved_from_codeforces(cp_profile.codeforces_handle)
-    ladder_problems = (
-        db.query(LadderProblem.id, LadderProblem.problem_url)
-        .filter(
-            LadderProblem.ladder_id == ladder_id,
-        )
-        .all()
-    )
+    solved_set = await fetch_solved_from_codeforces(cp_profile.codeforces_handle)
+    solved_ids = await ladder_keys.solved_ids(db, solved_set, ladder_id)
 
     now = datetime.utcnow()
-    problem_ids_to_update = []
-    problem_status_new = []
-    for pid, url in ladder_problems:
-        match = re.search(r"/problem/(\d+)/([A-Z0-9]+)", url, re.IGNORECASE)
-    
-        if match:
-            contest_id, index = match.groups()
-            # print(f"{contest_id}{index}")
-            # print(100*"_")
-            if f"{contest_id}{index}" in solved_set:
-                existing_status = (
-                    db.query(UserProblemStatus)
-                    .filter(
-                        UserProblemStatus.problem_id == pid,
-                        UserProblemStatus.user_id == user_id,
-                    )
-                    .first()
-                )
-                if existing_status:
-                    if not existing_status.is_completed:
-                        problem_ids_to_update.append(pid)
-                else:
-                    problem_status_new.append(
-                        UserProblemStatus(
-                            user_id=user_id,
-                            problem_id=pid,
-                            is_completed=True,
-                            checked_at=now,
-                        )
-                    )
-    if problem_status_new:
-        db.bulk_save_objects(problem_status_new)
-    if problem_ids_to_update:
-        db.execute(
-            update(UserProblemStatus)
-            .where(UserProblemStatus.problem_id.in_(problem_ids_to_update))
-            .where(UserProblemStatus.user_id == user_id)
-            .values(is_completed=True, checked_at=now)
-        )
+    synced = await record_solved(db, user_id, solved_ids, now)
     cp_profile.last_synced_at = now
-    db.commit()
+    await db.commit()
     return {
-        "message": f"Synced {len(problem_status_new) + len(problem_ids_to_update)} problems from Codeforces for ladder {ladder_id}",
+        "message": f"Synced {synced} problems from Codeforces for ladder {ladder_id}",
         "last_synced_at": now.isoformat(),
     }
 
 
+@router.get(
+    "/codeforces/sync/status",
+    summary="Background Codeforces sync lag and progress",
+)
+async def codeforces_sync_status(db: AsyncSession = Depends(get_async_db)):
+    # lag comes from the database; scheduler/cache/client counters are this worker's
+    return {
+        "lag": await lag_report(db),
+        "scheduler": cf_sync_scheduler.progress,
+        "solved_cache": solved_cache_stats,
+        "client": cf_client.stats,
+    }
+
+
 from datetime import datetime, timedelta
 from ...models.codeforces_ladder_model import PendingVerification
 
 
 @router.post("/profile", summary="Assign a pending verification problem to a user")
-def assign_pending_problem(
+async def assign_pending_problem(
     user_id: int = Form(...),
     codeforces_username: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # 1. Validate user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # 2. Remove old pending entry for this user
-    db.query(PendingVerification).filter(
-        PendingVerification.user_id == user_id
-    ).delete()
+    await db.execute(delete(PendingVerification).filter(PendingVerification.user_id == user_id))
 
-    # 3. Pick a random problem
-    problem = db.query(LadderProblem).order_by(func.random()).first()
-    if not problem:
+    # 3. Pick a random Codeforces problem from the cached key pool (no ORDER BY RAND() scan)
+    picked = await ladder_keys.random_problem(db)
+    if not picked:
         raise HTTPException(status_code=404, detail="No problems available")
 
-    # 4. Extract problem_id from URL (supports A, A1, AA, etc.)
-    match = re.search(r"/problem/(\d+)/([A-Z0-9]+)", problem.problem_url, re.IGNORECASE)
-    if not match:
-        raise HTTPException(status_code=400, detail="Invalid problem URL format")
-
-    contest_id, index = match.groups()
-    problem_id = f"{contest_id}{index.upper()}"
+    # 4. Judge key stored on the row (parsed from problem_url on write)
+    problem_id, ladder_problem_id = picked
+    problem = await db.get(LadderProblem, ladder_problem_id)
+    if not problem:  # deleted since the pool was built
+        ladder_keys.invalidate()
+        raise HTTPException(status_code=503, detail="Problem list changed, please retry")
 
     # 5. Create pending verification entry
     expiry_time = datetime.utcnow() + timedelta(minutes=30)
@@ -503,7 +456,7 @@ def assign_pending_problem(
         expiry_at=expiry_time,
     )
     db.add(pending)
-    db.commit()
+    await db.commit()
 
     # 6. Return response
     return {
@@ -519,19 +472,32 @@ def assign_pending_problem(
 
 
 from datetime import timezone
+from contextlib import aclosing
+
+# Verification only looks at submissions made since the problem was assigned:
+# at most CF_VERIFY_COUNT of the newest, allowing CF_VERIFY_SKEW seconds of
+# clock difference with Codeforces
+CF_VERIFY_COUNT = int(os.getenv("CF_VERIFY_COUNT", "100"))
+CF_VERIFY_SKEW = int(os.getenv("CF_VERIFY_SKEW", "60"))
+
+
+def _utc_epoch(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.astimezone(timezone.utc).timestamp())
 
 
 @router.get(
     "/verification-wrong/{user_id}",
     summary="Verify user handle and wrong answer submission for pending problem",
 )
-def verify_user_wrong_submission(user_id: int, db: Session = Depends(get_db)):
+async def verify_user_wrong_submission(user_id: int, db: AsyncSession = Depends(get_async_db)):
     # 1. Fetch pending verification
     pending = (
-        db.query(PendingVerification)
-        .filter(PendingVerification.user_id == user_id)
-        .first()
-    )
+        await db.execute(
+            select(PendingVerification).filter(PendingVerification.user_id == user_id)
+        )
+    ).scalars().first()
 
     if not pending:
         return {
@@ -540,84 +506,80 @@ def verify_user_wrong_submission(user_id: int, db: Session = Depends(get_db)):
 
     handle = pending.username.strip()
     problem_id = pending.problem_id.upper()
-    expiry_at = pending.expiry_at
 
-    # 2. Ensure expiry time is in UTC
-    if expiry_at.tzinfo is None:
-        expiry_at = expiry_at.replace(tzinfo=timezone.utc)
-    else:
-        expiry_at = expiry_at.astimezone(timezone.utc)
-
-    expire_epoch = int(expiry_at.timestamp())
+    # 2. Verification window, in UTC epoch seconds
+    expire_epoch = _utc_epoch(pending.expiry_at)
+    assigned_at = pending.created_at or pending.expiry_at - timedelta(minutes=30)
+    window_start = _utc_epoch(assigned_at) - CF_VERIFY_SKEW
 
     # 3. Check if handle exists on Codeforces
-    user_info_url = f"https://codeforces.com/api/user.info?handles={handle}"
-    user_info_data = requests.get(user_info_url).json()
+    try:
+        user_info = await cf_client.call("user.info", handles=handle)
+    except CodeforcesError:
+        user_info = None
 
-    if user_info_data.get("status") != "OK" or not user_info_data.get("result"):
+    if not user_info:
         return {"handle_exists": False, "wrong_submission": False}
 
-    # 4. Fetch submissions from Codeforces
-    submissions_url = f"https://codeforces.com/api/user.status?handle={handle}"
-    submissions_data = requests.get(submissions_url).json()
-
-    if submissions_data.get("status") != "OK":
+    # 4. Stream the newest submissions (newest first) and stop at the first
+    # one older than the window, so the full history is never downloaded or parsed
+    wrong_answer_found = False
+    fetched_id = None
+    try:
+        async with aclosing(
+            cf_client.stream("user.status", handle=handle, count=CF_VERIFY_COUNT)
+        ) as submissions:
+            async for sub in submissions:
+                sub_time = sub.get("creationTimeSeconds")  # UTC already
+                if sub_time and sub_time < window_start:
+                    break
+                prob = sub.get("problem")
+                if not prob:
+                    continue
+
+                # 5. Check for WRONG_ANSWER / COMPILATION_ERROR before expiry
+                sub_id = f"{prob.get('contestId', '')}{prob.get('index', '').upper()}"
+                if sub_id == problem_id:
+                    fetched_id = sub_id
+                    if (
+                        sub_time
+                        and sub_time <= expire_epoch
+                        and sub.get("verdict") in ["WRONG_ANSWER", "COMPILATION_ERROR"]
+                    ):
+                        wrong_answer_found = True
+                        break
+    except CodeforcesError as e:
         raise HTTPException(
             status_code=400,
-            detail=f"Codeforces API error: {submissions_data.get('comment')}",
+            detail=f"Codeforces API error: {e.comment}",
         )
 
-    # 5. Check for WRONG_ANSWER / COMPILATION_ERROR before expiry
-    wrong_answer_found = False
-    fetched_id = None
+    if wrong_answer_found:
+        profile = (
+            await db.execute(select(UserCPProfile).filter_by(user_id=user_id))
+        ).scalars().first()
 
-    for sub in submissions_data.get("result", []):
-        prob = sub.get("problem")
-        if not prob:
-            continue
-
-        sub_id = f"{prob.get('contestId', '')}{prob.get('index', '').upper()}"
-        if sub_id == problem_id:
-            fetched_id = sub_id
-            sub_time = sub.get("creationTimeSeconds")  # UTC already
-
-            # Debug print (optional)
-            # print(f"Submission time: {sub_time}, Expiry: {expire_epoch}, Verdict: {sub.get('verdict')}")
-
-            if (
-                sub_time
-                and sub_time <= expire_epoch
-                and sub.get("verdict") in ["WRONG_ANSWER", "COMPILATION_ERROR"]
-            ):
-                wrong_answer_found = True
-                profile = db.query(UserCPProfile).filter_by(user_id=user_id).first()
-
-                if profile:
-                    profile.codeforces_handle = handle
-                    profile.last_synced_at = datetime.utcnow()
-                else:
-                    profile = UserCPProfile(
-                        user_id=user_id,
-                        codeforces_handle=handle,
-                        last_synced_at=datetime.utcnow(),
-                    )
-                    db.add(profile)
-
-                if pending:
-                    db.delete(pending)
-
-                db.commit()
-                db.refresh(profile)
-
-                return{
-                    "status": True
-                }
-
-                break
+        if profile:
+            profile.codeforces_handle = handle
+            profile.last_synced_at = datetime.utcnow()
+        else:
+            profile = UserCPProfile(
+                user_id=user_id,
+                codeforces_handle=handle,
+                last_synced_at=datetime.utcnow(),
+            )
+            db.add(profile)
+
+        await db.delete(pending)
+        await db.commit()
+
+        return {
+            "status": True
+        }
 
     # 6. Return result
     return {
-        
+
         "fetched_id": fetched_id,
         "our_id": problem_id,
         "handle_exists": True,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Form, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, asc, desc
 from typing import Optional, List
@@ -8,6 +9,8 @@ from datetime import datetime
 from ...models.codeforces_ladder_model import *
 from ...models.user_model import User
 from ...connection.utility import get_db
+from ...schemas.problem_schema import CP51ProblemItem
+from ..search.search_index import search_index
 
 router = APIRouter(prefix="/cp51", tags=["CP51"])
 
@@ -84,6 +87,7 @@ def create_problem(
     db.add(item)
     db.commit()
     db.refresh(item)
+    search_index.put("cp51", item)
     return {
         "id": item.id,
         "title": item.title,
@@ -100,26 +104,10 @@ def create_problem(
     }
 
 
-@router.get("/problems")
+@router.get("/problems", response_model=List[CP51ProblemItem], response_class=ORJSONResponse)
 def list_problems(db: Session = Depends(get_db)):
-    items = db.query(CP51Problem).all()
-    return [
-        {
-            "id": i.id,
-            "title": i.title,
-            "problem_link": i.problem_link,
-            "difficulty": i.difficulty,
-            "rating": i.rating,
-            # "description": i.description,
-            "github_solution_link": i.github_solution_link,
-            "hindi_solution_link": i.hindi_solution_link,
-            "english_solution_link": i.english_solution_link,
-            "created_by": i.created_by,
-            "is_premium": i.is_premium,
-            "created_at": i.created_at,
-        }
-        for i in items
-    ]
+    # description is left out of the listing; CP51ProblemItem picks the columns
+    return db.query(CP51Problem).all()
 
 
 # GET by id
@@ -174,6 +162,7 @@ def update_problem_full(
 
     db.commit()
     db.refresh(item)
+    search_index.put("cp51", item)
     return {
         "id": item.id,
         "title": item.title,
@@ -229,6 +218,7 @@ def update_problem_partial(
 
     db.commit()
     db.refresh(item)
+    search_index.put("cp51", item)
     return {
         "id": item.id,
         "title": item.title,
@@ -252,4 +242,5 @@ def delete_problem(problem_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Problem not found")
     db.delete(item)
     db.commit()
+    search_index.remove("cp51", problem_id)
     return None
@@ -0,0 +1,194 @@
+import os
+import random
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update, or_, not_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.codeforces_ladder_model import LadderProblem, UserProblemStatus
+from ...utils.cache import TTLCache
+from ...utils.judges import CODEFORCES, problem_key
+from ...utils.upsert import upsert_statements, insert_ignore, UPSERT_CHUNK_SIZE
+from .leaderboard import add_solved
+
+# Ladder problems only change when ladders are reseeded, so each worker keeps
+# the key map in memory and reloads it after LADDER_KEYS_TTL seconds
+LADDER_KEYS_TTL = int(os.getenv("LADDER_KEYS_TTL", "300"))
+
+
+class LadderKeyIndex:
+    """Reverse map from Codeforces problem key ("1850A") to ladder problems, across all ladders."""
+
+    def __init__(self, ttl: float):
+        self.cache = TTLCache(ttl)
+
+    async def load(self, db: AsyncSession) -> dict:
+        """key -> [(ladder_problem_id, ladder_id)], built from the stored judge keys."""
+        keys = self.cache.get("keys")
+        if keys is None:
+            keys = {}
+            rows = await db.execute(
+                select(LadderProblem.id, LadderProblem.ladder_id, LadderProblem.contest_id, LadderProblem.problem_index)
+                .filter(LadderProblem.judge == CODEFORCES)
+            )
+            for pid, ladder_id, contest_id, index in rows:
+                keys.setdefault(problem_key(contest_id, index), []).append((pid, ladder_id))
+            self.cache.set("keys", keys)
+            self.cache.invalidate("pool")
+        return keys
+
+    async def solved_ids(self, db: AsyncSession, solved_set: set, ladder_id: Optional[int] = None) -> list:
+        """Ladder problem ids whose key is in solved_set: one set intersection, no URL parsing."""
+        keys = await self.load(db)
+        return sorted(
+            pid
+            for key in solved_set & keys.keys()
+            for pid, lid in keys[key]
+            if ladder_id is None or lid == ladder_id
+        )
+
+    async def random_problem(self, db: AsyncSession) -> Optional[tuple]:
+        """(key, ladder_problem_id) of a uniformly random Codeforces problem, or None when there are none."""
+        keys = await self.load(db)
+        pool = self.cache.get("pool")  # random.choice needs a sequence; rebuilt whenever keys reload
+        if pool is None:
+            pool = list(keys)
+            self.cache.set("pool", pool)
+        if not pool:
+            return None
+        key = random.choice(pool)
+        return key, keys[key][0][0]
+
+    def invalidate(self):
+        self.cache.invalidate()
+
+
+ladder_keys = LadderKeyIndex(LADDER_KEYS_TTL)
+
+
+STATUS_FLAGS = ("is_completed", "is_revisit")
+
+
+def status_upserts(bind, user_id: int, changes: Iterable[dict], now: datetime):
+    """
+    Upsert statements for {problem_id, is_completed?, is_revisit?} changes.
+
+    Flags left out of a change (or None) keep their stored value on existing
+    rows and default to False on new ones; changes that set the same flags
+    share a statement.
+    """
+    groups: dict = {}
+    for change in changes:
+        flags = tuple(f for f in STATUS_FLAGS if change.get(f) is not None)
+        groups.setdefault(flags, []).append({
+            "user_id": user_id,
+            "problem_id": change["problem_id"],
+            "is_completed": bool(change.get("is_completed")),
+            "is_revisit": bool(change.get("is_revisit")),
+            "checked_at": now,
+        })
+    for flags, rows in groups.items():
+        yield from upsert_statements(
+            bind, UserProblemStatus.__table__, rows, ["user_id", "problem_id"],
+            lambda new, flags=flags: {**{f: new[f] for f in flags}, "checked_at": new.checked_at},
+        )
+
+
+async def completion_deltas(db: AsyncSession, user_id: int, changes: list, now: datetime) -> dict:
+    """
+    Apply the is_completed part of `changes`; returns {ladder_id: change in
+    solved}. Rows are created unsolved first, then flipped by UPDATEs
+    conditioned on the current flag, so each rowcount is exactly how many
+    problems changed state, however many writes for the user race.
+    """
+    targets = {change["problem_id"]: change["is_completed"] for change in changes if change.get("is_completed") is not None}
+    if not targets:
+        return {}
+    ladder_of = dict((await db.execute(
+        select(LadderProblem.id, LadderProblem.ladder_id).filter(LadderProblem.id.in_(targets))
+    )).all())
+
+    solving = [pid for pid, done in targets.items() if done]
+    for start in range(0, len(solving), UPSERT_CHUNK_SIZE):
+        await db.execute(insert_ignore(db.get_bind(), UserProblemStatus.__table__, [
+            {"user_id": user_id, "problem_id": pid, "is_completed": False, "is_revisit": False, "checked_at": now}
+            for pid in solving[start:start + UPSERT_CHUNK_SIZE]
+        ]))
+
+    groups: dict = {}
+    for pid, done in targets.items():
+        if pid in ladder_of:
+            groups.setdefault((ladder_of[pid], done), []).append(pid)
+    deltas: dict = {}
+    for (ladder_id, done), problem_ids in sorted(groups.items()):
+        was = UserProblemStatus.is_completed == True
+        if done:
+            was = or_(UserProblemStatus.is_completed == False, UserProblemStatus.is_completed.is_(None))
+        changed = (await db.execute(
+            update(UserProblemStatus)
+            .where(UserProblemStatus.user_id == user_id, UserProblemStatus.problem_id.in_(problem_ids), was)
+            .values(is_completed=done, checked_at=now)
+            .execution_options(synchronize_session=False)
+        )).rowcount
+        deltas[ladder_id] = deltas.get(ladder_id, 0) + (changed if done else -changed)
+    return deltas
+
+
+async def write_statuses(db: AsyncSession, user_id: int, changes: list, now: datetime):
+    """
+    Upsert status changes and move the user's leaderboard counters with them;
+    caller commits. Every status write goes through here or toggle_revisit,
+    which both bump the progress version.
+    """
+    if not changes:
+        return
+    deltas = await completion_deltas(db, user_id, changes, now)
+    for stmt in status_upserts(db.get_bind(), user_id, changes, now):
+        await db.execute(stmt)
+    await add_solved(db, user_id, deltas, now)
+
+
+async def toggle_revisit(db: AsyncSession, user_id: int, problem_id: int, now: datetime) -> bool:
+    """Flip is_revisit (a new row starts flagged) and return the new value; caller commits."""
+    table = UserProblemStatus.__table__
+    row = {"user_id": user_id, "problem_id": problem_id, "is_completed": False, "is_revisit": True, "checked_at": now}
+    # One statement, so concurrent clicks can't create a second row
+    for stmt in upsert_statements(
+        db.get_bind(), table, [row], ["user_id", "problem_id"],
+        lambda new: {"is_revisit": not_(func.coalesce(table.c.is_revisit, False)), "checked_at": new.checked_at},
+    ):
+        await db.execute(stmt)
+    # The row stays locked by our write until commit, so this reads our own toggle
+    is_revisit = (
+        await db.execute(
+            select(UserProblemStatus.is_revisit)
+            .filter(UserProblemStatus.user_id == user_id, UserProblemStatus.problem_id == problem_id)
+        )
+    ).scalar()
+    await add_solved(db, user_id, {}, now)
+    return bool(is_revisit)
+
+
+async def record_solved(db: AsyncSession, user_id: int, problem_ids: Iterable[int], now: datetime) -> int:
+    """Mark problems completed for a user; returns how many changed. Caller commits."""
+    problem_ids = list(problem_ids)
+    if not problem_ids:
+        return 0
+
+    # Already-completed rows are left alone (their checked_at stays put)
+    completed = set(
+        (
+            await db.execute(
+                select(UserProblemStatus.problem_id)
+                .filter(
+                    UserProblemStatus.user_id == user_id,
+                    UserProblemStatus.problem_id.in_(problem_ids),
+                    UserProblemStatus.is_completed == True,
+                )
+            )
+        ).scalars()
+    )
+    changes = [{"problem_id": pid, "is_completed": True} for pid in problem_ids if pid not in completed]
+    await write_statuses(db, user_id, changes, now)
+    return len(changes)
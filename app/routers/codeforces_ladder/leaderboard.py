@@ -0,0 +1,192 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, func, delete, insert, literal, case, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.codeforces_ladder_model import LadderProblem, UserProblemStatus, LeaderboardCounter
+from ...models.user_model import User
+from ...utils.upsert import upsert_statements
+
+GLOBAL_BOARD = 0  # ladder_id of the all-ladders board
+
+# Minimum progress % for each title, highest first
+TITLES = (
+    (40, "🏆 Conqueror"),
+    (30, "🎯 Ace"),
+    (20, "👑 Crown"),
+    (10, "💎 Diamond"),
+    (8, "🔘 Platinum"),
+    (5, "🥇 Gold"),
+    (0, "🥈 Silver"),
+)
+
+
+def title_for(progress_pct: float) -> str:
+    return next(title for floor, title in TITLES if progress_pct >= floor)
+
+
+def solved_counts(user_id: Optional[int] = None):
+    """(user_id, ladder_id, solved) from user_problem_status, for one user or everyone."""
+    query = (
+        select(UserProblemStatus.user_id, LadderProblem.ladder_id, func.count().label("solved"))
+        .join(LadderProblem, UserProblemStatus.problem_id == LadderProblem.id)
+        .filter(UserProblemStatus.is_completed == True)
+        .group_by(UserProblemStatus.user_id, LadderProblem.ladder_id)
+    )
+    if user_id is not None:
+        query = query.filter(UserProblemStatus.user_id == user_id)
+    return query
+
+
+# ─── Maintenance ─────────────────────────────────────────────────
+async def add_solved(db: AsyncSession, user_id: int, deltas: dict, now: datetime):
+    """
+    Move one user's counters by {ladder_id: change in solved} (the overall
+    board follows), as relative upserts; caller commits. Called once per
+    status write, so the overall row's version is bumped even when nothing
+    was solved or unsolved.
+    """
+    deltas = {ladder_id: delta for ladder_id, delta in deltas.items() if delta}
+    rows = [{"user_id": user_id, "ladder_id": GLOBAL_BOARD, "solved": sum(deltas.values()), "version": 1, "updated_at": now}]
+    rows += [
+        {"user_id": user_id, "ladder_id": ladder_id, "solved": delta, "version": 0, "updated_at": now}
+        for ladder_id, delta in sorted(deltas.items())
+    ]
+    table = LeaderboardCounter.__table__
+    for stmt in upsert_statements(
+        db.get_bind(), table, rows, ["user_id", "ladder_id"],
+        lambda new: {
+            "solved": table.c.solved + new.solved,
+            "version": table.c.version + new.version,
+            "updated_at": new.updated_at,
+        },
+    ):
+        await db.execute(stmt)
+
+
+async def progress_version(db: AsyncSession, user_id: int) -> int:
+    """How many status writes the user has made (0 before the first)."""
+    return (
+        await db.execute(
+            select(LeaderboardCounter.version)
+            .filter(LeaderboardCounter.ladder_id == GLOBAL_BOARD, LeaderboardCounter.user_id == user_id)
+        )
+    ).scalar() or 0
+
+
+def rebuild_counters(conn):
+    """
+    Rebuild every counter from user_problem_status (migration / repair).
+
+    Overall rows keep their version, moved one past its old value, so a
+    progress ETag issued before the rebuild doesn't match after it.
+    """
+    table = LeaderboardCounter.__table__
+    versions = conn.execute(select(table.c.user_id, table.c.version).where(table.c.ladder_id == GLOBAL_BOARD)).all()
+    per_ladder = solved_counts().subquery()
+    now = datetime.utcnow()
+    conn.execute(delete(table))
+    conn.execute(insert(table).from_select(
+        ["user_id", "ladder_id", "solved", "updated_at"],
+        select(per_ladder.c.user_id, per_ladder.c.ladder_id, per_ladder.c.solved, literal(now)),
+    ))
+    conn.execute(insert(table).from_select(
+        ["user_id", "ladder_id", "solved", "updated_at"],
+        select(per_ladder.c.user_id, literal(GLOBAL_BOARD), func.sum(per_ladder.c.solved), literal(now))
+        .group_by(per_ladder.c.user_id),
+    ))
+    rows = [
+        {"user_id": user_id, "ladder_id": GLOBAL_BOARD, "solved": 0, "version": version + 1, "updated_at": now}
+        for user_id, version in versions
+    ]
+    for stmt in upsert_statements(conn, table, rows, ["user_id", "ladder_id"], lambda new: {"version": new.version}):
+        conn.execute(stmt)
+
+
+# ─── Reads ───────────────────────────────────────────────────────
+async def total_problems(db: AsyncSession, ladder_id: int) -> int:
+    query = select(func.count(LadderProblem.id))
+    if ladder_id != GLOBAL_BOARD:
+        query = query.filter(LadderProblem.ladder_id == ladder_id)
+    return (await db.execute(query)).scalar() or 0
+
+
+async def board_summary(db: AsyncSession, ladder_id: int) -> dict:
+    total_users = (await db.execute(select(func.count(User.id)))).scalar() or 0
+    solved_sum = (
+        await db.execute(
+            select(func.sum(LeaderboardCounter.solved)).filter(LeaderboardCounter.ladder_id == ladder_id)
+        )
+    ).scalar() or 0
+    return {
+        "total_users": total_users,
+        "average_solved": round(solved_sum / total_users) if total_users else 0,
+    }
+
+
+async def board_page(db: AsyncSession, ladder_id: int, limit: int, offset: int = 0, after: Optional[dict] = None):
+    """
+    One page of the board, best first: (entries, next_cursor_values).
+
+    Ties share a rank ("1, 2, 2, 4"); ranks come from a range count on the
+    (ladder_id, solved, user_id) index, not from reading the rows above.
+    """
+    board = LeaderboardCounter
+    query = (
+        select(board.user_id, board.solved, User.username)
+        .join(User, User.id == board.user_id)
+        .filter(board.ladder_id == ladder_id, board.solved > 0)
+        .order_by(board.solved.desc(), board.user_id.desc())
+    )
+    if after:
+        query = query.filter(or_(
+            board.solved < after["solved"],
+            and_(board.solved == after["solved"], board.user_id < after["user_id"]),
+        ))
+    else:
+        query = query.offset(offset)
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    more, rows = len(rows) > limit, rows[:limit]
+    if not rows:
+        return [], None
+
+    top = rows[0].solved
+    above, at_or_above = (
+        await db.execute(
+            select(
+                func.sum(case((board.solved > top, 1), else_=0)),
+                func.count(),
+            ).filter(board.ladder_id == ladder_id, board.solved >= top)
+        )
+    ).one()
+    above, at_or_above = above or 0, at_or_above or 0
+
+    # Rows between `top` and a lower count all sit earlier on this page
+    page_top = sum(1 for r in rows if r.solved == top)
+    entries, rank = [], above + 1
+    for i, (user_id, solved, username) in enumerate(rows):
+        if solved != top and solved != rows[i - 1].solved:
+            rank = at_or_above + (i - page_top) + 1
+        entries.append({"user_id": user_id, "user": username, "problems_solved": solved, "rank": rank})
+
+    last = rows[-1]
+    return entries, ({"solved": last.solved, "user_id": last.user_id} if more else None)
+
+
+async def rank_of(db: AsyncSession, ladder_id: int, user_id: int):
+    """(rank, solved) for one user, or None when they have nothing solved on the board.
+
+    A primary-key lookup plus COUNT(*) WHERE solved > mine on the board index,
+    so the cost doesn't depend on reading everyone ranked above.
+    """
+    board = LeaderboardCounter
+    solved = (
+        await db.execute(select(board.solved).filter(board.ladder_id == ladder_id, board.user_id == user_id))
+    ).scalar()
+    if not solved:
+        return None
+    above = (
+        await db.execute(select(func.count()).filter(board.ladder_id == ladder_id, board.solved > solved))
+    ).scalar()
+    return above + 1, solved
@@ -0,0 +1,146 @@
+import asyncio
+import os
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...connection.database import AsyncSessionLocal
+from ...models.codeforces_ladder_model import CodeforcesSolvedCache
+from .cf_client import cf_client
+
+# Cached solved sets younger than this are served without touching Codeforces;
+# older ones are served as-is while a refresh runs in the background.
+CF_SOLVED_TTL = int(os.getenv("CF_SOLVED_TTL", "300"))
+
+# Incremental refreshes page through user.status newest-first, starting with
+# this many submissions and doubling until they reach already-seen ones.
+CF_STATUS_PAGE = int(os.getenv("CF_STATUS_PAGE", "50"))
+CF_STATUS_MAX_PAGE = int(os.getenv("CF_STATUS_MAX_PAGE", "1000"))
+
+_refreshing: dict = {}
+stats = {"hits": 0, "stale": 0, "misses": 0, "refreshes": 0, "submissions_fetched": 0, "failures": 0, "last_error": None}
+
+
+def solved_key(problem: dict) -> str:
+    return f"{problem.get('contestId', '')}{problem.get('index', '')}"
+
+
+def _is_fresh(row: CodeforcesSolvedCache) -> bool:
+    return row.fetched_at is not None and datetime.utcnow() - row.fetched_at < timedelta(seconds=CF_SOLVED_TTL)
+
+
+async def _fetch_new(handle: str, known_id: Optional[int]):
+    """Return (solved_keys, newest_id, fetched) for submissions newer than known_id.
+
+    Submissions are streamed, so only the solved set is kept, never the history.
+    """
+    solved, newest, fetched = set(), known_id, 0
+    if known_id is None:
+        # First sight of the handle: one full call beats many paged ones under the rate limit
+        async with aclosing(cf_client.stream("user.status", handle=handle)) as submissions:
+            async for sub in submissions:
+                fetched += 1
+                newest = sub["id"] if newest is None else max(newest, sub["id"])
+                if sub.get("verdict") == "OK":
+                    solved.add(solved_key(sub["problem"]))
+        return solved, newest, fetched
+
+    start, count = 1, CF_STATUS_PAGE
+    while True:
+        seen = 0
+        async with aclosing(
+            cf_client.stream("user.status", handle=handle, **{"from": start, "count": count})
+        ) as page:
+            async for sub in page:
+                seen += 1
+                if sub["id"] <= known_id:
+                    return solved, newest, fetched + seen
+                newest = max(newest, sub["id"])
+                if sub.get("verdict") == "OK":
+                    solved.add(solved_key(sub["problem"]))
+        fetched += seen
+        if seen < count:
+            return solved, newest, fetched
+        # New submissions shift offsets while paging; re-reading a few is harmless
+        start += count
+        count = min(count * 2, CF_STATUS_MAX_PAGE)
+
+
+async def _refresh(handle: str) -> set:
+    key = handle.lower()
+    # No session is held across the Codeforces calls below: they can take
+    # seconds under the rate limit, and the async pool is small
+    async with AsyncSessionLocal() as db:
+        row = await db.get(CodeforcesSolvedCache, key)
+        known_id = row.last_submission_id if row else None
+
+    solved, newest, fetched = await _fetch_new(handle, known_id)
+    stats["refreshes"] += 1
+    stats["submissions_fetched"] += fetched
+
+    async with AsyncSessionLocal() as db:
+        # Re-read: another worker may have refreshed this handle meanwhile
+        row = await db.get(CodeforcesSolvedCache, key)
+        if row is None:
+            row = CodeforcesSolvedCache(handle=key, solved="")
+            db.add(row)
+        merged = set(row.solved.split()) | solved
+        row.solved = " ".join(sorted(merged))
+        if newest is not None and (row.last_submission_id is None or newest > row.last_submission_id):
+            row.last_submission_id = newest
+        row.fetched_at = datetime.utcnow()
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker cached this handle first; its copy is as good as ours
+            await db.rollback()
+        return merged
+
+
+def _finished(key: str, task: asyncio.Task):
+    if _refreshing.get(key) is task:
+        del _refreshing[key]
+    if not task.cancelled() and task.exception() is not None:
+        stats["failures"] += 1
+        stats["last_error"] = f"{key}: {task.exception()}"
+
+
+def _start_refresh(handle: str) -> asyncio.Task:
+    key = handle.lower()
+    task = _refreshing.get(key)
+    if task is None or task.done():
+        task = asyncio.ensure_future(_refresh(handle))
+        _refreshing[key] = task
+        task.add_done_callback(lambda t: _finished(key, t))
+    return task
+
+
+async def refresh_solved(handle: str) -> set:
+    """Fold new submissions into the handle's cached solved set and return it.
+
+    Concurrent refreshes of one handle share a task. Raises CodeforcesError.
+    """
+    # shield: a disconnecting caller must not cancel a refresh others wait on
+    return await asyncio.shield(_start_refresh(handle))
+
+
+async def cached_solved(db: AsyncSession, handle: str) -> Optional[set]:
+    """Stale-while-revalidate read; never waits on Codeforces.
+
+    Returns the cached solved set (scheduling a background refresh when it is
+    older than CF_SOLVED_TTL), or None when the handle was never fetched.
+    """
+    row = await db.get(CodeforcesSolvedCache, handle.lower())
+    if row is None:
+        stats["misses"] += 1
+        _start_refresh(handle)
+        return None
+    if _is_fresh(row):
+        stats["hits"] += 1
+    else:
+        stats["stale"] += 1
+        _start_refresh(handle)
+    return set(row.solved.split())
@@ -4,6 +4,8 @@ from ...models.course_model import Courses
 from ...connection.utility import get_db
 from ...models.registration_model import CourseRegistration
 from fastapi import status
+from fastapi.responses import ORJSONResponse
+from ...schemas.course_schema import CoursesByUserResponse
 
 router = APIRouter()
 
@@ -122,7 +124,12 @@ def get_course_verification_status(course_id: int, db: Session = Depends(get_db)
 
 
 
-@router.get("/courses/by-user/{user_id}")
+@router.get(
+    "/courses/by-user/{user_id}",
+    response_model=CoursesByUserResponse,
+    response_model_exclude_unset=True,
+    response_class=ORJSONResponse,
+)
 def get_courses_by_user(user_id: int, db: Session = Depends(get_db)):
     try:
         creator_courses = db.query(Courses).filter(Courses.creatorid == user_id).all()
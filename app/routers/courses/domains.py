@@ -4,10 +4,10 @@ from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from dotenv import load_dotenv
 from pathlib import Path
 
 from ...connection.utility import get_db
+from ...utils.etag import catalog_etag, bump_catalog
 from ...schemas.course_schema import *
 from ...models.course_model import *
 from ...models.user_model import *
@@ -35,6 +35,7 @@ def create_domain_tag(payload: dict, db: Session = Depends(get_db)):
 
     new_tag = DomainTag(name=name, createdBy=created_by)
     db.add(new_tag)
+    bump_catalog(db, "domain_tags")
     db.commit()
     db.refresh(new_tag)
 
@@ -58,6 +59,7 @@ def update_domain_tag(tag_id: int, payload: dict, db: Session = Depends(get_db))
         raise HTTPException(status_code=400, detail="'name' is required to update")
 
     tag.name = new_name
+    bump_catalog(db, "domain_tags")
     db.commit()
     db.refresh(tag)
 
@@ -81,6 +83,7 @@ def verify_domain_tag(tag_id: int, payload: dict, db: Session = Depends(get_db))
         return {"success": True, "message": "Domain tag already verified", "tag_id": tag.id}
 
     tag.isVerified = True
+    bump_catalog(db, "domain_tags")
     db.commit()
     db.refresh(tag)
 
@@ -92,7 +95,7 @@ def verify_domain_tag(tag_id: int, payload: dict, db: Session = Depends(get_db))
 
 
 
-@router.get("/domain-tags/verified")
+@router.get("/domain-tags/verified", dependencies=[Depends(catalog_etag("domain_tags"))])
 def get_verified_domain_tags(db: Session = Depends(get_db)):
     tags = db.query(DomainTag).filter(DomainTag.isVerified == True).order_by(DomainTag.name).all()
 
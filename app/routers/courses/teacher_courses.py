@@ -4,25 +4,19 @@ from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from dotenv import load_dotenv
 from pathlib import Path
 
 from ...connection.utility import get_db
+from ...utils.uploads import UPLOAD_DIR  # created by the app lifespan
 from ...schemas.course_schema import *
 from ...models.course_model import *
 from ...models.user_model import *
+from ..search.search_index import search_index
 
 import json
-# --- Load environment variables and define paths ---
-load_dotenv()
-
-BASE_DIR = Path(__file__).resolve().parent.parent.parent  # adjust depth as needed
-UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", BASE_DIR / "app" / "uploads"))
+# --- Define paths (.env is loaded by app.connection.database) ---
 DOWN_DIR = os.getenv("DOWN_DIR", "http://localhost:8000")  # fallback base URL
 
-# Ensure uploads directory exists
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 router = APIRouter()
 
 # --- Create Course Endpoint ---
@@ -95,6 +89,7 @@ def create_course(
 
         db.commit()
         db.refresh(course)
+        search_index.put("courses", course)
 
         return {
             "success": True,
@@ -176,6 +171,7 @@ def update_course(
 
     db.commit()
     db.refresh(course)
+    search_index.put("courses", course)
 
     return {
         "success": True,
@@ -195,6 +191,7 @@ def unpublish_course(user_id: int, course_id: int, db: Session = Depends(get_db)
 
     course.is_published = False
     db.commit()
+    search_index.remove("courses", course.id)
     return {"success": True, "message": "Course unpublished successfully", "course_id": course.id}
 
 
@@ -208,6 +205,7 @@ def publish_course(user_id: int, course_id: int, db: Session = Depends(get_db)):
 
     course.is_published = True
     db.commit()
+    search_index.put("courses", course)
     return {"success": True, "message": "Course published successfully", "course_id": course.id}
 
 
@@ -0,0 +1,276 @@
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional
+
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+
+from ...models.problem_model import (
+    CodingProblem, Tag, Company, Sheet,
+    ProblemTag, ProblemCompany, SheetProblem
+)
+
+DIFFICULTIES = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+# Name lists in CSV cells, e.g. "Array; Two Pointers"
+LIST_SEPARATORS = (";", "|")
+
+
+# ─── Streaming Parsers ───────────────────────────────────────────
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_jsonl(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield (row_number, record_or_error) for a JSONL body."""
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield row, f"Invalid JSON: {exc}"
+            continue
+        yield row, record if isinstance(record, dict) else "Each line must be a JSON object"
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """
+    Yield (row_number, record_or_error) for a CSV body with a header row.
+
+    Quoted cells may span lines, so physical lines are joined until the
+    record's quotes balance before handing it to the csv module.
+    """
+    header, record, row = None, "", 0
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        row += 1
+        yield row, dict(zip(header, values))
+    if record:
+        row += 1
+        yield row, "Unterminated quoted field"
+
+
+# ─── Row Validation ──────────────────────────────────────────────
+def _names(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        for sep in LIST_SEPARATORS:
+            value = value.replace(sep, ",")
+        value = value.split(",")
+    return list(dict.fromkeys(str(v).strip() for v in value if str(v).strip()))
+
+
+def _optional(value) -> Optional[str]:
+    value = str(value).strip() if value is not None else ""
+    return value or None
+
+
+def normalize_row(record: dict):
+    """Return (problem_fields, tag_names, company_names, sheet_titles) or raise ValueError."""
+    title = _optional(record.get("title"))
+    link = _optional(record.get("link"))
+    if not title or not link:
+        raise ValueError("title and link are required")
+
+    difficulty = DIFFICULTIES.get(str(record.get("difficulty") or "").strip().lower())
+    if not difficulty:
+        raise ValueError("difficulty must be Easy, Medium or Hard")
+
+    is_premium = record.get("is_premium")
+    if not isinstance(is_premium, bool):
+        is_premium = str(is_premium or "").strip().lower() in TRUE_VALUES
+
+    fields = {
+        "title": title,
+        "link": link,
+        "difficulty": difficulty,
+        "gitHubLink": _optional(record.get("gitHubLink")),
+        "hindiSolution": _optional(record.get("hindiSolution")),
+        "englishSolution": _optional(record.get("englishSolution")),
+        "is_premium": is_premium,
+    }
+    return fields, _names(record.get("tags")), _names(record.get("companies")), _names(record.get("sheets"))
+
+
+# ─── Ingestion ───────────────────────────────────────────────────
+class BulkImporter:
+    """
+    Imports problems in chunks: one transaction per chunk, set-based lookups
+    for names and duplicates, and executemany inserts for problems and their
+    association rows. Name -> id maps are kept across chunks, and `touched`
+    names the catalogs that committed chunks changed.
+    """
+
+    def __init__(self, db: Session, created_by: int = 1, create_missing: bool = False):
+        self.db = db
+        self.created_by = created_by
+        self.create_missing = create_missing
+        self.tag_ids: dict = {}
+        self.company_ids: dict = {}
+        self.sheet_ids: dict = {}
+        self.seen_links: set = set()
+        self.seen_titles: set = set()
+        self.touched: set = set()
+        self._chunk_touched: set = set()
+
+    # Names missing from the DB (or soft-deleted) are created/reactivated when
+    # create_missing is set; otherwise rows that use them are rejected.
+    def _resolve(self, model, column, known: dict, names: Iterable[str], owner_field: str, catalog: str):
+        wanted = {n for n in names if n not in known}
+        if not wanted:
+            return
+        now = datetime.utcnow()
+        query = self.db.query(model).filter(column.in_(wanted))
+        if model is Sheet:
+            query = query.filter(Sheet.deleted == False).order_by(Sheet.id.desc())
+        for obj in query:
+            name = getattr(obj, column.key)
+            if not obj.deleted:
+                known[name] = obj.id
+            elif self.create_missing:
+                obj.deleted = False
+                if hasattr(obj, "updated_at"):
+                    obj.updated_at = now
+                known[name] = obj.id
+                self._chunk_touched.add(catalog)
+        if self.create_missing:
+            missing = [n for n in wanted if n not in known]
+            if missing:
+                self.db.execute(insert(model), [
+                    {column.key: n, owner_field: self.created_by, "created_at": now} for n in missing
+                ])
+                self._chunk_touched.add(catalog)
+                query = self.db.query(model.id, column).filter(column.in_(missing))
+                if model is Sheet:
+                    query = query.filter(Sheet.deleted == False)
+                for obj_id, name in query:
+                    known[name] = obj_id
+
+    def import_chunk(self, rows: list) -> list:
+        """rows: [(row_number, record_or_error)] -> per-row report entries."""
+        report, parsed = [], []
+        for row, record in rows:
+            if isinstance(record, str):
+                report.append({"row": row, "status": "error", "detail": record})
+                continue
+            try:
+                parsed.append((row, *normalize_row(record)))
+            except ValueError as exc:
+                report.append({"row": row, "status": "error", "detail": str(exc)})
+
+        if not parsed:
+            return report
+
+        self._chunk_touched.clear()
+        try:
+            report.extend(self._import_parsed(parsed))
+            self.db.commit()
+            self.touched |= self._chunk_touched
+        except Exception as exc:
+            self.db.rollback()
+            # Names created in this chunk are gone again, and its rows may be retried
+            self.tag_ids.clear()
+            self.company_ids.clear()
+            self.sheet_ids.clear()
+            self.seen_links.difference_update(fields["link"] for _, fields, *_ in parsed)
+            self.seen_titles.difference_update(fields["title"] for _, fields, *_ in parsed)
+            report = [r for r in report if r["status"] == "error"] + [
+                {"row": row, "status": "error", "detail": f"Chunk rolled back: {exc.__class__.__name__}"}
+                for row, *_ in parsed
+            ]
+        return sorted(report, key=lambda r: r["row"])
+
+    def _import_parsed(self, parsed: list) -> list:
+        db, report = self.db, []
+
+        # Existing problems with the same link (any state) or title (live)
+        links = {fields["link"] for _, fields, *_ in parsed}
+        titles = {fields["title"] for _, fields, *_ in parsed}
+        existing_links, existing_titles = set(), set()
+        for link, title, deleted in db.query(CodingProblem.link, CodingProblem.title, CodingProblem.deleted).filter(
+            or_(CodingProblem.link.in_(links), CodingProblem.title.in_(titles))
+        ):
+            existing_links.add(link)
+            if not deleted:
+                existing_titles.add(title)
+
+        self._resolve(Tag, Tag.name, self.tag_ids, {n for *_, tags, _, _ in parsed for n in tags}, "added_by", "tags")
+        self._resolve(Company, Company.name, self.company_ids, {n for *_, cs, _ in parsed for n in cs}, "added_by", "companies")
+        self._resolve(Sheet, Sheet.title, self.sheet_ids, {n for *_, ss in parsed for n in ss}, "created_by", "sheets")
+
+        accepted = []
+        for row, fields, tags, companies, sheets in parsed:
+            link, title = fields["link"], fields["title"]
+            if link in existing_links or link in self.seen_links:
+                report.append({"row": row, "status": "skipped", "detail": f"Duplicate link: {link}"})
+                continue
+            if title in existing_titles or title in self.seen_titles:
+                report.append({"row": row, "status": "skipped", "detail": f"Duplicate title: {title}"})
+                continue
+            unknown = (
+                [f"tag '{n}'" for n in tags if n not in self.tag_ids]
+                + [f"company '{n}'" for n in companies if n not in self.company_ids]
+                + [f"sheet '{n}'" for n in sheets if n not in self.sheet_ids]
+            )
+            if unknown:
+                report.append({"row": row, "status": "error", "detail": "Unknown " + ", ".join(unknown)})
+                continue
+            self.seen_links.add(link)
+            self.seen_titles.add(title)
+            accepted.append((row, fields, tags, companies, sheets))
+
+        if not accepted:
+            return report
+
+        now = datetime.utcnow()
+        self._chunk_touched.add("problems")
+        db.execute(insert(CodingProblem), [
+            {**fields, "created_at": now, "created_by": self.created_by} for _, fields, *_ in accepted
+        ])
+        # MySQL has no RETURNING for executemany; link is unique, so re-select by it
+        ids = dict(db.query(CodingProblem.link, CodingProblem.id).filter(
+            CodingProblem.link.in_([fields["link"] for _, fields, *_ in accepted])
+        ))
+
+        problem_tags, problem_companies, sheet_problems = [], [], []
+        for row, fields, tags, companies, sheets in accepted:
+            pid = ids[fields["link"]]
+            tag_ids = [self.tag_ids[n] for n in tags]
+            company_ids = [self.company_ids[n] for n in companies]
+            sheet_ids = list(dict.fromkeys(self.sheet_ids[n] for n in sheets))
+            owner = {"problem_id": pid, "created_by": self.created_by, "created_at": now}
+            problem_tags += [{**owner, "tag_id": tid} for tid in tag_ids]
+            problem_companies += [{**owner, "company_id": cid} for cid in company_ids]
+            sheet_problems += [{**owner, "sheet_id": sid} for sid in sheet_ids]
+            report.append({"row": row, "status": "created", "problem_id": pid})
+
+        for model, values in ((ProblemTag, problem_tags), (ProblemCompany, problem_companies), (SheetProblem, sheet_problems)):
+            if values:
+                db.execute(insert(model), values)
+        return report
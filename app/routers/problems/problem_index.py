@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from ...models.problem_model import (
+    CodingProblem, Tag, Company, Sheet,
+    ProblemTag, ProblemCompany, SheetProblem
+)
+
+# Full rebuild interval (seconds). Writes in this process update the index
+# immediately; the rebuild picks up writes made by other worker processes.
+PROBLEM_INDEX_TTL = int(os.getenv("PROBLEM_INDEX_TTL", "60"))
+
+
+def to_bitmap(ids: Iterable[int]) -> int:
+    bitmap = 0
+    for pid in ids:
+        bitmap |= 1 << pid
+    return bitmap
+
+
+def iter_ids(bitmap: int) -> Iterator[int]:
+    """Yield the set bits of `bitmap` (problem ids) in ascending order."""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+def _union(groups: dict, keys: Iterable) -> int:
+    bitmap = 0
+    for key in keys:
+        bitmap |= groups.get(key, 0)
+    return bitmap
+
+
+def _add(groups: dict, key, bit: int):
+    groups[key] = groups.get(key, 0) | bit
+
+
+def _discard(groups: dict, bit: int):
+    for key in [k for k, v in groups.items() if v & bit]:
+        groups[key] &= ~bit
+        if not groups[key]:
+            del groups[key]
+
+
+class ProblemIndex:
+    """
+    Process-local filter index for /problems/filter.
+
+    Every facet value (difficulty, tag, company, sheet) maps to a bitmap of
+    problem ids, held as a Python int. Filtering is OR within a facet and AND
+    across facets, the total is a popcount, and only the requested page is
+    loaded from the DB.
+
+    One thread rebuilds at a time. Write hooks that land while a rebuild is
+    reading are applied to the current bitmaps and replayed onto the new ones,
+    so the swap can't roll them back.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._pending: Optional[list] = None  # write hooks since the running build started
+        self.built_at: Optional[float] = None
+        self.live = 0
+        self.by_difficulty: dict = {}
+        self.by_tag: dict = {}
+        self.by_company: dict = {}
+        self.by_sheet: dict = {}
+
+    # ─── Build ───────────────────────────────────────────────────
+    def build(self, db: Session):
+        with self._build_lock:
+            self._build(db)
+
+    def _build(self, db: Session):
+        with self._lock:
+            self._pending = []
+        try:
+            live, by_difficulty = 0, {}
+            for pid, difficulty in db.query(CodingProblem.id, CodingProblem.difficulty).filter(CodingProblem.deleted == False):
+                live |= 1 << pid
+                _add(by_difficulty, difficulty, 1 << pid)
+
+            by_tag = {}
+            for pid, tid in (
+                db.query(ProblemTag.problem_id, ProblemTag.tag_id)
+                .join(Tag, Tag.id == ProblemTag.tag_id)
+                .filter(Tag.deleted == False)
+            ):
+                _add(by_tag, tid, 1 << pid)
+
+            by_company = {}
+            for pid, cid in (
+                db.query(ProblemCompany.problem_id, ProblemCompany.company_id)
+                .join(Company, Company.id == ProblemCompany.company_id)
+                .filter(Company.deleted == False)
+            ):
+                _add(by_company, cid, 1 << pid)
+
+            by_sheet = {}
+            for pid, sid in (
+                db.query(SheetProblem.problem_id, SheetProblem.sheet_id)
+                .join(Sheet, Sheet.id == SheetProblem.sheet_id)
+                .filter(Sheet.deleted == False, SheetProblem.deleted == False)
+            ):
+                _add(by_sheet, sid, 1 << pid)
+
+            with self._lock:
+                self.live = live
+                self.by_difficulty = by_difficulty
+                self.by_tag = by_tag
+                self.by_company = by_company
+                self.by_sheet = by_sheet
+                for op, args in self._pending:
+                    op(*args)
+                self.built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def ensure_fresh(self, db: Session):
+        if self.built_at is not None and time.monotonic() - self.built_at <= PROBLEM_INDEX_TTL:
+            return
+        # One request rebuilds while the rest answer from the current bitmaps;
+        # only the very first build is waited for
+        if not self._build_lock.acquire(blocking=self.built_at is None):
+            return
+        try:
+            if self.built_at is None or time.monotonic() - self.built_at > PROBLEM_INDEX_TTL:
+                self._build(db)
+        finally:
+            self._build_lock.release()
+
+    # ─── Query ───────────────────────────────────────────────────
+    def filter(
+        self,
+        difficulties: Optional[list] = None,
+        tag_ids: Optional[list] = None,
+        company_ids: Optional[list] = None,
+        sheet_ids: Optional[list] = None,
+    ) -> int:
+        with self._lock:
+            bitmap = self.live
+            if difficulties:
+                bitmap &= _union(self.by_difficulty, difficulties)
+            if tag_ids:
+                bitmap &= _union(self.by_tag, tag_ids)
+            if company_ids:
+                bitmap &= _union(self.by_company, company_ids)
+            if sheet_ids:
+                bitmap &= _union(self.by_sheet, sheet_ids)
+            return bitmap
+
+    # ─── Write Hooks (call after commit) ─────────────────────────
+    def _write(self, op, *args):
+        """Apply a hook's change, and queue it for the snapshot being built (if any)."""
+        with self._lock:
+            op(*args)
+            if self._pending is not None:
+                self._pending.append((op, args))
+
+    def _set_problem(self, bit: int, difficulty: str, facets: tuple):
+        self.live |= bit
+        _discard(self.by_difficulty, bit)
+        _add(self.by_difficulty, difficulty, bit)
+        for name, ids in facets:
+            if ids is not None:
+                groups = getattr(self, name)
+                _discard(groups, bit)
+                for key in ids:
+                    _add(groups, key, bit)
+
+    def _remove_problem(self, bit: int):
+        self.live &= ~bit
+        for groups in (self.by_difficulty, self.by_tag, self.by_company, self.by_sheet):
+            _discard(groups, bit)
+
+    def _set_group(self, name: str, key: int, bitmap: int):
+        groups = getattr(self, name)
+        if bitmap:
+            groups[key] = bitmap
+        else:
+            groups.pop(key, None)
+
+    def set_problem(self, problem_id: int, difficulty: str, tag_ids=None, company_ids=None, sheet_ids=None):
+        """Upsert a live problem. Facets passed as None keep their current membership."""
+        facets = (("by_tag", tag_ids), ("by_company", company_ids), ("by_sheet", sheet_ids))
+        self._write(self._set_problem, 1 << problem_id, difficulty, facets)
+
+    def remove_problem(self, problem_id: int):
+        self._write(self._remove_problem, 1 << problem_id)
+
+    def set_sheet(self, sheet_id: int, problem_ids: Iterable[int]):
+        self._write(self._set_group, "by_sheet", sheet_id, to_bitmap(problem_ids))
+
+    def drop_tag(self, tag_id: int):
+        self._write(self._set_group, "by_tag", tag_id, 0)
+
+    def drop_company(self, company_id: int):
+        self._write(self._set_group, "by_company", company_id, 0)
+
+    def drop_sheet(self, sheet_id: int):
+        self._write(self._set_group, "by_sheet", sheet_id, 0)
+
+    def reload_tag(self, db: Session, tag_id: int):
+        """Re-read a (reactivated) tag's associations."""
+        ids = [pid for (pid,) in db.query(ProblemTag.problem_id).filter(ProblemTag.tag_id == tag_id)]
+        self._write(self._set_group, "by_tag", tag_id, to_bitmap(ids))
+
+    def reload_company(self, db: Session, company_id: int):
+        """Re-read a (reactivated) company's associations."""
+        ids = [pid for (pid,) in db.query(ProblemCompany.problem_id).filter(ProblemCompany.company_id == company_id)]
+        self._write(self._set_group, "by_company", company_id, to_bitmap(ids))
+
+
+problem_index = ProblemIndex()
@@ -1,21 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
-import razorpay
-import os
-from dotenv import load_dotenv
 from ...connection.utility import get_db
+from ...utils.razorpay_client import get_razorpay_client
 from ...models.new_registration_model import CustomerPayment
 from ...models.course_model import Courses
-from typing import Optional
-
-# Load environment variables
-load_dotenv()
-
-# Razorpay client setup
-razorpay_client = razorpay.Client(
-    auth=(os.getenv("RAZORPAY_KEY_ID"), os.getenv("RAZORPAY_KEY_SECRET"))
-)
+from typing import Optional, List
+from ...schemas.payment_schema import CustomerPaymentOut
 
 router = APIRouter(prefix="/buy", tags=["Buy"])
 
@@ -37,7 +29,7 @@ def create_order_id(order: OrderRequest, db: Session = Depends(get_db)):
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
 
-        order_data = razorpay_client.order.create(dict(
+        order_data = get_razorpay_client().order.create(dict(
             amount=order.amount * 100,
             currency="INR",
             receipt=f"order_{order.course_id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
@@ -89,7 +81,7 @@ def verify_payment(payload: VerifyPaymentRequest, db: Session = Depends(get_db))
         if not payment_record:
             raise HTTPException(status_code=404, detail="Payment record not found")
 
-        razorpay_client.utility.verify_payment_signature({
+        get_razorpay_client().utility.verify_payment_signature({
             'razorpay_order_id': payload.razorpay_order_id,
             'razorpay_payment_id': payload.razorpay_payment_id,
             'razorpay_signature': payload.razorpay_signature
@@ -116,7 +108,7 @@ def verify_payment(payload: VerifyPaymentRequest, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/payments")
+@router.get("/payments", response_model=List[CustomerPaymentOut], response_class=ORJSONResponse)
 def get_all_payments(db: Session = Depends(get_db)):
     payments = db.query(CustomerPayment).all()
     return payments
@@ -130,7 +122,7 @@ def get_payment_by_id(payment_id: int, db: Session = Depends(get_db)):
     return payment
 
 
-@router.get("/payments/by-course/{course_id}")
+@router.get("/payments/by-course/{course_id}", response_model=List[CustomerPaymentOut], response_class=ORJSONResponse)
 def get_payments_by_course(course_id: int, db: Session = Depends(get_db)):
     payments = db.query(CustomerPayment).filter_by(course_id=course_id).all()
     if not payments:
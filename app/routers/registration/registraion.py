@@ -1,21 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from datetime import datetime
-import razorpay
-import os
-from dotenv import load_dotenv
 from ...models.course_model import *
 from ...models.registration_model import *
 from ...models.user_model import *
 from ...connection.utility import get_db
-
-# Load environment variables
-load_dotenv()
-
-# Razorpay client setup
-razorpay_client = razorpay.Client(
-    auth=(os.getenv("RAZORPAY_KEY_ID"), os.getenv("RAZORPAY_KEY_SECRET"))
-)
+from ...utils.razorpay_client import get_razorpay_client
 
 router = APIRouter(prefix="/registrations", tags=["Registrations"])
 
@@ -36,7 +26,7 @@ def create_payment_order(
         raise HTTPException(status_code=400, detail="Already registered.")
 
     try:
-        order = razorpay_client.order.create(dict(
+        order = get_razorpay_client().order.create(dict(
             amount=amount * 100,  # convert to paise
             currency="INR",
             receipt=f"receipt_{user_id}_{course_id}",
@@ -70,7 +60,7 @@ def verify_and_register(
 ):
     # 1. Verify Razorpay signature
     try:
-        razorpay_client.utility.verify_payment_signature({
+        get_razorpay_client().utility.verify_payment_signature({
             'razorpay_order_id': order_id,
             'razorpay_payment_id': transaction_id,
             'razorpay_signature': signature
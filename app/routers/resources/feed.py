@@ -0,0 +1,78 @@
+"""
+Resource rows as the list endpoints show them, in a fixed number of queries.
+
+Author, author details, domain and subdomain come from eager joins on the
+resource query, and the caller's votes for the whole page from one IN query,
+instead of lazy loads and a vote lookup per resource.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import Session, joinedload
+
+from ...models.resource_model import Resource, ResourceVote
+from ...models.user_model import User
+
+# Resource ids per vote lookup; keeps bound parameters well under SQLite's limit
+VOTE_CHUNK_SIZE = 500
+
+VOTE_LABELS = {1: "upvoted", -1: "downvoted"}
+
+
+def feed_query(db: Session):
+    """Query for Resource with everything format_resource() reads already joined in."""
+    return db.query(Resource).options(
+        joinedload(Resource.user).joinedload(User.user_details),
+        joinedload(Resource.domain),
+        joinedload(Resource.subdomain),
+    )
+
+
+def vote_map(db: Session, user_id: Optional[int], resource_ids: Sequence[int]) -> dict:
+    """resource_id -> vote_type for the user's votes on these resources."""
+    if not user_id or not resource_ids:
+        return {}
+    votes = {}
+    for start in range(0, len(resource_ids), VOTE_CHUNK_SIZE):
+        votes.update(
+            db.query(ResourceVote.resource_id, ResourceVote.vote_type)
+            .filter(
+                ResourceVote.user_id == user_id,
+                ResourceVote.resource_id.in_(resource_ids[start:start + VOTE_CHUNK_SIZE]),
+            )
+            .all()
+        )
+    return votes
+
+
+def author_name(user: Optional[User]) -> Optional[str]:
+    if not user:
+        return None
+    details = user.user_details
+    if details and (details.firstName or details.lastName):
+        return f"{details.firstName or ''} {details.lastName or ''}".strip()
+    return user.username
+
+
+def format_resource(r: Resource, vote_type: Optional[int] = None) -> dict:
+    return {
+        "id": r.id,
+        "title": r.title,
+        "description": r.description,
+        "link": r.link,
+        "upvote": r.upvote,
+        "downvote": r.downvote,
+        "domain_id": r.domain_id,
+        "domain_name": r.domain.name if r.domain else None,
+        "subdomain_id": r.subdomain_id,
+        "subdomain_name": r.subdomain.name if r.subdomain else None,
+        "added_by_id": r.added_by_id,
+        "added_by_name": author_name(r.user),
+        "is_verified": r.is_verified,
+        "user_vote": VOTE_LABELS.get(vote_type),  # 'upvoted', 'downvoted' or None
+    }
+
+
+def format_resources(db: Session, resources: Sequence[Resource], user_id: Optional[int] = None) -> list:
+    """Resources loaded through feed_query(), with `user_id`'s vote on each."""
+    votes = vote_map(db, user_id, [r.id for r in resources])
+    return [format_resource(r, votes.get(r.id)) for r in resources]
@@ -0,0 +1,59 @@
+"""
+Stored sort keys behind /resources/list.
+
+`score` is upvote - downvote. `hot` is the log-scaled score plus the creation
+time in RESOURCE_HOT_WINDOW units, so a resource ten times as popular ranks
+like one a window newer. Because age is folded in at creation time, a
+resource's hot value only changes when its votes do: it is recomputed with the
+counters, and every read sorts on an indexed column instead of a formula.
+"""
+import math
+import os
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, select, update
+
+from ...models.resource_model import Resource
+
+# Seconds of recency worth one order of magnitude of score
+RESOURCE_HOT_WINDOW = float(os.getenv("RESOURCE_HOT_WINDOW", "45000"))
+
+HOT_EPOCH = datetime(2024, 1, 1)
+
+# Resource ids per refresh query; keeps bound parameters well under SQLite's limit
+RANK_CHUNK_SIZE = 500
+
+
+def hot_score(score: int, created_at: Optional[datetime]) -> float:
+    order = math.log10(max(abs(score), 1))
+    sign = (score > 0) - (score < 0)
+    age = ((created_at or HOT_EPOCH) - HOT_EPOCH).total_seconds()
+    return round(sign * order + age / RESOURCE_HOT_WINDOW, 7)
+
+
+def refresh_ranks(db, resource_ids: Optional[Iterable[int]] = None):
+    """
+    Recompute score and hot from the stored counters, for `resource_ids` or
+    every resource. `db` is a Session or Connection; the caller commits.
+    """
+    table = Resource.__table__
+    query = select(table.c.id, table.c.upvote, table.c.downvote, table.c.created_at)
+    if resource_ids is None:
+        rows = db.execute(query).all()
+    else:
+        ids = list(resource_ids)
+        rows = []
+        for start in range(0, len(ids), RANK_CHUNK_SIZE):
+            rows += db.execute(query.where(table.c.id.in_(ids[start:start + RANK_CHUNK_SIZE]))).all()
+    if not rows:
+        return
+
+    values = []
+    for rid, up, down, created_at in rows:
+        score = (up or 0) - (down or 0)
+        values.append({"rid": rid, "new_score": score, "new_hot": hot_score(score, created_at)})
+    db.execute(
+        update(table).where(table.c.id == bindparam("rid")).values(score=bindparam("new_score"), hot=bindparam("new_hot")),
+        values,
+    )
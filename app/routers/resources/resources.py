@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+import os
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, or_, func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from ...connection.utility import get_db
+from ...utils.cache import TTLCache
+from ...utils.etag import catalog_etag, bump_catalog
 from ...models.resource_model import Domain, Subdomain, Resource, ResourceVote
 from ...models.user_model import User   # assuming you already have this
+from ...schemas.resource_schema import ResourceItem, ResourcePage
+from ...utils.pagination import encode_cursor, decode_cursor
+from .feed import feed_query, format_resources
+from .ranking import hot_score
+from ..search.search_index import search_index
+from .votes import UPVOTE, DOWNVOTE, record_vote, vote_counts
 
 router = APIRouter(prefix="/resources", tags=["Resources"])
 
+# The /resources/taxonomy tree. Domain, subdomain and resource writes below
+# invalidate it; the TTL covers writes made by other worker processes.
+RESOURCE_TAXONOMY_TTL = int(os.getenv("RESOURCE_TAXONOMY_TTL", "300"))
+taxonomy_cache = TTLCache(ttl=RESOURCE_TAXONOMY_TTL)
+
 
 @router.get("/all")
-def get_every_resource(db: Session = Depends(get_db)):
+def get_every_resource(user_id: int = None, db: Session = Depends(get_db)):
     try:
-        resources = db.query(Resource).all()
-        return format_resources(resources)
+        resources = feed_query(db).all()
+        return format_resources(db, resources, user_id)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -52,6 +71,7 @@ def toggle_verify_resource(resource_id: int, db: Session = Depends(get_db)):
         resource.is_verified = not resource.is_verified
         db.commit()
         db.refresh(resource)
+        taxonomy_cache.invalidate()
         return {
             "message": f"Resource verification toggled to {resource.is_verified}.",
             "resource_id": resource.id,
@@ -89,6 +109,7 @@ def create_resource(payload: dict, db: Session = Depends(get_db)):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
+        now = datetime.utcnow()
         resource = Resource(
             title=title,
             description=description,
@@ -96,11 +117,15 @@ def create_resource(payload: dict, db: Session = Depends(get_db)):
             domain_id=domain_id,
             subdomain_id=subdomain_id,
             added_by_id=added_by_id,
-            is_verified=False   # default, can only be updated via moderation
+            is_verified=False,   # default, can only be updated via moderation
+            created_at=now,
+            hot=hot_score(0, now),
         )
         db.add(resource)
         db.commit()
         db.refresh(resource)
+        search_index.put("resources", resource)
+        taxonomy_cache.invalidate()
 
         return {"message": "Resource added successfully", "resource_id": resource.id}
 
@@ -119,24 +144,115 @@ def get_resources_by_ids(payload: dict, db: Session = Depends(get_db)):
         if not domain_id or not subdomain_id:
             raise HTTPException(status_code=400, detail="Both domain_id and subdomain_id are required")
 
-        resources = db.query(Resource).filter_by(
-            domain_id=domain_id, subdomain_id=subdomain_id
+        resources = feed_query(db).filter(
+            Resource.domain_id == domain_id, Resource.subdomain_id == subdomain_id
         ).all()
 
-        return format_resources(resources)
+        return format_resources(db, resources, payload.get("user_id"))
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
 # ✅ Get all resources
-@router.get("/all-resources")
+@router.get("/all-resources", response_model=list[ResourceItem], response_class=ORJSONResponse)
 def get_all_resources(user_id: int = None, db: Session = Depends(get_db)):
     try:
-        resources = db.query(Resource).all()
-        return [format_resource(r, db=db, user_id=user_id) for r in resources]
+        resources = feed_query(db).all()
+        return format_resources(db, resources, user_id)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+# ✅ Domains with their subdomains and verified resource counts, in one tree
+def build_taxonomy(db: Session) -> list:
+    rows = (
+        db.query(Domain.id, Domain.name, Subdomain.id, Subdomain.name, func.count(Resource.id))
+        .select_from(Domain)
+        .outerjoin(Subdomain, Subdomain.domain_id == Domain.id)
+        .outerjoin(Resource, and_(
+            Resource.subdomain_id == Subdomain.id,
+            Resource.domain_id == Domain.id,
+            Resource.is_verified == True,
+        ))
+        .group_by(Domain.id, Domain.name, Subdomain.id, Subdomain.name)
+        .order_by(Domain.name, Subdomain.name)
+        .all()
+    )
+    domains = {}
+    for domain_id, domain_name, subdomain_id, subdomain_name, verified in rows:
+        node = domains.setdefault(domain_id, {
+            "id": domain_id, "name": domain_name, "verified_resources": 0, "subdomains": [],
+        })
+        if subdomain_id is not None:
+            node["verified_resources"] += verified
+            node["subdomains"].append({"id": subdomain_id, "name": subdomain_name, "verified_resources": verified})
+    return list(domains.values())
+
+
+@router.get("/taxonomy", response_class=ORJSONResponse)
+def get_taxonomy(db: Session = Depends(get_db)):
+    try:
+        tree = taxonomy_cache.get("tree")
+        if tree is None:
+            tree = build_taxonomy(db)
+            taxonomy_cache.set("tree", tree)
+        return tree
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+# ✅ Ranked listing, one page at a time
+# Sort key column per `sort`; "new" is id order (ids are assigned in creation order)
+SORT_KEYS = {"top": Resource.score, "hot": Resource.hot, "new": None}
+
+
+@router.get("/list", response_model=ResourcePage, response_class=ORJSONResponse)
+def list_resources(
+    sort: Literal["top", "new", "hot"] = "hot",
+    domain_id: Optional[int] = None,
+    subdomain_id: Optional[int] = None,
+    verified: Optional[bool] = None,
+    user_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    query = feed_query(db)
+    if subdomain_id is not None:
+        query = query.filter(Resource.subdomain_id == subdomain_id)
+    if domain_id is not None:
+        query = query.filter(Resource.domain_id == domain_id)
+    if verified is not None:
+        query = query.filter(Resource.is_verified == True if verified else or_(
+            Resource.is_verified == False, Resource.is_verified.is_(None)
+        ))
+
+    # Keyset on (sort key, id), highest first
+    key = SORT_KEYS[sort]
+    if cursor:
+        after = decode_cursor(cursor, "sort", "id")
+        if after["sort"] != sort or (key is not None and "key" not in after):
+            raise HTTPException(status_code=400, detail="Cursor is for a different sort")
+        if key is None:
+            query = query.filter(Resource.id < after["id"])
+        else:
+            query = query.filter(or_(key < after["key"], and_(key == after["key"], Resource.id < after["id"])))
+    order = (Resource.id.desc(),) if key is None else (key.desc(), Resource.id.desc())
+
+    try:
+        resources = query.order_by(*order).limit(limit + 1).all()
+        next_cursor = None
+        if len(resources) > limit:
+            resources = resources[:limit]
+            last = resources[-1]
+            position = {"sort": sort, "id": last.id}
+            if key is not None:
+                position["key"] = getattr(last, key.key)
+            next_cursor = encode_cursor(position)
+        return {"results": format_resources(db, resources, user_id), "next_cursor": next_cursor}
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+
 # ✅ Delete resource
 @router.delete("/{resource_id}")
 def delete_resource(resource_id: int, db: Session = Depends(get_db)):
@@ -147,6 +263,8 @@ def delete_resource(resource_id: int, db: Session = Depends(get_db)):
 
         db.delete(resource)
         db.commit()
+        search_index.remove("resources", resource_id)
+        taxonomy_cache.invalidate()
         return {"message": f"Resource with id {resource_id} deleted successfully"}
     except SQLAlchemyError as e:
         db.rollback()
@@ -155,13 +273,13 @@ def delete_resource(resource_id: int, db: Session = Depends(get_db)):
 
 # ✅ Get resource by ID
 @router.get("/{resource_id}")
-def get_resource_by_id(resource_id: int, db: Session = Depends(get_db)):
+def get_resource_by_id(resource_id: int, user_id: int = None, db: Session = Depends(get_db)):
     try:
-        resource = db.query(Resource).filter_by(id=resource_id).first()
+        resource = feed_query(db).filter(Resource.id == resource_id).first()
         if not resource:
             raise HTTPException(status_code=404, detail="Resource not found")
 
-        return format_resource(resource)
+        return format_resources(db, [resource], user_id)[0]
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -175,8 +293,8 @@ def get_resources_by_user(user_id: int, db: Session = Depends(get_db)):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        resources = db.query(Resource).filter_by(added_by_id=user_id).all()
-        return format_resources(resources)
+        resources = feed_query(db).filter(Resource.added_by_id == user_id).all()
+        return format_resources(db, resources)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -186,68 +304,38 @@ class VotePayload(BaseModel):
     user_id: int
 
 
-# ✅ Upvote
+VOTE_MESSAGES = {
+    UPVOTE: ("Resource upvoted", "Vote changed to upvote", "You have already upvoted this resource"),
+    DOWNVOTE: ("Resource downvoted", "Vote changed to downvote", "You have already downvoted this resource"),
+}
 
-@router.post("/{resource_id}/upvote")
-def upvote_resource(resource_id: int, payload: VotePayload, db: Session = Depends(get_db)):
+
+def vote_on_resource(resource_id: int, user_id: int, vote_type: int, db: Session):
     try:
-        resource = db.query(Resource).filter_by(id=resource_id).first()
-        if not resource:
+        if not db.query(Resource.id).filter(Resource.id == resource_id).first():
             raise HTTPException(status_code=404, detail="Resource not found")
 
-        existing_vote = db.query(ResourceVote).filter_by(resource_id=resource_id, user_id=payload.user_id).first()
+        deltas = record_vote(db, resource_id, user_id, vote_type)
+        new, changed, same = VOTE_MESSAGES[vote_type]
+        message = same if deltas is None else changed if 0 not in deltas else new
 
-        if existing_vote:
-            if existing_vote.vote_type == 1:
-                message = "You have already upvoted this resource"
-            elif existing_vote.vote_type == -1:
-                existing_vote.vote_type = 1
-                resource.downvote -= 1
-                resource.upvote += 1
-                message = "Vote changed to upvote"
-        else:
-            new_vote = ResourceVote(resource_id=resource_id, user_id=payload.user_id, vote_type=1)
-            db.add(new_vote)
-            resource.upvote += 1
-            message = "Resource upvoted"
-
-        db.commit()
-        db.refresh(resource)
-        return {"message": message, "upvotes": resource.upvote, "downvotes": resource.downvote}
+        upvotes, downvotes = vote_counts(db, resource_id)
+        return {"message": message, "upvotes": upvotes, "downvotes": downvotes}
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-# ✅ Downvote
-@router.post("/{resource_id}/downvote")
-def downvote_resource(resource_id: int, payload: VotePayload, db: Session = Depends(get_db)):
-    try:
-        resource = db.query(Resource).filter_by(id=resource_id).first()
-        if not resource:
-            raise HTTPException(status_code=404, detail="Resource not found")
 
-        existing_vote = db.query(ResourceVote).filter_by(resource_id=resource_id, user_id=payload.user_id).first()
+# ✅ Upvote
+@router.post("/{resource_id}/upvote")
+def upvote_resource(resource_id: int, payload: VotePayload, db: Session = Depends(get_db)):
+    return vote_on_resource(resource_id, payload.user_id, UPVOTE, db)
 
-        if existing_vote:
-            if existing_vote.vote_type == -1:
-                message = "You have already downvoted this resource"
-            elif existing_vote.vote_type == 1:
-                existing_vote.vote_type = -1
-                resource.upvote -= 1
-                resource.downvote += 1
-                message = "Vote changed to downvote"
-        else:
-            new_vote = ResourceVote(resource_id=resource_id, user_id=payload.user_id, vote_type=-1)
-            db.add(new_vote)
-            resource.downvote += 1
-            message = "Resource downvoted"
 
-        db.commit()
-        db.refresh(resource)
-        return {"message": message, "upvotes": resource.upvote, "downvotes": resource.downvote}
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+# ✅ Downvote
+@router.post("/{resource_id}/downvote")
+def downvote_resource(resource_id: int, payload: VotePayload, db: Session = Depends(get_db)):
+    return vote_on_resource(resource_id, payload.user_id, DOWNVOTE, db)
 
 
 # ✅ Update resource (by ID only)
@@ -270,54 +358,14 @@ def update_resource(resource_id: int, payload: dict, db: Session = Depends(get_d
 
         db.commit()
         db.refresh(resource)
+        search_index.put("resources", resource)
+        taxonomy_cache.invalidate()
         return {"message": "Resource updated successfully"}
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-# -----------------------------------------------------------
-# 🛠️ Utility for formatting responses consistently
-# -----------------------------------------------------------
-def format_resource(r: Resource, db: Session = None, user_id: int = None):
-    added_by_name = None
-    if r.user:
-        if r.user.user_details and (r.user.user_details.firstName or r.user.user_details.lastName):
-            added_by_name = f"{r.user.user_details.firstName or ''} {r.user.user_details.lastName or ''}".strip()
-        else:
-            added_by_name = r.user.username
-
-    vote_status = None
-    if db and user_id:
-        vote = db.query(ResourceVote).filter_by(resource_id=r.id, user_id=user_id).first()
-        if vote:
-            vote_status = "upvoted" if vote.vote_type == 1 else "downvoted"
-
-    return {
-        "id": r.id,
-        "title": r.title,
-        "description": r.description,
-        "link": r.link,
-        "upvote": r.upvote,
-        "downvote": r.downvote,
-        "domain_id": r.domain_id,
-        "domain_name": r.domain.name if r.domain else None,
-        "subdomain_id": r.subdomain_id,
-        "subdomain_name": r.subdomain.name if r.subdomain else None,
-        "added_by_id": r.added_by_id,
-        "added_by_name": added_by_name,
-        "is_verified": r.is_verified,
-        "user_vote": vote_status,  # can be 'upvoted', 'downvoted', or None
-    }
-
-
-
-
-def format_resources(resources: list[Resource]):
-    return [format_resource(r) for r in resources]
-
-
-
 # -----------------------------------------------------------
 # ➕ Domain Endpoints
 # -----------------------------------------------------------
@@ -335,15 +383,17 @@ def create_domain(payload: dict, db: Session = Depends(get_db)):
 
         domain = Domain(name=name)
         db.add(domain)
+        bump_catalog(db, "domains")
         db.commit()
         db.refresh(domain)
+        taxonomy_cache.invalidate()
         return {"message": "Domain created successfully", "domain_id": domain.id}
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-@router.get("/domain/all")
+@router.get("/domain/all", dependencies=[Depends(catalog_etag("domains"))])
 def get_all_domains(db: Session = Depends(get_db)):
     try:
         domains = db.query(Domain).all()
@@ -376,15 +426,17 @@ def create_subdomain(payload: dict, db: Session = Depends(get_db)):
 
         subdomain = Subdomain(name=name, domain_id=domain_id)
         db.add(subdomain)
+        bump_catalog(db, "subdomains")
         db.commit()
         db.refresh(subdomain)
+        taxonomy_cache.invalidate()
         return {"message": "Subdomain created successfully", "subdomain_id": subdomain.id}
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-@router.get("/subdomain/all")
+@router.get("/subdomain/all", dependencies=[Depends(catalog_etag("subdomains"))])
 def get_all_subdomains(db: Session = Depends(get_db)):
     try:
         subdomains = db.query(Subdomain).all()
@@ -416,8 +468,10 @@ def update_domain(domain_id: int, payload: dict, db: Session = Depends(get_db)):
         name = payload.get("name")
         if name:
             domain.name = name
+            bump_catalog(db, "domains")
             db.commit()
             db.refresh(domain)
+            taxonomy_cache.invalidate()
             return {"message": "Domain updated successfully", "id": domain.id, "name": domain.name}
         return {"message": "No changes applied"}
     except SQLAlchemyError as e:
@@ -431,7 +485,9 @@ def delete_domain(domain_id: int, db: Session = Depends(get_db)):
         if not domain:
             raise HTTPException(status_code=404, detail="Domain not found")
         db.delete(domain)
+        bump_catalog(db, "domains", "subdomains")
         db.commit()
+        taxonomy_cache.invalidate()
         return {"message": f"Domain with id {domain_id} deleted successfully"}
     except SQLAlchemyError as e:
         db.rollback()
@@ -458,8 +514,10 @@ def update_subdomain(subdomain_id: int, payload: dict, db: Session = Depends(get
         name = payload.get("name")
         if name:
             subdomain.name = name
+            bump_catalog(db, "subdomains")
             db.commit()
             db.refresh(subdomain)
+            taxonomy_cache.invalidate()
             return {"message": "Subdomain updated successfully", "id": subdomain.id, "name": subdomain.name}
         return {"message": "No changes applied"}
     except SQLAlchemyError as e:
@@ -474,7 +532,9 @@ def delete_subdomain(subdomain_id: int, db: Session = Depends(get_db)):
         if not subdomain:
             raise HTTPException(status_code=404, detail="Subdomain not found")
         db.delete(subdomain)
+        bump_catalog(db, "subdomains")
         db.commit()
+        taxonomy_cache.invalidate()
         return {"message": f"Subdomain with id {subdomain_id} deleted successfully"}
     except SQLAlchemyError as e:
         db.rollback()
@@ -0,0 +1,174 @@
+"""
+Resource votes without read-modify-write.
+
+A vote is one row per (resource_id, user_id). Casting one makes sure the row
+exists, then sets vote_type with UPDATEs conditioned on its previous value, so
+the rowcounts say exactly how the counters move, however many requests race.
+Counters only ever change by `SET upvote = upvote + :d`, applied right away
+or, with RESOURCE_VOTE_WRITE_BEHIND=true, summed per resource in this process
+and written once per RESOURCE_VOTE_FLUSH_INTERVAL.
+"""
+import asyncio
+import os
+import threading
+from typing import Optional
+
+import anyio
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from ...connection.database import SessionLocal
+from ...models.resource_model import Resource, ResourceVote
+from ...utils.upsert import insert_ignore
+from .ranking import refresh_ranks
+
+RESOURCE_VOTE_WRITE_BEHIND = os.getenv("RESOURCE_VOTE_WRITE_BEHIND", "false").lower() == "true"
+RESOURCE_VOTE_FLUSH_INTERVAL = float(os.getenv("RESOURCE_VOTE_FLUSH_INTERVAL", "2"))
+
+UPVOTE, DOWNVOTE = 1, -1
+
+# vote_type of a row cast_vote() has just created and not yet set; never committed
+UNSET = 0
+
+
+def cast_vote(db: Session, resource_id: int, user_id: int, vote_type: int) -> Optional[tuple]:
+    """
+    Record the user's vote; returns the (upvote, downvote) counter deltas, or
+    None when they had already voted this way. Caller applies the deltas and commits.
+    """
+    db.execute(insert_ignore(db.get_bind(), ResourceVote.__table__, [
+        {"resource_id": resource_id, "user_id": user_id, "vote_type": UNSET},
+    ]))
+
+    def set_from(previous: int) -> int:
+        return db.execute(
+            update(ResourceVote)
+            .where(
+                ResourceVote.resource_id == resource_id,
+                ResourceVote.user_id == user_id,
+                ResourceVote.vote_type == previous,
+            )
+            .values(vote_type=vote_type)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    # Conditional UPDATEs re-check the row under its lock, so racing requests
+    # can't both count the same change
+    if set_from(UNSET):
+        return (1, 0) if vote_type == UPVOTE else (0, 1)
+    if set_from(-vote_type):
+        return (1, -1) if vote_type == UPVOTE else (-1, 1)
+    return None
+
+
+def apply_deltas(db: Session, deltas: dict):
+    """
+    resource_id -> (upvote, downvote) deltas, as relative UPDATEs in one
+    executemany; the resources' sort keys are then recomputed from the result.
+    """
+    if not deltas:
+        return
+    db.execute(
+        update(Resource.__table__)
+        .where(Resource.__table__.c.id == bindparam("rid"))
+        .values(
+            upvote=func.coalesce(Resource.__table__.c.upvote, 0) + bindparam("up"),
+            downvote=func.coalesce(Resource.__table__.c.downvote, 0) + bindparam("down"),
+        ),
+        [{"rid": rid, "up": up, "down": down} for rid, (up, down) in deltas.items()],
+    )
+    refresh_ranks(db, deltas)
+
+
+class VoteCounterBuffer:
+    """Per-process counter deltas waiting to be written, summed per resource."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas: dict = {}
+        self.stats = {"votes": 0, "flushes": 0, "rows_written": 0, "last_error": None}
+
+    def add(self, resource_id: int, up: int, down: int):
+        with self._lock:
+            pending = self._deltas.get(resource_id, (0, 0))
+            self._deltas[resource_id] = (pending[0] + up, pending[1] + down)
+            self.stats["votes"] += 1
+
+    def pending(self, resource_id: int) -> tuple:
+        with self._lock:
+            return self._deltas.get(resource_id, (0, 0))
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns how many resources were updated."""
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+        deltas = {rid: d for rid, d in deltas.items() if d != (0, 0)}
+        if not deltas:
+            return 0
+        try:
+            with SessionLocal() as db:
+                apply_deltas(db, deltas)
+                db.commit()
+        except Exception:
+            # Put them back so the next flush retries
+            for rid, (up, down) in deltas.items():
+                self.add(rid, up, down)
+            raise
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(deltas)
+        return len(deltas)
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None):
+        stop = stop or asyncio.Event()
+        try:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), RESOURCE_VOTE_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    await anyio.to_thread.run_sync(self.flush)
+                except Exception as exc:  # keep flushing through DB hiccups
+                    self.stats["last_error"] = f"{exc.__class__.__name__}: {exc}"
+        finally:
+            # Shutdown (cancelled by the lifespan): don't drop what's buffered
+            await anyio.to_thread.run_sync(self.flush)
+
+
+vote_buffer = VoteCounterBuffer()
+
+
+def record_vote(db: Session, resource_id: int, user_id: int, vote_type: int) -> Optional[tuple]:
+    """cast_vote() plus its counter deltas, written now or buffered; commits."""
+    deltas = cast_vote(db, resource_id, user_id, vote_type)
+    if deltas and not RESOURCE_VOTE_WRITE_BEHIND:
+        apply_deltas(db, {resource_id: deltas})
+    db.commit()
+    if deltas and RESOURCE_VOTE_WRITE_BEHIND:
+        vote_buffer.add(resource_id, *deltas)
+    return deltas
+
+
+def vote_counts(db: Session, resource_id: int) -> tuple:
+    """(upvote, downvote) as stored plus this process's unflushed deltas."""
+    up, down = db.execute(
+        select(Resource.upvote, Resource.downvote).where(Resource.id == resource_id)
+    ).one()
+    pending_up, pending_down = vote_buffer.pending(resource_id)
+    return (up or 0) + pending_up, (down or 0) + pending_down
+
+
+def recount_votes(conn):
+    """Recompute every resource's counters and sort keys from resource_votes (migration / repair)."""
+    votes = ResourceVote.__table__
+    resources = Resource.__table__
+
+    def tally(vote_type):
+        return (
+            select(func.count())
+            .where(votes.c.resource_id == resources.c.id, votes.c.vote_type == vote_type)
+            .scalar_subquery()
+        )
+
+    conn.execute(update(resources).values(upvote=tally(UPVOTE), downvote=tally(DOWNVOTE)))
+    refresh_ranks(conn)
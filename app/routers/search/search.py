@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+
+from ...connection.utility import get_db
+from .search_index import search_index, SOURCES
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_class=ORJSONResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="comma-separated: " + ", ".join(SOURCES)),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    kinds = [kind.strip() for kind in types.split(",") if kind.strip()] if types else None
+    unknown = [kind for kind in kinds or () if kind not in SOURCES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(unknown)}")
+
+    search_index.ensure_fresh(db)
+    total, hits = search_index.search(q, kinds, limit)
+    return {
+        "query": q,
+        "total": total,
+        "results": [
+            {"type": kind, "id": row_id, "title": title, "score": round(score, 4)}
+            for (kind, row_id), title, score in hits
+        ],
+    }
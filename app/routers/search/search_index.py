@@ -0,0 +1,239 @@
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from heapq import nlargest
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from ...models.codeforces_ladder_model import CP51Problem
+from ...models.course_model import Courses
+from ...models.problem_model import CodingProblem
+from ...models.resource_model import Resource
+
+# Full rebuild interval (seconds). Writes in this process update the index
+# immediately; the rebuild picks up writes made by other worker processes.
+SEARCH_INDEX_TTL = int(os.getenv("SEARCH_INDEX_TTL", "300"))
+
+# Vocabulary terms a trailing prefix ("dyn" -> "dynamic", "dynamo", ...) expands to
+SEARCH_PREFIX_TERMS = int(os.getenv("SEARCH_PREFIX_TERMS", "50"))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: Optional[str]) -> list:
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+class Source(NamedTuple):
+    model: type
+    fields: dict  # attribute -> weight (a title word counts as two description words); includes title
+    live: Optional[tuple] = None  # (attribute, value) a row must have to be searchable
+
+
+SOURCES = {
+    "problems": Source(CodingProblem, {"title": 2}, ("deleted", False)),
+    "cp51": Source(CP51Problem, {"title": 2, "description": 1}),
+    "resources": Source(Resource, {"title": 2, "description": 1}),
+    "courses": Source(Courses, {"title": 2, "description": 1}, ("is_published", True)),
+}
+
+
+def _weighted_terms(source: Source, values: dict) -> dict:
+    terms = {}
+    for field, weight in source.fields.items():
+        for term in tokenize(values.get(field)):
+            terms[term] = terms.get(term, 0) + weight
+    return terms
+
+
+class SearchIndex:
+    """
+    Process-local inverted index for /search.
+
+    Each searchable row is a document keyed (type, id) holding its weighted
+    term frequencies; every term maps to the documents containing it. Queries
+    score with BM25 over the postings of their terms only, and the last query
+    word also matches as a prefix through a sorted vocabulary.
+
+    One thread rebuilds at a time. Write hooks that land while a rebuild is
+    reading are applied to the current index and replayed onto the new one,
+    so the swap can't roll them back.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._pending: Optional[list] = None  # write hooks since the running build started
+        self.built_at: Optional[float] = None
+        self.postings: dict = {}  # term -> {(type, id): weighted tf}
+        self.docs: dict = {}  # (type, id) -> (title, length, terms)
+        self.vocab: list = []  # sorted terms, for prefix lookups
+        self.total_length = 0
+
+    # ─── Build ───────────────────────────────────────────────────
+    def _load(self, db: Session, kind: str) -> dict:
+        source = SOURCES[kind]
+        query = db.query(source.model.id, *(getattr(source.model, field) for field in source.fields))
+        if source.live:
+            field, value = source.live
+            query = query.filter(getattr(source.model, field) == value)
+        return {(kind, row.id): self._document(source, row._asdict()) for row in query}
+
+    @staticmethod
+    def _document(source: Source, values: dict) -> tuple:
+        terms = _weighted_terms(source, values)
+        return values.get("title"), sum(terms.values()), terms
+
+    def build(self, db: Session):
+        with self._build_lock:
+            self._build(db)
+
+    def _build(self, db: Session):
+        with self._lock:
+            self._pending = []
+        try:
+            docs = {}
+            for kind in SOURCES:
+                docs.update(self._load(db, kind))
+
+            postings = {}
+            for key, (_, _, terms) in docs.items():
+                for term, tf in terms.items():
+                    postings.setdefault(term, {})[key] = tf
+
+            with self._lock:
+                self.docs = docs
+                self.postings = postings
+                self.vocab = sorted(postings)
+                self.total_length = sum(length for _, length, _ in docs.values())
+                for op, args in self._pending:
+                    op(*args)
+                self.built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def ensure_fresh(self, db: Session):
+        if self.built_at is not None and time.monotonic() - self.built_at <= SEARCH_INDEX_TTL:
+            return
+        # One request rebuilds while the rest search the current index; only
+        # the very first build is waited for
+        if not self._build_lock.acquire(blocking=self.built_at is None):
+            return
+        try:
+            if self.built_at is None or time.monotonic() - self.built_at > SEARCH_INDEX_TTL:
+                self._build(db)
+        finally:
+            self._build_lock.release()
+
+    # ─── Query ───────────────────────────────────────────────────
+    def _expand(self, prefix: str) -> list:
+        start = bisect_left(self.vocab, prefix)
+        terms = []
+        for term in self.vocab[start:start + SEARCH_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query: str, types: Optional[Iterable[str]] = None, limit: int = 20) -> tuple:
+        """(number of matching documents, [((type, id), title, score)] best first)."""
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return 0, []
+        # Search-as-you-type: the last word may be unfinished unless followed by a space
+        prefix = words[-1] if not query[-1:].isspace() else None
+        kinds = set(types) if types else None
+
+        with self._lock:
+            n = len(self.docs)
+            if not self.total_length:  # nothing indexed (or nothing but empty text)
+                return 0, []
+            # BM25 length normalisation, K1 * (1 - B + B * length / avg_length), split up
+            base, per_unit = K1 * (1 - B), K1 * B * n / self.total_length
+            scores = {}
+            for word in words:
+                # A document scores its best-matching expansion of each word
+                best = {}
+                for term in self._expand(word) if word == prefix else [word]:
+                    postings = self.postings.get(term)
+                    if not postings:
+                        continue
+                    weight = (K1 + 1) * math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        if kinds and key[0] not in kinds:
+                            continue
+                        score = weight * tf / (tf + base + per_unit * self.docs[key][1])
+                        if score > best.get(key, 0):
+                            best[key] = score
+                for key, score in best.items():
+                    scores[key] = scores.get(key, 0) + score
+
+            top = nlargest(limit, scores.items(), key=lambda item: (item[1], item[0][1]))
+            return len(scores), [(key, self.docs[key][0], score) for key, score in top]
+
+    # ─── Write Hooks (call after commit) ─────────────────────────
+    def _write(self, op, *args):
+        """Apply a hook's change, and queue it for the index being built (if any)."""
+        with self._lock:
+            op(*args)
+            if self._pending is not None:
+                self._pending.append((op, args))
+
+    def _discard(self, key: tuple):
+        old = self.docs.pop(key, None)
+        if not old:
+            return
+        self.total_length -= old[1]
+        for term in old[2]:
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+                del self.vocab[bisect_left(self.vocab, term)]
+
+    def _insert(self, key: tuple, doc: tuple):
+        self.docs[key] = doc
+        self.total_length += doc[1]
+        for term, tf in doc[2].items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                insort(self.vocab, term)
+            self.postings[term][key] = tf
+
+    def _replace(self, key: tuple, doc: tuple):
+        self._discard(key)
+        self._insert(key, doc)
+
+    def _replace_kind(self, kind: str, docs: dict):
+        for key in [key for key in self.docs if key[0] == kind]:
+            self._discard(key)
+        for key, doc in docs.items():
+            self._insert(key, doc)
+
+    def put(self, kind: str, obj):
+        """Index (or re-index) a row; rows that aren't live are removed instead."""
+        source = SOURCES[kind]
+        if source.live and getattr(obj, source.live[0]) != source.live[1]:
+            self.remove(kind, obj.id)
+            return
+        doc = self._document(source, {field: getattr(obj, field) for field in source.fields})
+        self._write(self._replace, (kind, obj.id), doc)
+
+    def remove(self, kind: str, row_id: int):
+        self._write(self._discard, (kind, row_id))
+
+    def reload(self, db: Session, kind: str):
+        """Re-read every row of one type (after bulk writes)."""
+        self._write(self._replace_kind, kind, self._load(db, kind))
+
+
+search_index = SearchIndex()
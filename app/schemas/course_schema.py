@@ -1,7 +1,8 @@
 import enum
 from enum import Enum
-from datetime import date, time
-from pydantic import BaseModel, Field
+from datetime import date, time, datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 
@@ -34,3 +35,35 @@ class CourseDetailsUpdate(BaseModel):
     duration_in_hours: int
     title: str
     description: str
+
+
+class CourseOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    mode: str
+    creatorid: int
+    is_published: Optional[bool] = None
+    syllabus_link: Optional[str] = None
+    syllausContent: Optional[str] = None
+    co_mentors: Optional[str] = None
+    cover_photo: Optional[str] = None
+    description: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    price: Optional[int] = None
+    lecture_link: Optional[str] = None
+    domains: Optional[str] = None
+    seats: Optional[int] = None
+    chatLink: Optional[str] = None
+    isExtraRegistration: Optional[bool] = None
+    isVerified: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class CoursesByUserResponse(BaseModel):
+    success: bool
+    courses: Optional[List[CourseOut]] = None
+    message: Optional[str] = None
@@ -0,0 +1,12 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class ProblemStatusChange(BaseModel):
+    problem_id: int
+    is_completed: Optional[bool] = None  # None leaves the flag unchanged
+    is_revisit: Optional[bool] = None
+
+
+class ProblemStatusBatch(BaseModel):
+    changes: List[ProblemStatusChange] = Field(..., min_length=1, max_length=1000)
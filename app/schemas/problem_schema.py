@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+# Response models for the large problem listings. Declaring them lets
+# FastAPI serialize through pydantic-core instead of jsonable_encoder.
+
+class ProblemSheetRef(BaseModel):
+    id: int
+    title: str
+
+
+class ProblemListItem(BaseModel):
+    id: int
+    title: str
+    link: str
+    difficulty: str
+    is_premium: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    gitHubLink: Optional[str] = None
+    hindiSolution: Optional[str] = None
+    englishSolution: Optional[str] = None
+    tags: List[str]
+    companies: List[str]
+    sheets: List[ProblemSheetRef]
+
+
+class ProblemPage(BaseModel):
+    total: int
+    results: List[ProblemListItem]
+    next_cursor: Optional[str] = None
+
+
+class CP51ProblemItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    problem_link: str
+    difficulty: Optional[str] = None
+    rating: Optional[int] = None
+    github_solution_link: Optional[str] = None
+    hindi_solution_link: Optional[str] = None
+    english_solution_link: Optional[str] = None
+    created_by: Optional[int] = None
+    is_premium: Optional[bool] = None
+    created_at: Optional[datetime] = None
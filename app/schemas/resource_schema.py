@@ -0,0 +1,24 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ResourceItem(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    link: Optional[str] = None
+    upvote: Optional[int] = None
+    downvote: Optional[int] = None
+    domain_id: int
+    domain_name: Optional[str] = None
+    subdomain_id: int
+    subdomain_name: Optional[str] = None
+    added_by_id: int
+    added_by_name: Optional[str] = None
+    is_verified: Optional[bool] = None
+    user_vote: Optional[str] = None  # 'upvoted', 'downvoted' or None
+
+
+class ResourcePage(BaseModel):
+    results: List[ResourceItem]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,40 @@
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache.
+
+    Entries expire after `ttl` seconds so other worker processes' writes are
+    picked up eventually; writes in this process should call invalidate().
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or everything when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
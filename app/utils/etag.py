@@ -0,0 +1,137 @@
+"""
+Conditional GETs for catalog endpoints.
+
+Each catalog has a version row in `catalog_versions`. Read endpoints declare
+the catalogs their payload depends on:
+
+    @router.get("/all/tags", dependencies=[Depends(catalog_etag("tags"))])
+
+and write endpoints call `bump_catalog(db, "tags")` before committing. A
+request whose If-None-Match matches the current ETag gets a 304 without the
+endpoint running. Versions are cached per process for CATALOG_VERSION_TTL
+seconds, so only one lookup per TTL reaches the DB.
+
+Catalogs changed outside the API (e.g. ladders seeded by a script) can be
+bumped from the shell:
+
+    python -m app.utils.etag ladders
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..connection.database import engine, SessionLocal
+from ..models.catalog_model import CatalogVersion
+from .upsert import upsert_statements
+
+CATALOG_VERSION_TTL = float(os.getenv("CATALOG_VERSION_TTL", "2"))
+
+CATALOGS = (
+    "tags", "companies", "sheets", "problems", "ladders",
+    "domain_tags", "domains", "subdomains",
+)
+
+_lock = threading.Lock()
+_versions: dict = {}
+_loaded_at: Optional[float] = None
+
+
+def _load_versions() -> Optional[dict]:
+    global _versions, _loaded_at
+    with _lock:
+        if _loaded_at is not None and time.monotonic() - _loaded_at < CATALOG_VERSION_TTL:
+            return _versions
+    try:
+        with engine.connect() as conn:
+            versions = dict(conn.execute(select(CatalogVersion.name, CatalogVersion.version)).all())
+    except SQLAlchemyError:
+        # Table not migrated yet: serve without ETags rather than failing reads
+        return None
+    with _lock:
+        _versions, _loaded_at = versions, time.monotonic()
+    return versions
+
+
+def catalog_token(catalogs) -> Optional[str]:
+    """e.g. "tags.3-companies.1"; None when versions can't be read."""
+    versions = _load_versions()
+    if versions is None:
+        return None
+    return "-".join(f"{name}.{versions.get(name, 0)}" for name in catalogs)
+
+
+def current_etag(catalogs) -> Optional[str]:
+    token = catalog_token(catalogs)
+    return f'W/"{token}"' if token is not None else None
+
+
+def _matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {c.strip() for c in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" are equivalent for If-None-Match
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or etag in candidates or bare in candidates
+
+
+def catalog_etag(*catalogs: str):
+    """Dependency factory: 304 on a matching If-None-Match, else set ETag on the response."""
+    def check(request: Request, response: Response):
+        etag = current_etag(catalogs)
+        if etag is not None:
+            check_etag(request, response, etag)
+    return check
+
+
+def check_etag(request: Request, response: Response, etag: str):
+    """304 when If-None-Match matches `etag`, else set it on the response (per-resource ETags)."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _matches(etag, request.headers.get("if-none-match")):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def _forget_versions(session=None):
+    global _loaded_at
+    with _lock:
+        _loaded_at = None
+
+
+def bump_catalog(db: Session, *catalogs: str):
+    """Bump catalog versions inside the caller's transaction (call before commit)."""
+    table = CatalogVersion.__table__
+    now = datetime.utcnow()
+    rows = [{"name": name, "version": 1, "updated_at": now} for name in sorted(set(catalogs))]
+    for stmt in upsert_statements(
+        db.get_bind(), table, rows, ["name"],
+        lambda new: {"version": table.c.version + 1, "updated_at": new.updated_at},
+    ):
+        db.execute(stmt)
+    # Re-read on the next request in this process once the bump is committed (clearing
+    # now would let a concurrent read cache the old versions); other workers catch
+    # up within the TTL
+    event.listen(db, "after_commit", _forget_versions, once=True)
+
+
+def seed_catalogs(conn):
+    """Insert a version row for every known catalog (used by the schema upgrade)."""
+    existing = {name for (name,) in conn.execute(select(CatalogVersion.name))}
+    missing = [{"name": name, "version": 1} for name in CATALOGS if name not in existing]
+    if missing:
+        conn.execute(CatalogVersion.__table__.insert(), missing)
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(CATALOGS)
+    with SessionLocal() as db:
+        bump_catalog(db, *names)
+        db.commit()
+    print("Bumped: " + ", ".join(names))
@@ -0,0 +1,114 @@
+import codecs
+import json
+import re
+from typing import AsyncIterator
+
+_STRUCTURE = re.compile(r'["{}\[\],]')
+_STRING_END = re.compile(r'["\\]')
+_NON_SPACE = re.compile(r"[^ \t\r\n]")
+_PARTIAL_SCALAR = re.compile(r'[^ \t\r\n,\]}\[{"]+')
+
+_DECODER = json.JSONDecoder()
+
+# Largest single item buffered while waiting for the rest of it; a body that
+# never completes an item (malformed, or not the expected shape) fails here
+# instead of being read into memory whole
+MAX_ITEM_CHARS = 1 << 20
+
+
+async def iter_array_items(chunks: AsyncIterator[bytes], key: str) -> AsyncIterator:
+    """
+    Yield the items of the array under top-level `key` ({"key": [...]}) as
+    each one arrives, parsing a single item at a time.
+
+    Only the item being read is buffered, so memory stays at one item plus
+    one chunk however long the array is; closing the generator early skips
+    the rest of the body. Raises ValueError for malformed or truncated input,
+    or when the key never holds an array.
+    """
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    buf = ""
+    pos = 0  # next char of buf to scan
+
+    # Before the array: walk the JSON structure until `"key": [`
+    depth = 0
+    in_string = False
+    string_start = 0
+    last_string = None  # last complete string at depth 1, i.e. the key before ':'
+    in_array = False
+
+    start = 0  # first char of the current array item
+    after_comma = False  # an item must follow: "[1,]" is malformed
+
+    async for chunk in chunks:
+        buf += decode(chunk)
+        while not in_array:
+            if in_string:
+                match = _STRING_END.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buf):  # the escaped char is in the next chunk
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                in_string, pos = False, match.end()
+                if depth == 1:
+                    last_string = buf[string_start:pos - 1]
+                continue
+
+            match = _STRUCTURE.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            char, pos = match.group(), match.end()
+            if char == '"':
+                in_string, string_start = True, pos
+            elif char in "{[":
+                depth += 1
+                if depth == 2 and char == "[" and last_string == key:
+                    in_array, start = True, pos
+            elif char in "}]":
+                depth -= 1
+
+        # Items are parsed by the C scanner behind json.loads, which stops at
+        # the end of one value and reports where that is
+        while in_array:
+            match = _NON_SPACE.search(buf, start)
+            if match is None:
+                break
+            start = match.start()
+            if buf[start] == "]":
+                if after_comma:
+                    raise ValueError(f"trailing ',' in the '{key}' array")
+                return  # empty array
+            try:
+                item, end = _DECODER.raw_decode(buf, start)
+            except json.JSONDecodeError:
+                break  # the item continues in the next chunk
+            match = _NON_SPACE.search(buf, end)
+            if match is None:
+                break  # a number may have more digits in the next chunk
+            separator = match.group()
+            if separator not in ",]":
+                if _PARTIAL_SCALAR.fullmatch(buf, end):  # "12." of "12.5"
+                    break
+                raise ValueError(f"expected ',' or ']' after a '{key}' item, got {separator!r}")
+            yield item
+            if separator == "]":
+                return
+            start, after_comma = match.end(), True
+
+        # Drop what has been consumed; keep the current item or key string
+        keep = start if in_array else string_start if in_string else pos
+        if keep > 0:
+            buf = buf[keep:]
+            pos -= keep
+            string_start -= keep
+            start -= keep
+        if len(buf) > MAX_ITEM_CHARS + len(chunk):
+            raise ValueError(f"'{key}' item larger than {MAX_ITEM_CHARS} characters, or malformed")
+
+    raise ValueError(f"no complete '{key}' array in JSON body")
@@ -0,0 +1,27 @@
+import re
+from typing import Optional, Tuple
+
+CODEFORCES = "codeforces"
+
+# Problem URL forms per judge, each yielding (contest_id, index):
+#   /problemset/problem/1850/A, /contest/1850/problem/A, /gym/102951/problem/B2
+JUDGE_URLS = (
+    (CODEFORCES, re.compile(
+        r"/(?:problemset/problem/(\d+)|(?:contest|gym)/(\d+)/problem)/([A-Z]\d*)(?![A-Z\d])", re.IGNORECASE
+    )),
+)
+
+
+def parse_problem_url(url: Optional[str]) -> Optional[Tuple[str, int, str]]:
+    """Canonical (judge, contest_id, index) for an online-judge problem URL, or None."""
+    for judge, pattern in JUDGE_URLS:
+        match = pattern.search(url or "")
+        if match:
+            contest_id = match.group(1) or match.group(2)
+            return judge, int(contest_id), match.group(3).upper()
+    return None
+
+
+def problem_key(contest_id: int, index: str) -> str:
+    """Key used in Codeforces solved sets, e.g. "1850A"."""
+    return f"{contest_id}{index}"
@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException
+
+
+# Opaque keyset cursors: the last row's sort key, JSON-encoded then base64'd.
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *required: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict) or any(key not in values for key in required):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
@@ -0,0 +1,18 @@
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_razorpay_client():
+    """
+    Shared Razorpay client, built on first use.
+
+    Both registration routers use it; constructing it lazily keeps the
+    razorpay import and credential lookup out of module import time. The app
+    lifespan warms it once per worker.
+    """
+    import razorpay
+
+    return razorpay.Client(
+        auth=(os.getenv("RAZORPAY_KEY_ID"), os.getenv("RAZORPAY_KEY_SECRET"))
+    )
@@ -0,0 +1,6 @@
+import os
+from pathlib import Path
+
+# Uploaded course files: written by the course routers, served at /uploads by
+# app.main, and created by the app lifespan. Defaults to app/uploads.
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", Path(__file__).resolve().parent.parent / "uploads"))
@@ -0,0 +1,59 @@
+from typing import Callable, Iterator, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+# Rows per INSERT statement; keeps bound parameters well under SQLite's limit
+UPSERT_CHUNK_SIZE = 500
+
+
+def upsert_statements(
+    bind,
+    table: Table,
+    rows: Sequence[dict],
+    index_elements: Sequence[str],
+    set_: Callable,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> Iterator:
+    """
+    Multi-row INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE
+    (SQLite, PostgreSQL) statements for `rows`, one per chunk.
+
+    index_elements names the unique key the conflict is detected on, and
+    set_(new) returns {column: expression} for conflicting rows, where `new`
+    refers to the row that was being inserted:
+
+        for stmt in upsert_statements(db.get_bind(), table, rows, ["user_id", "problem_id"],
+                                      lambda new: {"is_completed": new.is_completed}):
+            db.execute(stmt)
+    """
+    dialect = bind.dialect.name
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if dialect == "mysql":
+            stmt = mysql.insert(table).values(chunk)
+            yield stmt.on_duplicate_key_update(set_(stmt.inserted))
+        elif dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table).values(chunk)
+            yield stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_(stmt.excluded))
+        else:
+            raise ValueError(f"No upsert for '{dialect}' databases.")
+
+
+def insert_ignore(bind, table: Table, rows: Sequence[dict]):
+    """
+    INSERT ... ON DUPLICATE KEY UPDATE <pk> = <pk> (MySQL) / ON CONFLICT DO
+    NOTHING (SQLite, PostgreSQL) for `rows`: rows that hit a unique key are
+    left as they are, while other errors (foreign keys, truncation) still raise.
+
+    The rowcount is not comparable across drivers (MySQL counts a matched
+    duplicate as affected), so callers find out what changed with a follow-up
+    conditional UPDATE rather than from this statement.
+    """
+    dialect = bind.dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(table).values(list(rows))
+        return stmt.on_duplicate_key_update({column.name: column for column in table.primary_key.columns})
+    if dialect in ("sqlite", "postgresql"):
+        return (sqlite if dialect == "sqlite" else postgresql).insert(table).values(list(rows)).on_conflict_do_nothing()
+    raise ValueError(f"No insert-ignore for '{dialect}' databases.")
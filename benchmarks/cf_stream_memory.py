@@ -0,0 +1,172 @@
+"""
+Peak Python memory of Codeforces user.status handling: the whole-body
+cf_client.call() the code used before vs. cf_client.stream().
+
+Runs benchmarks/fake_codeforces.py in a subprocess (so its allocations are
+not counted) with a long submission history, then measures with tracemalloc:
+
+    verify     /ladders/verification-wrong for a fresh pending verification
+               (old: full history + scan; new: count-bounded stream that stops
+               at the verification window)
+    refresh    first solved-set fetch for a handle
+               (old: full history list; new: streamed into the solved set)
+
+Timings run under tracemalloc, so compare them with each other only.
+
+    python -m benchmarks.cf_stream_memory --submissions 40000
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--submissions", type=int, default=40_000)
+args = parser.parse_args()
+
+PORT = free_port()
+DB_PATH = Path(tempfile.gettempdir()) / "peerprogrammers_cf_stream_bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["CF_API_BASE"] = f"http://127.0.0.1:{PORT}/api"
+os.environ["CF_MIN_INTERVAL"] = "0"
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.connection.database import Base, engine, async_engine, SessionLocal  # noqa: E402
+from app.models.user_model import User  # noqa: E402
+from app.models.codeforces_ladder_model import PendingVerification  # noqa: E402
+from app.routers.codeforces_ladder.cf_client import cf_client  # noqa: E402
+from app.routers.codeforces_ladder.solved_cache import _fetch_new, solved_key  # noqa: E402
+
+HANDLE = "bench_stream"
+
+
+def start_fake() -> subprocess.Popen:
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_codeforces", "--port", str(PORT),
+         "--latency", "0", "--submissions", str(args.submissions)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", PORT), timeout=0.1).close()
+            return fake
+        except OSError:
+            time.sleep(0.1)
+
+
+def seed():
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add(User(id=1, username="bench", password="x"))
+        db.commit()
+
+
+def assign(problem_id: str):
+    """A fresh pending verification for user 1 (a successful check deletes it)."""
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.query(PendingVerification).delete()
+        db.add(PendingVerification(
+            user_id=1, username=HANDLE, problem_id=problem_id, created_at=now, expiry_at=now + timedelta(minutes=30),
+        ))
+        db.commit()
+
+
+async def old_verify(problem_id: str):
+    """The pre-streaming path: whole history in memory, then scanned."""
+    await cf_client.call("user.info", handles=HANDLE)
+    submissions = await cf_client.call("user.status", handle=HANDLE)
+    return any(
+        f"{s['problem'].get('contestId', '')}{s['problem'].get('index', '')}" == problem_id
+        and s.get("verdict") in ("WRONG_ANSWER", "COMPILATION_ERROR")
+        for s in submissions
+    )
+
+
+async def old_refresh():
+    submissions = await cf_client.call("user.status", handle=HANDLE)
+    return {solved_key(s["problem"]) for s in submissions if s.get("verdict") == "OK"}
+
+
+async def measure(fn, *fn_args):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = await fn(*fn_args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, result
+
+
+def fmt(peak: int) -> str:
+    return f"{peak / 1024:>9.0f} KiB" if peak < 10 * 1024 * 1024 else f"{peak / 1024 / 1024:>9.1f} MiB"
+
+
+async def run():
+    try:
+        await compare()
+    finally:
+        await cf_client.aclose()
+        await async_engine.dispose()
+
+
+async def compare():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        # The newest submission decides which problem the pending row targets
+        newest = await cf_client.call("user.status", handle=HANDLE, count=1)
+        problem_id = f"{newest[0]['problem']['contestId']}{newest[0]['problem']['index']}"
+        assign(problem_id)
+        await client.get("/ladders/verification-wrong/1")  # warm up connections and imports
+        assign(problem_id)
+
+        async def new_verify():
+            return (await client.get("/ladders/verification-wrong/1")).json()
+
+        print(f"{args.submissions} submissions in the handle's history\n")
+        print(f"{'':<10} {'old peak':>13} {'new peak':>13} {'old s':>7} {'new s':>7}")
+        old_peak, old_s, _ = await measure(old_verify, problem_id)
+        new_peak, new_s, _ = await measure(new_verify)
+        print(f"{'verify':<10} {fmt(old_peak)} {fmt(new_peak)} {old_s:>7.2f} {new_s:>7.2f}")
+
+        old_peak, old_s, old = await measure(old_refresh)
+        new_peak, new_s, (new, _, _) = await measure(_fetch_new, HANDLE, None)
+        assert old == new
+        print(f"{'refresh':<10} {fmt(old_peak)} {fmt(new_peak)} {old_s:>7.2f} {new_s:>7.2f}")
+
+
+def main():
+    seed()
+    fake = start_fake()
+    try:
+        asyncio.run(run())
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+/ladders/codeforces/sync against the local fake Codeforces API.
+
+Starts benchmarks/fake_codeforces.py on a free port, points the shared CF
+client at it and seeds a throwaway SQLite ladder, then measures:
+
+    coalesce   N concurrent syncs for one handle -> upstream calls
+    handles    syncs for distinct handles -> time under the rate limit,
+               calls the fake API rejected for arriving too fast
+    loop       worst /ladders/ latency while those syncs are in flight
+               (the old blocking requests.get froze the event loop)
+
+    python -m benchmarks.cf_sync --handles 5 --concurrency 20 --interval 0.25
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--handles", type=int, default=5)
+parser.add_argument("--concurrency", type=int, default=20)
+parser.add_argument("--interval", type=float, default=0.25, help="client CF_MIN_INTERVAL in seconds")
+parser.add_argument("--latency", type=float, default=0.2, help="fake API latency in seconds")
+parser.add_argument("--submissions", type=int, default=3000)
+args = parser.parse_args()
+
+PORT = free_port()
+DB_PATH = Path(tempfile.gettempdir()) / "peerprogrammers_cf_bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["CF_API_BASE"] = f"http://127.0.0.1:{PORT}/api"
+os.environ["CF_MIN_INTERVAL"] = str(args.interval)
+os.environ["WEB_CONCURRENCY"] = "1"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.connection.database import Base, engine, async_engine, SessionLocal  # noqa: E402
+from app.models.codeforces_ladder_model import Ladder, LadderProblem, UserCPProfile  # noqa: E402
+from app.routers.codeforces_ladder.cf_client import cf_client  # noqa: E402
+from benchmarks.fake_codeforces import FakeCodeforces  # noqa: E402
+
+
+def seed(fake: FakeCodeforces, handles: list):
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    Base.metadata.create_all(engine)
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        db.add(Ladder(id=1, rating_range="1200-1300", url="bench-ladder"))
+        for order in range(200):
+            contest, index = rng.randint(1, fake.contests), rng.choice("ABCDEF")
+            db.add(LadderProblem(
+                ladder_id=1, problem_order=order, problem_name=f"{contest}{index}",
+                problem_url=f"https://codeforces.com/problemset/problem/{contest}/{index}",
+                online_judge="Codeforces",
+            ))
+        for user_id, handle in enumerate(handles, start=1):
+            db.add(UserCPProfile(user_id=user_id, codeforces_handle=handle))
+        db.commit()
+
+
+def start_fake(fake: FakeCodeforces) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(fake.build_app(), host="127.0.0.1", port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def sync(client, user_id):
+    response = await client.post("/ladders/codeforces/sync", json={"user_id": user_id, "ladder_id": 1})
+    response.raise_for_status()
+
+
+async def probe_loop(client, stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/ladders/")
+        worst = max(worst, time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return worst
+
+
+async def run(fake: FakeCodeforces, handles: list):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        await client.get("/ladders/")  # warm up
+
+        calls = fake.stats["calls"]
+        start = time.perf_counter()
+        await asyncio.gather(*(sync(client, 1) for _ in range(args.concurrency)))
+        print(f"coalesce : {args.concurrency} concurrent syncs for one handle -> "
+              f"{fake.stats['calls'] - calls} upstream call(s) in {time.perf_counter() - start:.2f}s")
+
+        calls, rejected = fake.stats["calls"], fake.stats["rejected"]
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_loop(client, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(sync(client, user_id) for user_id in range(2, len(handles) + 1)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        worst = await probe
+        print(f"handles  : {len(handles) - 1} handles in {elapsed:.2f}s "
+              f"({fake.stats['calls'] - calls} upstream, {fake.stats['rejected'] - rejected} rejected by the fake API)")
+        print(f"loop     : worst /ladders/ latency during sync {worst * 1000:.1f}ms")
+        print(f"client   : {cf_client.stats}")
+
+    await cf_client.aclose()
+    await async_engine.dispose()
+
+
+def main():
+    handles = [f"bench_user_{i}" for i in range(args.handles + 1)]
+    # The fake API rejects calls closer together than half the client interval; connection setup
+    # jitters arrival times, and a client without rate limiting still trips it
+    fake = FakeCodeforces(args.submissions, latency=args.latency, min_interval=args.interval * 0.5)
+    seed(fake, handles)
+    server = start_fake(fake)
+    try:
+        asyncio.run(run(fake, handles))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Local stand-in for the Codeforces API, for benchmarking sync paths offline.
+
+Serves `user.info` and `user.status` (with `from`/`count`) with deterministic
+synthetic submissions per handle, adds configurable latency, and answers
+"Call limit exceeded" (HTTP 503, like Codeforces) when calls arrive faster
+than --min-interval. Handles starting with "missing" do not exist.
+
+    python -m benchmarks.fake_codeforces --port 8390 --latency 0.2 --min-interval 0.5
+    CF_API_BASE=http://127.0.0.1:8390/api python main.py
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from typing import Optional
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+INDEXES = "ABCDEF"
+VERDICTS = ("OK", "OK", "OK", "WRONG_ANSWER", "TIME_LIMIT_EXCEEDED", "COMPILATION_ERROR")
+
+
+class FakeCodeforces:
+    def __init__(self, submissions: int = 2000, contests: int = 300, latency: float = 0.0, min_interval: float = 0.0):
+        self.submissions = submissions
+        self.contests = contests
+        self.latency = latency
+        self.min_interval = min_interval
+        self.last_call_at = 0.0
+        self.stats = {"calls": 0, "rejected": 0}
+        self._history: dict = {}
+
+    def history(self, handle: str) -> list:
+        """Newest-first submissions, stable for a given handle."""
+        if handle not in self._history:
+            rng = random.Random(zlib.crc32(handle.encode()))
+            now = int(time.time())
+            self._history[handle] = [
+                {
+                    "id": 10_000_000 - i,
+                    "contestId": contest,
+                    "creationTimeSeconds": now - i * 600,
+                    "problem": {"contestId": contest, "index": rng.choice(INDEXES), "name": f"Problem {contest}"},
+                    "author": {"members": [{"handle": handle}]},
+                    "verdict": rng.choice(VERDICTS),
+                }
+                for i, contest in enumerate(rng.randint(1, self.contests) for _ in range(self.submissions))
+            ]
+        return self._history[handle]
+
+    def solved(self, handle: str) -> set:
+        return {
+            f"{s['problem']['contestId']}{s['problem']['index']}"
+            for s in self.history(handle) if s["verdict"] == "OK"
+        }
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        async def gate():
+            self.stats["calls"] += 1
+            now = time.monotonic()
+            too_fast = now - self.last_call_at < self.min_interval
+            self.last_call_at = now
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if too_fast:
+                self.stats["rejected"] += 1
+                return JSONResponse({"status": "FAILED", "comment": "Call limit exceeded"}, status_code=503)
+            return None
+
+        def failed(comment: str):
+            return JSONResponse({"status": "FAILED", "comment": comment}, status_code=400)
+
+        @app.get("/api/user.info")
+        async def user_info(handles: str):
+            rejected = await gate()
+            if rejected:
+                return rejected
+            result = []
+            for handle in handles.split(";"):
+                if handle.startswith("missing"):
+                    return failed(f"handles: User with handle {handle} not found")
+                result.append({"handle": handle, "rating": 1500})
+            return {"status": "OK", "result": result}
+
+        @app.get("/api/user.status")
+        async def user_status(handle: str, start: int = Query(1, alias="from"), count: Optional[int] = None):
+            rejected = await gate()
+            if rejected:
+                return rejected
+            if handle.startswith("missing"):
+                return failed(f"handle: User with handle {handle} not found")
+            history = self.history(handle)
+            end = None if count is None else start - 1 + count
+            return {"status": "OK", "result": history[start - 1:end]}
+
+        @app.get("/stats")
+        async def stats():
+            return self.stats
+
+        return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8390)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds added to every call")
+    parser.add_argument("--min-interval", type=float, default=0.0, help="reject calls closer together than this")
+    parser.add_argument("--submissions", type=int, default=2000, help="submissions per handle")
+    args = parser.parse_args()
+
+    fake = FakeCodeforces(args.submissions, latency=args.latency, min_interval=args.min_interval)
+    uvicorn.run(fake.build_app(), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Requests/sec on the hot catalog read endpoints against a throwaway SQLite file.
+
+The sync routes go through the threadpool + SessionLocal, the migrated ones
+through AsyncSession on aiosqlite, so running this before and after moving a
+router to get_async_db gives the comparison:
+
+    python -m benchmarks.hot_reads --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+DB_PATH = Path(tempfile.gettempdir()) / "peerprogrammers_bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.connection.database import Base, engine, async_engine, SessionLocal  # noqa: E402
+from app.models.problem_model import CodingProblem, Tag, Company, Sheet  # noqa: E402
+from app.models.codeforces_ladder_model import Ladder  # noqa: E402
+
+ENDPOINTS = [
+    "/problems/all/tags",
+    "/problems/list",
+    "/problems/filter-options",
+    "/ladders/",
+]
+
+
+def seed(rows: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.add_all(Tag(name=f"tag-{i}", created_at=now) for i in range(rows))
+        db.add_all(Company(name=f"company-{i}", created_at=now) for i in range(rows))
+        db.add_all(Sheet(title=f"sheet-{i}", created_at=now) for i in range(rows))
+        db.add_all(
+            Ladder(rating_range=f"{800 + i * 100}", url=f"https://example.com/ladder/{i}", created_at=now)
+            for i in range(rows)
+        )
+        db.add_all(
+            CodingProblem(title=f"problem-{i}", link=f"https://example.com/p/{i}",
+                          difficulty=("Easy", "Medium", "Hard")[i % 3], created_at=now)
+            for i in range(rows * 10)
+        )
+        db.commit()
+
+
+async def hammer(path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                r = await client.get(path)
+                r.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    print(f"{'endpoint':32} {'req/s':>10}")
+    for path in ENDPOINTS:
+        rps = await hammer(path, args.requests, args.concurrency)
+        print(f"{path:32} {rps:10.1f}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
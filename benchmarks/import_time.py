@@ -0,0 +1,108 @@
+"""
+Cold-start import profile for `app.main`, with a budget check.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters,
+keeps the fastest run and summarizes it: total, the app's own modules and
+the heaviest third-party packages. Exits non-zero when the total is over
+budget, so it can gate CI or a pre-deploy step:
+
+    python -m benchmarks.import_time                    # print the summary
+    python -m benchmarks.import_time --budget-ms 1200   # fail above 1.2s
+    python -m benchmarks.import_time --write            # refresh import_time_report.md
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = Path(__file__).resolve().parent / "import_time_report.md"
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+
+def profile_once(module: str) -> list:
+    """[(self_us, cumulative_us, depth, name)] in import order."""
+    env = dict(os.environ)
+    # Import must not need a reachable DB; engines connect lazily
+    env.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'peerprogrammers_import.db'}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def summarize(rows: list, module: str, top: int) -> dict:
+    total = next(cum for _, cum, _, name in rows if name == module)
+    app_modules = sorted(
+        ((cum, own, name) for own, cum, _, name in rows if name.startswith("app.") and name != module),
+        reverse=True,
+    )
+    # Heaviest third-party roots: first time each top-level package shows up
+    packages = {}
+    for own, cum, _, name in rows:
+        root = name.split(".")[0]
+        if root != "app" and name == root:
+            packages[root] = max(packages.get(root, 0), cum)
+    third_party = sorted(((cum, name) for name, cum in packages.items()), reverse=True)
+    return {"total": total, "app": app_modules[:top], "third_party": third_party[:top]}
+
+
+def render(summary: dict, module: str, runs: int) -> str:
+    lines = [
+        f"# Import-time profile: `{module}`",
+        "",
+        f"Fastest of {runs} cold runs of `python -X importtime -c \"import {module}\"` "
+        "(regenerate with `python -m benchmarks.import_time --write`).",
+        "",
+        f"**Total: {summary['total'] / 1000:.1f} ms**",
+        "",
+        "## App modules (cumulative)",
+        "",
+        "| module | cumulative ms | self ms |",
+        "|---|---:|---:|",
+    ]
+    lines += [f"| {name} | {cum / 1000:.1f} | {own / 1000:.1f} |" for cum, own, name in summary["app"]]
+    lines += ["", "## Top-level packages (cumulative, first import)", "", "| package | ms |", "|---|---:|"]
+    lines += [f"| {name} | {cum / 1000:.1f} |" for cum, name in summary["third_party"]]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--write", action="store_true", help=f"write {REPORT_PATH.name}")
+    args = parser.parse_args()
+
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda rows: next(cum for _, cum, _, name in rows if name == args.module))
+    summary = summarize(best, args.module, args.top)
+    report = render(summary, args.module, args.runs)
+    print(report)
+    if args.write:
+        REPORT_PATH.write_text(report)
+        print(f"wrote {REPORT_PATH.relative_to(ROOT)}")
+
+    total_ms = summary["total"] / 1000
+    if total_ms > args.budget_ms:
+        sys.exit(f"FAIL: import of {args.module} took {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"OK: {total_ms:.1f} ms within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
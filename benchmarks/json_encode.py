@@ -0,0 +1,107 @@
+"""
+Encode time per 10k rows: the default FastAPI path vs. response_model + ORJSONResponse.
+
+    default   jsonable_encoder() + JSONResponse (stdlib json), what an endpoint
+              without a response_model gets
+    typed     pydantic-core validate/serialize of the response_model +
+              ORJSONResponse, what the typed list endpoints now do
+    orjson    ORJSONResponse on the raw rows (lower bound, no validation)
+
+Rows mirror /problems/all_problem items (dicts) and /buy/payments rows
+(attribute objects, like the ORM instances that endpoint returns):
+
+    python -m benchmarks.json_encode --rows 10000 --repeat 5
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.schemas.problem_schema import ProblemListItem  # noqa: E402
+from app.schemas.payment_schema import CustomerPaymentOut  # noqa: E402
+
+
+def problem_rows(n: int):
+    now = datetime(2025, 1, 1)
+    return [
+        {
+            "id": i, "title": f"Problem {i}", "link": f"https://leetcode.com/problems/p-{i}",
+            "difficulty": ("Easy", "Medium", "Hard")[i % 3], "is_premium": i % 7 == 0,
+            "created_at": now + timedelta(minutes=i), "updated_at": now + timedelta(minutes=i),
+            "gitHubLink": f"https://github.com/x/{i}", "hindiSolution": None, "englishSolution": None,
+            "tags": ["Array", "Two Pointers"], "companies": ["Google"],
+            "sheets": [{"id": 1, "title": "Blind 75"}],
+        }
+        for i in range(n)
+    ]
+
+
+def payment_rows(n: int):
+    now = datetime(2025, 1, 1)
+    return [
+        SimpleNamespace(
+            id=i, name=f"User {i}", number="9999999999", email=f"user{i}@example.com",
+            course_id=i % 20, amount=499.0, currency="INR", status="paid",
+            razorpay_payment_id=f"pay_{i}", razorpay_order_id=f"order_{i}",
+            razorpay_signature="f" * 64, payment_method="upi",
+            payment_date=now, created_at=now, updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def default_path(rows, _adapter):
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def typed_path(rows, adapter):
+    # FastAPI validates the return value against response_model (from_attributes
+    # so ORM rows work), serializes it in JSON mode and hands it to the response class
+    value = adapter.validate_python(rows, from_attributes=True)
+    return ORJSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def orjson_path(rows, _adapter):
+    return ORJSONResponse(rows).body
+
+
+def best_of(fn, rows, adapter, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows, adapter)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("all_problem (dicts)", problem_rows(args.rows), TypeAdapter(List[ProblemListItem]), True),
+        ("payments (objects)", payment_rows(args.rows), TypeAdapter(List[CustomerPaymentOut]), False),
+    ]
+    print(f"{'case':<22} {'path':<8} {'ms':>9} {'speedup':>8}")
+    for name, rows, adapter, plain in cases:
+        baseline = best_of(default_path, rows, adapter, args.repeat)
+        results = [("default", baseline), ("typed", best_of(typed_path, rows, adapter, args.repeat))]
+        if plain:
+            results.append(("orjson", best_of(orjson_path, rows, adapter, args.repeat)))
+        for path, elapsed in results:
+            print(f"{name:<22} {path:<8} {elapsed * 1000:>9.1f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+User rank lookup with N synthetic users: the old GROUP BY + Python scan vs.
+COUNT(*) WHERE solved > mine on the ladder_leaderboard counters.
+
+Seeds a throwaway SQLite file with users, ladder problems and a skewed
+number of completed statuses per user, builds the counters the way
+`python -m app.migrations.schema` does, then times rank lookups for users
+at the top, middle and bottom of the board, plus leaderboard pages:
+
+    python -m benchmarks.leaderboard_rank --users 100000 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+DB_PATH = Path(tempfile.gettempdir()) / "peerprogrammers_rank_bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, insert  # noqa: E402
+
+from app.main import app  # noqa: F401,E402  (registers every mapper)
+from app.connection.database import Base, engine, async_engine, SessionLocal, AsyncSessionLocal  # noqa: E402
+from app.models.user_model import User  # noqa: E402
+from app.models.codeforces_ladder_model import Ladder, LadderProblem, UserProblemStatus  # noqa: E402
+from app.routers.codeforces_ladder import leaderboard  # noqa: E402
+
+
+def seed(users: int, problems: int, seed_value: int = 7):
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Ladder), [{"id": i, "rating_range": f"{i}", "url": f"ladder-{i}"} for i in range(1, 4)])
+        conn.execute(insert(LadderProblem), [
+            {"id": i, "ladder_id": 1 + i % 3, "problem_name": f"p{i}", "problem_url": f"u{i}"}
+            for i in range(1, problems + 1)
+        ])
+        conn.execute(insert(User), [{"id": i, "username": f"user{i}", "password": "x"} for i in range(1, users + 1)])
+        statuses = []
+        for user_id in range(1, users + 1):
+            # Most users solve a handful, a few solve most of the ladders
+            solved = min(problems, int(rng.expovariate(1 / 12)))
+            statuses += [
+                {"user_id": user_id, "problem_id": pid, "is_completed": True, "checked_at": now}
+                for pid in rng.sample(range(1, problems + 1), solved)
+            ]
+            if len(statuses) >= 50_000:
+                conn.execute(insert(UserProblemStatus), statuses)
+                statuses = []
+        if statuses:
+            conn.execute(insert(UserProblemStatus), statuses)
+        leaderboard.rebuild_counters(conn)
+
+
+def old_rank(user_id: int):
+    """The pre-counter get_user_rank: whole grouped board, scanned in Python."""
+    with SessionLocal() as db:
+        solved_counts = (
+            db.query(UserProblemStatus.user_id, func.count(UserProblemStatus.problem_id))
+            .filter(UserProblemStatus.is_completed == True)
+            .group_by(UserProblemStatus.user_id)
+            .order_by(func.count(UserProblemStatus.problem_id).desc())
+            .all()
+        )
+        current_rank, prev_count = 0, None
+        for i, (u_id, solved_count) in enumerate(solved_counts, start=1):
+            if solved_count != prev_count:
+                current_rank = i
+            if u_id == user_id:
+                return current_rank
+            prev_count = solved_count
+    return None
+
+
+async def new_rank(user_id: int):
+    async with AsyncSessionLocal() as db:
+        ranked = await leaderboard.rank_of(db, leaderboard.GLOBAL_BOARD, user_id)
+        return ranked[0] if ranked else None
+
+
+async def page(after=None, offset=0):
+    async with AsyncSessionLocal() as db:
+        return await leaderboard.board_page(db, leaderboard.GLOBAL_BOARD, 50, offset, after)
+
+
+async def best_of(repeat, fn, *args):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        if asyncio.iscoroutine(result):
+            result = await result
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--problems", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed(args.users, args.problems)
+    with SessionLocal() as db:
+        statuses = db.query(func.count(UserProblemStatus.id)).scalar()
+        by_solved = [
+            u for u, in db.execute(
+                leaderboard.LeaderboardCounter.__table__.select()
+                .with_only_columns(leaderboard.LeaderboardCounter.user_id)
+                .where(leaderboard.LeaderboardCounter.ladder_id == 0, leaderboard.LeaderboardCounter.solved > 0)
+                .order_by(leaderboard.LeaderboardCounter.solved.desc())
+            )
+        ]
+    print(f"seeded {args.users} users, {statuses} statuses in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'lookup':<24} {'old ms':>9} {'new ms':>9} {'speedup':>8}  rank")
+    for label, user_id in (("top user", by_solved[0]), ("median user", by_solved[len(by_solved) // 2]),
+                           ("last ranked user", by_solved[-1])):
+        old_ms, old = await best_of(args.repeat, old_rank, user_id)
+        new_ms, new = await best_of(args.repeat, new_rank, user_id)
+        assert old == new, (label, old, new)
+        print(f"{label:<24} {old_ms:>9.1f} {new_ms:>9.2f} {old_ms / new_ms:>7.0f}x  {new}")
+
+    first_ms, (_, after) = await best_of(args.repeat, page)
+    deep_ms, _ = await best_of(args.repeat, page, None, len(by_solved) // 2)
+    print(f"\nleaderboard page 1      {first_ms:>9.2f} ms")
+    print(f"page 2 via cursor       {(await best_of(args.repeat, page, after))[0]:>9.2f} ms")
+    print(f"middle page via offset  {deep_ms:>9.2f} ms")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,102 @@
+import argparse
 import os
+import sys
 import uvicorn
 #here
+
+# Production defaults; every value can be overridden from the environment
+DEFAULT_DB_MAX_CONNECTIONS = 100   # connections the whole box may open to MySQL
+DEFAULT_GRACEFUL_TIMEOUT = 30      # seconds to drain in-flight requests on SIGTERM
+
+
+def production_settings(workers=None):
+    """
+    Size workers, per-worker DB pools and the threadpool from the environment.
+    Raises ValueError when the budget can't give every worker a connection.
+    """
+    workers = workers or int(os.environ.get("WEB_CONCURRENCY", 0)) or os.cpu_count() or 1
+    budget = int(os.environ.get("DB_MAX_CONNECTIONS", DEFAULT_DB_MAX_CONNECTIONS))
+
+    # Each worker runs a sync and an async engine of pool_size connections, and
+    # max_overflow=0 keeps workers * 2 * pool_size within the budget.
+    pool_size = budget // (2 * workers)
+    if pool_size < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={budget} is too small for {workers} workers: each needs "
+            f"a sync and an async connection, so raise it to {2 * workers} or run fewer workers"
+        )
+
+    # Sync endpoints that query the DB hold a connection for the whole call, so
+    # by default there are as many threads as sync connections. Routes that
+    # hold none (bcrypt, uploads, payment calls) may want more; threads past
+    # the pool then queue for a connection only on DB-backed routes.
+    threadpool_tokens = int(os.environ.get("THREADPOOL_TOKENS", pool_size))
+    if threadpool_tokens > pool_size:
+        print(
+            f"warning: THREADPOOL_TOKENS={threadpool_tokens} exceeds the {pool_size} sync connections "
+            f"per worker; DB-backed sync requests beyond that wait for a connection",
+            file=sys.stderr,
+        )
+
+    return {
+        "workers": workers,
+        "db_budget": budget,
+        "pool_size": pool_size,
+        "max_overflow": 0,
+        "threadpool_tokens": threadpool_tokens,
+        "graceful_timeout": int(os.environ.get("GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT)),
+    }
+
+
+def print_banner(port, settings):
+    per_worker = settings["pool_size"] + settings["max_overflow"]
+    print("─" * 60)
+    print(f" PeerProgrammers API · production mode on :{port}")
+    print(f" workers            : {settings['workers']}")
+    print(f" db budget          : {settings['db_budget']} connections")
+    print(f" db pool / worker   : {per_worker} sync + {per_worker} async "
+          f"(pool_size={settings['pool_size']}, max_overflow={settings['max_overflow']})")
+    print(f" threadpool / worker: {settings['threadpool_tokens']} tokens")
+    print(f" graceful drain     : {settings['graceful_timeout']}s on SIGTERM")
+    print("─" * 60, flush=True)
+
+
+def run_production(port, workers=None):
+    try:
+        settings = production_settings(workers)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+
+    # Workers are spawned from this process, so they inherit these and
+    # app/connection/database.py + app/main.py pick them up at import/startup.
+    os.environ["WEB_CONCURRENCY"] = str(settings["workers"])
+    os.environ["DB_POOL_SIZE"] = str(settings["pool_size"])
+    os.environ["DB_MAX_OVERFLOW"] = str(settings["max_overflow"])
+    os.environ["THREADPOOL_TOKENS"] = str(settings["threadpool_tokens"])
+
+    print_banner(port, settings)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=settings["workers"],
+        timeout_graceful_shutdown=settings["graceful_timeout"],
+        proxy_headers=True,
+        reload=False,
+    )
+
+
 # starting server..
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the PeerProgrammers API")
+    parser.add_argument("--prod", action="store_true",
+                        help="multi-worker production mode (also enabled by APP_ENV=production)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes in production mode (default: CPU count)")
+    args = parser.parse_args()
+
     port = int(os.environ.get("PORT", 8281))
-    uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
+    if args.prod or os.environ.get("APP_ENV", "").lower() == "production":
+        run_production(port, args.workers)
+    else:
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
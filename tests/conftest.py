@@ -0,0 +1,58 @@
+"""
+Shared fixtures. The app runs against a throwaway SQLite file (through both
+the sync and the aiosqlite engine); tests that take `db` get every table
+recreated and the process-local indexes and caches reset.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.connection.database import Base, engine, SessionLocal
+from app.main import app
+from app.routers.codeforces_ladder.ladder_sync import ladder_keys
+from app.routers.problems.problem_index import problem_index
+from app.routers.search.search_index import search_index
+from app.utils import etag
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # Rebuilt from the empty tables on first use
+    problem_index.built_at = None
+    search_index.built_at = None
+    ladder_keys.invalidate()
+    etag._forget_versions()
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def ladders(db):
+    """Ladders 1-3 with ten problems each (ids 1-30, problem p on ladder 1 + p % 3) and users 1-12."""
+    from app.models.codeforces_ladder_model import Ladder, LadderProblem
+    from app.models.user_model import User
+
+    for ladder_id in (1, 2, 3):
+        db.add(Ladder(id=ladder_id, rating_range=f"{ladder_id}", url=f"ladder-{ladder_id}"))
+    for pid in range(1, 31):
+        db.add(LadderProblem(
+            id=pid, ladder_id=1 + pid % 3, problem_name=f"p{pid}",
+            problem_url=f"https://codeforces.com/problemset/problem/{1000 + pid}/A",
+        ))
+    for user_id in range(1, 13):
+        db.add(User(id=user_id, username=f"user{user_id}", password="x"))
+    db.commit()
+    return db
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_array_items
+
+
+def parse(body: bytes, chunk_size: int, key: str = "result") -> list:
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def collect():
+        return [item async for item in iter_array_items(chunks(), key)]
+
+    return asyncio.run(collect())
+
+
+ITEMS = [
+    {"id": 1, "problem": {"contestId": 1850, "index": "A", "tags": ["math", "greedy"]}, "verdict": "OK"},
+    {"id": 2, "name": "quote \" and \\ backslash", "rating": 12.5, "flags": [True, False, None]},
+    {"id": 3, "name": "ünïcödé ✓ 漢字", "nested": [[1, 2], {"x": []}]},
+    -17,
+    "plain",
+    [],
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_items_across_chunk_boundaries(chunk_size):
+    body = json.dumps({"status": "OK", "result": ITEMS}, ensure_ascii=False).encode()
+    assert parse(body, chunk_size) == ITEMS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5])
+def test_key_found_after_other_fields(chunk_size):
+    body = b'{"comment": "a \\"result\\": [9] lookalike", "other": {"result": [8]}, "result": [1, 2]}'
+    assert parse(body, chunk_size) == [1, 2]
+
+
+def test_empty_array():
+    assert parse(b'{"result": [ ]}', 1) == []
+
+
+@pytest.mark.parametrize("body", [b'{"result": [1,]}', b'{"result": [1, 2 ,\n ]}'])
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_trailing_comma_is_rejected(body, chunk_size):
+    with pytest.raises(ValueError):
+        parse(body, chunk_size)
+
+
+@pytest.mark.parametrize("body", [
+    b'{"result": [1 2]}',
+    b'{"result": [1, 2',
+    b'{"result": {"a": 1}}',
+    b'{"status": "FAILED"}',
+])
+def test_malformed_or_missing_array(body):
+    with pytest.raises(ValueError):
+        parse(body, 4)
+
+
+def test_stops_reading_when_closed_early():
+    read = []
+
+    async def chunks():
+        for index in range(1000):
+            read.append(index)
+            yield (b'{"result": [' if index == 0 else b",") + str(index).encode()
+
+    async def first_three():
+        items = []
+        stream = iter_array_items(chunks(), "result")
+        async for item in stream:
+            items.append(item)
+            if len(items) == 3:
+                break
+        await stream.aclose()
+        return items
+
+    assert asyncio.run(first_three()) == [0, 1, 2]
+    assert len(read) < 10
@@ -0,0 +1,77 @@
+import threading
+
+from app.models.codeforces_ladder_model import LeaderboardCounter, UserProblemStatus
+
+
+def post_changes(client, user_id, changes):
+    response = client.post(f"/ladders/user/{user_id}/status", json={"changes": changes})
+    assert response.status_code == 200, response.text
+
+
+def solved_on(db, user_id, ladder_id):
+    db.expire_all()
+    counter = db.get(LeaderboardCounter, (user_id, ladder_id))
+    return counter.solved if counter else 0
+
+
+def statuses(db, user_id):
+    db.expire_all()
+    return {
+        row.problem_id: (bool(row.is_completed), bool(row.is_revisit))
+        for row in db.query(UserProblemStatus).filter(UserProblemStatus.user_id == user_id)
+    }
+
+
+def test_repeated_and_redundant_changes_count_once(client, ladders):
+    db = ladders
+    post_changes(client, 1, [{"problem_id": pid, "is_completed": True} for pid in (3, 6, 9, 1)])
+    post_changes(client, 1, [{"problem_id": pid, "is_completed": True} for pid in (3, 6)])  # already solved
+    post_changes(client, 1, [{"problem_id": 12, "is_completed": False}])  # never solved
+    assert (solved_on(db, 1, 0), solved_on(db, 1, 1), solved_on(db, 1, 2)) == (4, 3, 1)
+
+    post_changes(client, 1, [{"problem_id": 3, "is_completed": False}, {"problem_id": 4, "is_completed": True}])
+    assert (solved_on(db, 1, 0), solved_on(db, 1, 1), solved_on(db, 1, 2)) == (4, 2, 2)
+
+
+def test_flags_left_out_keep_their_value(client, ladders):
+    db = ladders
+    post_changes(client, 1, [{"problem_id": 1, "is_completed": True}, {"problem_id": 2, "is_revisit": True}])
+    post_changes(client, 1, [{"problem_id": 1, "is_revisit": True}, {"problem_id": 2, "is_completed": True}])
+    assert statuses(db, 1) == {1: (True, True), 2: (True, True)}
+
+    post_changes(client, 1, [{"problem_id": 1, "is_revisit": False}])
+    assert statuses(db, 1) == {1: (True, False), 2: (True, True)}
+    assert solved_on(db, 1, 0) == 2
+
+
+def test_revisit_toggle_returns_the_new_value(client, ladders):
+    db = ladders
+    post_changes(client, 1, [{"problem_id": 5, "is_completed": True}])
+    messages = [client.post("/ladders/problems/5/user/1/revisit").json()["message"] for _ in range(3)]
+    assert messages == [f"Problem revisit status updated to {value}" for value in (True, False, True)]
+    assert statuses(db, 1) == {5: (True, True)}
+    assert solved_on(db, 1, 0) == 1
+    assert client.post("/ladders/problems/99/user/1/revisit").status_code == 404
+
+
+def test_concurrent_writes_keep_counters_exact(client, ladders):
+    db = ladders
+    codes = []
+
+    def flip(seed):
+        for step in range(6):
+            pid = 1 + (seed * 7 + step * 5) % 30
+            change = {"problem_id": pid, "is_completed": (seed + step) % 3 != 0}
+            codes.append(client.post("/ladders/user/1/status", json={"changes": [change]}).status_code)
+
+    threads = [threading.Thread(target=flip, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(codes) == {200}
+    solved = [pid for pid, (done, _) in statuses(db, 1).items() if done]
+    for ladder_id in (1, 2, 3):
+        assert solved_on(db, 1, ladder_id) == sum(1 for pid in solved if 1 + pid % 3 == ladder_id)
+    assert solved_on(db, 1, 0) == len(solved)
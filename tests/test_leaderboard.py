@@ -0,0 +1,103 @@
+from app.models.codeforces_ladder_model import LeaderboardCounter
+from app.routers.codeforces_ladder.leaderboard import solved_counts
+
+# Solved problem ids per user: several users tie on the same count
+SOLVED = {
+    1: range(1, 9),
+    2: range(1, 6),
+    3: range(10, 15),
+    4: range(20, 25),
+    5: range(1, 4),
+    6: range(5, 8),
+    7: range(11, 14),
+    8: [30],
+    9: [2],
+    10: [],
+}
+
+
+def solve(client, solved=SOLVED):
+    for user_id, problem_ids in solved.items():
+        if problem_ids:
+            changes = [{"problem_id": pid, "is_completed": True} for pid in problem_ids]
+            assert client.post(f"/ladders/user/{user_id}/status", json={"changes": changes}).status_code == 200
+
+
+def expected_board(counts: dict) -> list:
+    """(user_id, solved, rank) best first; ties share the rank of the first of them."""
+    ordered = sorted(((solved, user_id) for user_id, solved in counts.items() if solved), reverse=True)
+    board = []
+    for position, (solved, user_id) in enumerate(ordered):
+        rank = board[-1][2] if board and board[-1][1] == solved else position + 1
+        board.append((user_id, solved, rank))
+    return board
+
+
+def ladder_counts(ladder_id=None) -> dict:
+    counts = {user_id: 0 for user_id in SOLVED}
+    for user_id, problem_ids in SOLVED.items():
+        counts[user_id] = sum(1 for pid in problem_ids if ladder_id is None or 1 + pid % 3 == ladder_id)
+    return counts
+
+
+def test_counters_match_a_recount(client, ladders):
+    solve(client)
+    stored = {
+        (row.user_id, row.ladder_id): row.solved
+        for row in ladders.query(LeaderboardCounter)
+        if row.solved
+    }
+    recount = {}
+    for user_id, ladder_id, solved in ladders.execute(solved_counts()):
+        recount[(user_id, ladder_id)] = solved
+        recount[(user_id, 0)] = recount.get((user_id, 0), 0) + solved
+    assert stored == recount
+
+
+def test_board_pages_share_ranks_across_ties(client, ladders):
+    solve(client)
+    for ladder_id in (None, 1, 2):
+        params = {"ladder_id": ladder_id} if ladder_id else {}
+        expected = expected_board(ladder_counts(ladder_id))
+
+        by_offset, by_cursor, cursor = [], [], None
+        for offset in range(0, len(expected), 3):
+            page = client.get("/ladders/cp51/leaderboard", params={**params, "limit": 3, "offset": offset}).json()
+            by_offset += [(e["user_id"], e["problems_solved"], e["rank"]) for e in page["leaderboard"]]
+        while True:
+            page = client.get(
+                "/ladders/cp51/leaderboard", params={**params, "limit": 3, **({"cursor": cursor} if cursor else {})}
+            ).json()
+            by_cursor += [(e["user_id"], e["problems_solved"], e["rank"]) for e in page["leaderboard"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert by_offset == expected
+        assert by_cursor == expected
+
+
+def test_unsolving_moves_the_board(client, ladders):
+    solve(client)
+    changes = [{"problem_id": pid, "is_completed": False} for pid in range(1, 6)]
+    assert client.post("/ladders/user/1/status", json={"changes": changes}).status_code == 200
+
+    counts = {**ladder_counts(), 1: 3}
+    board = client.get("/ladders/cp51/leaderboard", params={"limit": 20}).json()["leaderboard"]
+    assert [(e["user_id"], e["problems_solved"], e["rank"]) for e in board] == expected_board(counts)
+
+
+def test_rank_of_agrees_with_the_board(client, ladders):
+    solve(client)
+    for ladder_id in (None, 3):
+        params = {"ladder_id": ladder_id} if ladder_id else {}
+        for user_id, solved, rank in expected_board(ladder_counts(ladder_id)):
+            body = client.get(f"/ladders/cp51/leaderboard/user/{user_id}/rank", params=params).json()
+            assert (body["rank"], body["problems_solved"]) == (rank, solved)
+
+
+def test_rank_of_unranked_and_unknown_users(client, ladders):
+    solve(client)
+    body = client.get("/ladders/cp51/leaderboard/user/10/rank").json()
+    assert (body["rank"], body["problems_solved"]) == (None, 0)
+    assert client.get("/ladders/cp51/leaderboard/user/999/rank").status_code == 404
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from app.models.problem_model import CodingProblem, Tag, ProblemTag
+
+
+def add_problems(db, count=23):
+    base = datetime(2025, 1, 1)
+    for pid in range(1, count + 1):
+        db.add(CodingProblem(
+            id=pid, title=f"p{pid}", link=f"https://example.com/{pid}",
+            difficulty=("Easy", "Medium", "Hard")[pid % 3],
+            created_at=base + timedelta(days=pid // 4),  # runs of equal timestamps
+            deleted=pid % 10 == 0,
+        ))
+    db.add(Tag(id=1, name="dp"))
+    db.add_all(ProblemTag(problem_id=pid, tag_id=1) for pid in range(1, count + 1, 2))
+    db.commit()
+
+
+def walk(client, url, params, limit_param):
+    seen, cursor = [], None
+    while True:
+        page = client.get(url, params={**params, limit_param: 4, **({"cursor": cursor} if cursor else {})}).json()
+        seen += [row["id"] for row in page["results"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return seen, page
+
+
+def test_all_problem_cursor_walks_every_live_problem_once(client, db):
+    add_problems(db)
+    live = [p for p in db.query(CodingProblem).filter(CodingProblem.deleted == False)]
+    expected = [p.id for p in sorted(live, key=lambda p: (p.created_at, p.id), reverse=True)]
+
+    seen, last_page = walk(client, "/problems/all_problem", {}, "limit")
+
+    assert seen == expected
+    assert last_page["total"] == len(expected)
+
+
+def test_all_problem_without_paging_returns_a_list(client, db):
+    add_problems(db, 3)
+    assert isinstance(client.get("/problems/all_problem").json(), list)
+
+
+def test_filter_cursor_matches_offset_pages(client, db):
+    add_problems(db)
+    params = {"tag_ids": [1], "difficulties": ["Easy", "Hard"]}
+
+    seen, last_page = walk(client, "/problems/filter", params, "page_size")
+
+    everything = client.get("/problems/filter", params={**params, "page_size": 100}).json()
+    assert seen == [row["id"] for row in everything["results"]]
+    assert seen == sorted(seen)
+    assert last_page["total"] == everything["total"] == len(seen)
+
+
+def test_malformed_cursor_is_a_400(client, db):
+    assert client.get("/problems/all_problem", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/problems/filter", params={"cursor": "e30"}).status_code == 400  # {} lacks "id"
@@ -0,0 +1,48 @@
+def progress(client, user_id, etag=None):
+    return client.get(f"/ladders/user/{user_id}/progress", headers={"If-None-Match": etag} if etag else {})
+
+
+def test_unchanged_progress_is_a_304(client, ladders):
+    etag = progress(client, 1).headers["etag"]
+    response = progress(client, 1, etag)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_status_writes_change_the_etag(client, ladders):
+    etag = progress(client, 1).headers["etag"]
+    client.post("/ladders/user/1/status", json={"changes": [{"problem_id": 1, "is_completed": True}]})
+    response = progress(client, 1, etag)
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["solved_count"] == 1
+
+    # A revisit-only write, in the same second as the last one
+    etag = response.headers["etag"]
+    client.post("/ladders/user/1/status", json={"changes": [{"problem_id": 1, "is_revisit": True}]})
+    response = progress(client, 1, etag)
+    assert response.status_code == 200
+    assert response.json()["revisit_count"] == 1
+
+
+def test_revisit_toggle_changes_the_etag(client, ladders):
+    # Regression: the toggle endpoint wrote is_revisit without bumping the version
+    client.post("/ladders/user/1/status", json={"changes": [{"problem_id": 1, "is_completed": True}]})
+    etag = progress(client, 1).headers["etag"]
+
+    assert client.post("/ladders/problems/2/user/1/revisit").status_code == 200
+    response = progress(client, 1, etag)
+    assert response.status_code == 200
+    assert response.json()["revisit_count"] == 1
+
+    assert client.post("/ladders/problems/2/user/1/revisit").status_code == 200
+    toggled_back = progress(client, 1, response.headers["etag"])
+    assert toggled_back.status_code == 200
+    assert toggled_back.json()["revisit_count"] == 0
+
+
+def test_other_users_writes_leave_the_etag_alone(client, ladders):
+    etag = progress(client, 1).headers["etag"]
+    client.post("/ladders/user/2/status", json={"changes": [{"problem_id": 1, "is_completed": True}]})
+    client.post("/ladders/problems/3/user/2/revisit")
+    assert progress(client, 1, etag).status_code == 304
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.resource_model import Domain, Subdomain, Resource
+from app.models.user_model import User
+from app.routers.resources.ranking import refresh_ranks
+
+
+@pytest.fixture
+def resources(db):
+    db.add(User(id=1, username="u1", password="x"))
+    db.add(Domain(id=1, name="d"))
+    db.add(Subdomain(id=1, name="s", domain_id=1))
+    base = datetime(2025, 1, 1)
+    for rid in range(1, 18):
+        db.add(Resource(
+            id=rid, title=f"r{rid}", link=f"l{rid}", domain_id=1, subdomain_id=1, added_by_id=1,
+            upvote=rid % 4, downvote=rid % 3,  # many equal scores
+            created_at=base + timedelta(hours=rid // 3),
+        ))
+    db.commit()
+    refresh_ranks(db)
+    db.commit()
+    return db.query(Resource).all()
+
+
+def walk(client, sort):
+    seen, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": 5, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/resources/list", params=params).json()
+        seen += [row["id"] for row in page["results"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return seen
+
+
+@pytest.mark.parametrize("sort, key", [
+    ("top", lambda r: (r.score, r.id)),
+    ("hot", lambda r: (r.hot, r.id)),
+    ("new", lambda r: r.id),
+])
+def test_cursor_walks_every_resource_once_in_order(client, resources, sort, key):
+    assert walk(client, sort) == [r.id for r in sorted(resources, key=key, reverse=True)]
+
+
+def test_cursor_from_another_sort_is_rejected(client, resources):
+    cursor = client.get("/resources/list", params={"sort": "top", "limit": 5}).json()["next_cursor"]
+    assert client.get("/resources/list", params={"sort": "hot", "cursor": cursor}).status_code == 400
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from app.models.resource_model import Domain, Subdomain, Resource, ResourceVote
+from app.models.user_model import User
+from app.routers.resources.votes import cast_vote, UPVOTE, DOWNVOTE
+
+
+@pytest.fixture
+def resource(db):
+    db.add(Domain(id=1, name="d"))
+    db.add(Subdomain(id=1, name="s", domain_id=1))
+    db.add_all(User(id=user_id, username=f"user{user_id}", password="x") for user_id in range(1, 21))
+    db.add(Resource(id=1, title="r", link="l", domain_id=1, subdomain_id=1, added_by_id=1, upvote=0, downvote=0))
+    db.commit()
+    return db
+
+
+def test_cast_vote_deltas_follow_the_transition(resource):
+    db = resource
+    steps = [
+        (UPVOTE, (1, 0)),     # new upvote
+        (UPVOTE, None),       # same vote again
+        (DOWNVOTE, (-1, 1)),  # flip
+        (DOWNVOTE, None),
+        (UPVOTE, (1, -1)),
+    ]
+    for vote_type, deltas in steps:
+        assert cast_vote(db, 1, 2, vote_type) == deltas
+        db.commit()
+    assert cast_vote(db, 1, 3, DOWNVOTE) == (0, 1)
+    db.commit()
+    assert {v.user_id: v.vote_type for v in db.query(ResourceVote)} == {2: UPVOTE, 3: DOWNVOTE}
+
+
+def test_concurrent_votes_keep_counters_exact(client, resource):
+    statuses = []
+
+    def vote(user_id):
+        for kind in ("upvote", "downvote", "upvote" if user_id % 2 else "downvote"):
+            statuses.append(client.post(f"/resources/1/{kind}", json={"user_id": user_id}).status_code)
+
+    threads = [threading.Thread(target=vote, args=(user_id,)) for user_id in range(1, 21) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(statuses) == {200}
+    db = resource
+    db.expire_all()
+    stored = db.get(Resource, 1)
+    votes = [v.vote_type for v in db.query(ResourceVote)]
+    assert len(votes) == 20
+    assert (stored.upvote, stored.downvote) == (votes.count(UPVOTE), votes.count(DOWNVOTE))
+    assert stored.score == stored.upvote - stored.downvote